@@ -1,20 +1,42 @@
 import sys
-import subprocess
 import json
 import re
 import os
+import time
+from collections import deque
 from datetime import datetime
+from functools import partial
+
+# Reference point for the startup timings reported in the activity log
+LAUNCHED_AT = time.perf_counter()
+
 from PyQt6.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QPushButton, QLabel, QMessageBox,
     QLineEdit, QFrame, QHBoxLayout, QTextEdit, QCheckBox, QGroupBox,
-    QProgressBar, QListWidget, QListWidgetItem, QSplitter, QTabWidget,
-    QTableWidget, QTableWidgetItem, QHeaderView, QMenu, QSystemTrayIcon,
+    QProgressBar, QListView, QSplitter, QTabWidget,
+    QTableView, QHeaderView, QMenu, QSystemTrayIcon,
     QComboBox, QSpinBox, QSlider, QGraphicsOpacityEffect,
-    QScrollBar
+    QPlainTextEdit, QFileDialog, QTableWidget, QTableWidgetItem
 )
 from PyQt6.QtGui import QIcon, QFont, QPalette, QColor, QPixmap, QPainter, QBrush, QLinearGradient, QGuiApplication, \
-    QAction, QCursor
-from PyQt6.QtCore import Qt, QTimer, QThread, pyqtSignal, QPropertyAnimation, QEasingCurve, QRect, QPoint, QSize
+    QAction, QCursor, QTextCharFormat, QTextCursor, QPen, QPolygonF
+from PyQt6.QtCore import Qt, QTimer, QThread, pyqtSignal, QPropertyAnimation, QEasingCurve, QRect, QPoint, QSize, \
+    QAbstractListModel, QAbstractTableModel, QModelIndex, QSortFilterProxyModel, QObject, QPointF, QEvent
+
+from simcleaner import core, logsink, metrics
+from simcleaner.autoeject import DEFAULT_RULES, AutoEjectEngine, parse_rules
+from simcleaner.autoscan import AdaptiveScanPolicy
+from simcleaner.eventbus import EventBus
+from simcleaner.history import TrendHistory, cache_series, growth_per_day, scan_values
+from simcleaner.idle import IdleGate, IdleMonitor
+from simcleaner.logbuffer import LogBuffer, LogQuery
+from simcleaner.notices import NoticeQueue
+from simcleaner.patterns import PatternError, compile_patterns
+from simcleaner.records import DiskRecord, ProcessRecord
+from simcleaner.scheduler import BACKGROUND, INTERACTIVE, Job, Scheduler
+from simcleaner.snapshot import ScanSnapshot
+from simcleaner.trace import BUCKETS_MS, Span, tracer
+from simcleaner.watchdog import StallWatchdog
 
 
 # Theme definitions
@@ -33,6 +55,237 @@ class Metrics:
     FONT_SIZE_MD = 14
 
 
+# Main window stylesheet
+ADVANCED_STYLESHEET = """
+    QFrame#MainContainer {
+        background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
+            stop:0 rgba(28, 28, 30, 240),
+            stop:0.5 rgba(44, 44, 46, 240),
+            stop:1 rgba(28, 28, 30, 240));
+        border-radius: 12px;
+        border: 1px solid rgba(255, 255, 255, 0.1);
+    }
+
+    QLabel#TitleLabel {
+        color: white;
+        font-size: 18px;
+        font-weight: bold;
+        padding: 10px;
+        background: transparent;
+    }
+
+    QPushButton {
+        background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
+            stop:0 rgba(255, 59, 48, 200),
+            stop:1 rgba(255, 45, 35, 200));
+        color: white;
+        border: none;
+        border-radius: 8px;
+        padding: 10px 20px;
+        font-weight: 600;
+        font-size: 14px;
+    }
+
+    QPushButton:hover {
+        background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
+            stop:0 rgba(255, 69, 58, 255),
+            stop:1 rgba(255, 55, 45, 255));
+    }
+
+    QPushButton:pressed {
+        background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
+            stop:0 rgba(200, 50, 40, 255),
+            stop:1 rgba(180, 40, 30, 255));
+    }
+
+    QPushButton#RefreshButton {
+        background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
+            stop:0 rgba(10, 132, 255, 200),
+            stop:1 rgba(0, 122, 255, 200));
+    }
+
+    QPushButton#RefreshButton:hover {
+        background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
+            stop:0 rgba(20, 142, 255, 255),
+            stop:1 rgba(10, 132, 255, 255));
+    }
+
+    QTabWidget#MainTabs {
+        background: transparent;
+        border: none;
+    }
+
+    QTabWidget::pane {
+        background: rgba(44, 44, 46, 100);
+        border: 1px solid rgba(255, 255, 255, 0.1);
+        border-radius: 8px;
+        padding: 10px;
+    }
+
+    QTabBar::tab {
+        background: rgba(72, 72, 74, 150);
+        color: rgba(255, 255, 255, 0.7);
+        padding: 10px 20px;
+        margin-right: 5px;
+        border-top-left-radius: 8px;
+        border-top-right-radius: 8px;
+        font-weight: 500;
+    }
+
+    QTabBar::tab:selected {
+        background: rgba(99, 99, 102, 200);
+        color: white;
+    }
+
+    QListView {
+        background: rgba(30, 30, 32, 200);
+        border: 1px solid rgba(255, 255, 255, 0.1);
+        border-radius: 8px;
+        padding: 5px;
+        color: white;
+        font-size: 13px;
+    }
+
+    QListView::item {
+        padding: 8px;
+        margin: 2px;
+        border-radius: 6px;
+        background: rgba(72, 72, 74, 100);
+    }
+
+    QListView::item:selected {
+        background: rgba(10, 132, 255, 150);
+    }
+
+    QListView::item:hover {
+        background: rgba(99, 99, 102, 150);
+    }
+
+    QTableView {
+        background: rgba(30, 30, 32, 200);
+        border: 1px solid rgba(255, 255, 255, 0.1);
+        border-radius: 8px;
+        gridline-color: rgba(255, 255, 255, 0.05);
+        color: white;
+    }
+
+    QTableView::item {
+        padding: 5px;
+    }
+
+    QHeaderView::section {
+        background: rgba(58, 58, 60, 200);
+        color: white;
+        padding: 8px;
+        border: none;
+        font-weight: 600;
+    }
+
+    QTextEdit, QPlainTextEdit {
+        background: rgba(30, 30, 32, 200);
+        border: 1px solid rgba(255, 255, 255, 0.1);
+        border-radius: 8px;
+        color: #00ff00;
+        font-family: 'Menlo', 'Monaco', monospace;
+        font-size: 12px;
+        padding: 10px;
+    }
+
+    QProgressBar {
+        background: rgba(72, 72, 74, 200);
+        border: none;
+        border-radius: 4px;
+        height: 8px;
+        text-align: center;
+    }
+
+    QProgressBar::chunk {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+            stop:0 rgba(52, 199, 89, 255),
+            stop:1 rgba(48, 209, 88, 255));
+        border-radius: 4px;
+    }
+
+    QCheckBox {
+        color: white;
+        spacing: 8px;
+    }
+
+    QCheckBox::indicator {
+        width: 18px;
+        height: 18px;
+        border: 2px solid rgba(255, 255, 255, 0.3);
+        border-radius: 4px;
+        background: rgba(72, 72, 74, 200);
+    }
+
+    QCheckBox::indicator:checked {
+        background: rgba(48, 209, 88, 255);
+        border-color: rgba(48, 209, 88, 255);
+    }
+
+    QLineEdit {
+        background: rgba(72, 72, 74, 200);
+        border: 1px solid rgba(255, 255, 255, 0.2);
+        border-radius: 6px;
+        padding: 8px;
+        color: white;
+        font-size: 14px;
+    }
+
+    QLineEdit:focus {
+        border-color: rgba(10, 132, 255, 255);
+    }
+
+    QGroupBox {
+        color: rgba(255, 255, 255, 0.9);
+        font-weight: 600;
+        border: 1px solid rgba(255, 255, 255, 0.1);
+        border-radius: 8px;
+        margin-top: 10px;
+        padding-top: 10px;
+    }
+
+    QGroupBox::title {
+        subcontrol-origin: margin;
+        left: 10px;
+        padding: 0 10px 0 10px;
+    }
+"""
+
+
+# Text color for rows restored from the last run's snapshot until a fresh scan lands
+STALE_COLOR = "#8e8e93"
+
+# Diagnostics tab: per-operation latency table, histogram drawn with block characters
+DIAGNOSTICS_COLUMNS = ("Operation", "Kind", "Count", "p50 ms", "p95 ms", "Max ms", "Total ms", "Histogram")
+HISTOGRAM_BARS = " ▁▂▃▄▅▆▇█"
+
+# Notification popup background per level
+NOTIFICATION_COLORS = {
+    "info": "rgba(10, 132, 255, 255)",
+    "success": "rgba(48, 209, 88, 255)",
+    "warning": "rgba(255, 159, 10, 255)",
+    "error": "rgba(255, 69, 58, 255)",
+}
+NOTIFICATION_STYLE = """
+    QLabel {{
+        background: {color};
+        color: white;
+        font-weight: bold;
+        padding: 15px 25px;
+        border-radius: 10px;
+        font-size: 14px;
+    }}
+"""
+
+# Dashboard trend chart ranges, in seconds
+TREND_RANGES = {"24 hours": 86400, "7 days": 7 * 86400, "30 days": 30 * 86400, "1 year": 365 * 86400}
+# Background cache sizing (metrics gauge, history): delay after launch, then interval, in seconds
+CACHE_MEASURE_FIRST = 5 * 60
+CACHE_MEASURE_INTERVAL = 6 * 60 * 60
+
+
 # Themed button
 class AccentButton(QPushButton):
     def __init__(self, text="", parent=None):
@@ -41,85 +294,620 @@ class AccentButton(QPushButton):
         self.setObjectName("AccentButton")
 
 
-class DiskScanner(QThread):
-    update_signal = pyqtSignal(list)
-    progress_signal = pyqtSignal(int)
+class TaskBridge(QObject):
+    """Runs core functions as scheduler jobs and calls back on the GUI thread.
+
+    ``submit(callback, fn, *args, **job_options)`` wraps the call in a
+    simcleaner.scheduler.Job (options: kind, priority, exclusive, shared,
+    coalesce, preemptible). ``callback(result)`` runs on the GUI thread once
+    the job finishes; cancelled jobs never call back and failures are
+    reported through ``failed``.
+
+    Finished jobs and ``report_progress`` calls from workers go through an
+    EventBus: one queued ``wake`` signal, then everything that arrived is
+    delivered together at most once a frame, with progress coalesced.
+    """
+    wake = pyqtSignal()
+    failed = pyqtSignal(str)
+    busy_changed = pyqtSignal(bool)
+    progress = pyqtSignal(int)
+
+    # Minimum gap between deliveries, in ms (one 60 Hz frame)
+    FRAME_MS = 16
+
+    def __init__(self, runner, parent=None):
+        super().__init__(parent)
+        # Jobs finish on pool threads, so delivery is queued onto the GUI thread
+        self.bus = EventBus(self.wake.emit)
+        self.scheduler = Scheduler(runner, partial(self.bus.call, self._deliver))
+        self.pending = 0
+        self.dispatched_at = 0.0
+        self.dispatch_timer = QTimer(self)
+        self.dispatch_timer.setSingleShot(True)
+        self.dispatch_timer.timeout.connect(self._dispatch)
+        self.wake.connect(self._wake)
+
+    def report_progress(self, value):
+        """Progress callback for core functions; safe from any thread, delivered at the bus rate."""
+        self.bus.latest("progress", self.progress.emit, value)
+
+    def _wake(self):
+        delay = max(0, int(self.FRAME_MS - (time.monotonic() - self.dispatched_at) * 1000))
+        if not self.dispatch_timer.isActive() or self.dispatch_timer.remainingTime() > delay:
+            self.dispatch_timer.start(delay)
+
+    def _dispatch(self):
+        self.dispatched_at = time.monotonic()
+        wait = self.bus.dispatch()
+        if wait is not None:
+            self.dispatch_timer.start(int(wait * 1000) + 1)
+
+    def submit(self, callback, fn, *args, kind=None, priority=INTERACTIVE, exclusive=(), shared=(),
+               coalesce=False, preemptible=False):
+        self.pending += 1
+        if self.pending == 1:
+            self.busy_changed.emit(True)
+        job = Job(kind or fn.__name__, fn, args, priority, exclusive, shared, coalesce, preemptible)
+        return self.scheduler.submit(job, callback)
+
+    def cancel_all(self):
+        return self.scheduler.cancel_all()
+
+    def _deliver(self, job):
+        self.pending -= job.requests
+        if not self.pending:
+            self.busy_changed.emit(False)
+        if job.cancelled:
+            return
+        if job.error is not None:
+            self.failed.emit(f"{job.kind} failed: {type(job.error).__name__}: {job.error}")
+            return
+        with tracer.span(job.kind, "ui"):
+            for callback in job.callbacks:
+                callback(job.result)
+
+
+class SipProbe(QThread):
+    result_signal = pyqtSignal(bool)
 
     def run(self):
-        try:
-            # Get all mounted disks
-            result = subprocess.run(['diskutil', 'list'], capture_output=True, text=True)
-            disk_info = []
-
-            # Parse diskutil output
-            lines = result.stdout.split('\n')
-            current_disk = None
-
-            for i, line in enumerate(lines):
-                self.progress_signal.emit(int((i / len(lines)) * 100))
-
-                if line.startswith('/dev/disk'):
-                    current_disk = line.split()[0]
-
-                # Look for simulator-related volumes
-                if current_disk and ('Simulator' in line or 'Xcode' in line or 'iOS' in line):
-                    # Get detailed info
-                    info_result = subprocess.run(['diskutil', 'info', current_disk],
-                                                 capture_output=True, text=True)
-
-                    volume_name = ""
-                    mount_point = ""
-                    size = ""
-
-                    for info_line in info_result.stdout.split('\n'):
-                        if 'Volume Name:' in info_line:
-                            volume_name = info_line.split('Volume Name:')[1].strip()
-                        elif 'Mount Point:' in info_line:
-                            mount_point = info_line.split('Mount Point:')[1].strip()
-                        elif 'Disk Size:' in info_line:
-                            size = info_line.split('Disk Size:')[1].strip().split()[0]
-
-                    if volume_name or mount_point:
-                        disk_info.append({
-                            'device': current_disk,
-                            'name': volume_name or 'Unknown',
-                            'mount': mount_point or 'Not Mounted',
-                            'size': size or 'Unknown'
-                        })
-
-            self.update_signal.emit(disk_info)
+        self.result_signal.emit(core.sip_enabled())
 
-        except Exception as e:
-            self.update_signal.emit([])
 
+class LogExporter(QThread):
+    done_signal = pyqtSignal(bool, str)
 
-class ProcessMonitor(QThread):
-    update_signal = pyqtSignal(list)
+    def __init__(self, sink, filename, as_json=False):
+        super().__init__()
+        self.sink = sink
+        self.filename = filename
+        self.as_json = as_json
 
     def run(self):
         try:
-            # Find all simulator-related processes
-            ps_result = subprocess.run(['ps', 'aux'], capture_output=True, text=True)
-            processes = []
-
-            keywords = ['Simulator', 'CoreSimulator', 'SimulatorTrampoline', 'launchd_sim']
-
-            for line in ps_result.stdout.split('\n')[1:]:  # Skip header
-                parts = line.split()
-                if len(parts) >= 11:
-                    process_name = ' '.join(parts[10:])
-                    if any(keyword in process_name for keyword in keywords):
-                        processes.append({
-                            'pid': parts[1],
-                            'cpu': parts[2],
-                            'mem': parts[3],
-                            'name': process_name[:50] + '...' if len(process_name) > 50 else process_name
-                        })
-
-            self.update_signal.emit(processes)
-
+            # Make sure everything logged so far has reached the segments
+            self.sink.flush()
+            count = logsink.export(self.filename, self.sink.directory, as_json=self.as_json)
+            self.done_signal.emit(True, f"Exported {count} log entries to {self.filename}")
         except Exception as e:
-            self.update_signal.emit([])
+            self.done_signal.emit(False, f"Failed to export log: {str(e)}")
+
+
+class ProcessTableModel(QAbstractTableModel):
+    """Checkable process table keyed by (PID, start time).
+
+    Each refresh is diffed against the current rows and applied as at most one
+    dataChanged range, one insertion, one re-sort and one removal, so check state
+    and selection survive refreshes because surviving rows are never recreated.
+
+    Rows are kept in the requested sort order here rather than in the proxy:
+    letting QSortFilterProxyModel compare rows calls back into Python twice per
+    comparison, which is far too slow to re-sort thousands of rows every second.
+    """
+    HEADERS = ["Select", "PID", "CPU %", "Memory %", "Process Name"]
+    FILTER_ROLE = Qt.ItemDataRole.UserRole + 1
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = []
+        self._keys = []
+        self._checked = set()
+        self._sort_column = -1
+        self._sort_order = Qt.SortOrder.AscendingOrder
+        self.stale = False
+
+    def _sort_values(self):
+        column = self._sort_column
+        if column == 0:
+            return [key in self._checked for key in self._keys]
+        if column == 1:
+            return [proc.pid for proc in self._rows]
+        if column == 2:
+            return [proc.cpu for proc in self._rows]
+        if column == 3:
+            return [proc.mem for proc in self._rows]
+        return [proc.name.lower() for proc in self._rows]
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        flags = Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+        if index.column() == 0:
+            flags |= Qt.ItemFlag.ItemIsUserCheckable
+        return flags
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        proc = self._rows[index.row()]
+        column = index.column()
+
+        if role == Qt.ItemDataRole.CheckStateRole and column == 0:
+            checked = self._keys[index.row()] in self._checked
+            return Qt.CheckState.Checked if checked else Qt.CheckState.Unchecked
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == 1:
+                return str(proc.pid)
+            if column == 2:
+                return f"{proc.cpu:.1f}%"
+            if column == 3:
+                return f"{proc.mem:.1f}%"
+            if column == 4:
+                return proc.name
+        if role == self.FILTER_ROLE:
+            return f"{proc.pid} {proc.name}"
+        if role == Qt.ItemDataRole.UserRole:
+            return proc
+        if role == Qt.ItemDataRole.ForegroundRole and self.stale:
+            return QColor(STALE_COLOR)
+        return None
+
+    def set_stale(self, stale):
+        if stale != self.stale:
+            self.stale = stale
+            if self._rows:
+                self.dataChanged.emit(self.index(0, 0), self.index(len(self._rows) - 1, len(self.HEADERS) - 1),
+                                      [Qt.ItemDataRole.ForegroundRole])
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if not index.isValid() or index.column() != 0 or role != Qt.ItemDataRole.CheckStateRole:
+            return False
+        key = self._keys[index.row()]
+        if Qt.CheckState(value) == Qt.CheckState.Checked:
+            self._checked.add(key)
+        else:
+            self._checked.discard(key)
+        self.dataChanged.emit(index, index, [role])
+        return True
+
+    def checked_processes(self):
+        return [proc for proc, key in zip(self._rows, self._keys) if key in self._checked]
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        self._sort_column = column
+        self._sort_order = order
+        self._relayout(self._ordered(range(len(self._rows))))
+
+    def _ordered(self, rows):
+        if self._sort_column < 0:
+            return list(rows)
+        values = self._sort_values()
+        descending = self._sort_order == Qt.SortOrder.DescendingOrder
+        return sorted(rows, key=values.__getitem__, reverse=descending)
+
+    def _relayout(self, order):
+        """Move rows so that old row order[i] becomes row i, as one layout change."""
+        if all(old == new for new, old in enumerate(order)):
+            return
+
+        self.layoutAboutToBeChanged.emit([], QAbstractTableModel.LayoutChangeHint.VerticalSortHint)
+        new_row_of = [0] * len(order)
+        for new, old in enumerate(order):
+            new_row_of[old] = new
+        self._rows = [self._rows[old] for old in order]
+        self._keys = [self._keys[old] for old in order]
+        moved_from = self.persistentIndexList()
+        moved_to = [self.index(new_row_of[index.row()], index.column()) for index in moved_from]
+        self.changePersistentIndexList(moved_from, moved_to)
+        self.layoutChanged.emit([], QAbstractTableModel.LayoutChangeHint.VerticalSortHint)
+
+    def update_processes(self, processes):
+        # Key on PID + start time so a recycled PID shows up as a new row
+        incoming = {proc.key: proc for proc in processes}
+
+        # In-place updates, reported as a single range
+        changed = []
+        gone = []
+        for row, (key, proc) in enumerate(zip(self._keys, self._rows)):
+            fresh = incoming.pop(key, None)
+            if fresh is None:
+                gone.append(row)
+            elif fresh != proc:
+                self._rows[row] = fresh
+                changed.append(row)
+        if changed:
+            self.dataChanged.emit(self.index(changed[0], 1), self.index(changed[-1], len(self.HEADERS) - 1))
+
+        # Whatever is left over is new; append it in one batch
+        if incoming:
+            first = len(self._rows)
+            self.beginInsertRows(QModelIndex(), first, first + len(incoming) - 1)
+            self._rows.extend(incoming.values())
+            self._keys.extend(incoming.keys())
+            self.endInsertRows()
+
+        # Re-sort the survivors and park exited processes at the bottom, so they
+        # leave in one removal instead of one per scattered run of rows
+        if gone:
+            doomed = set(gone)
+            survivors = self._ordered(row for row in range(len(self._rows)) if row not in doomed)
+            self._relayout(survivors + gone)
+            self.beginRemoveRows(QModelIndex(), len(survivors), len(self._rows) - 1)
+            del self._rows[len(survivors):]
+            del self._keys[len(survivors):]
+            self.endRemoveRows()
+        elif self._sort_column >= 0:
+            self._relayout(self._ordered(range(len(self._rows))))
+
+        if self._checked:
+            self._checked &= set(self._keys)
+
+
+class ProcessFilterProxy(QSortFilterProxyModel):
+    """Filters the process table by PID or name and forwards sorting to the source model."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setFilterRole(ProcessTableModel.FILTER_ROLE)
+        self.setFilterCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        # Leave the proxy unsorted so it keeps the source order
+        self.sourceModel().sort(column, order)
+
+
+class DiskListModel(QAbstractListModel):
+    """Detected simulator disks keyed by device identifier.
+
+    Scan results are diffed against the current rows so only added, removed
+    or changed disks are touched and the user's selection survives rescans.
+    Disk count, mounted count and total size are maintained as rows change,
+    so the dashboard never has to walk the list.
+    """
+    NAME_ROLE = Qt.ItemDataRole.UserRole + 1
+    SIZE_ROLE = Qt.ItemDataRole.UserRole + 2
+    MOUNTED_ROLE = Qt.ItemDataRole.UserRole + 3
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = []
+        self.mounted_count = 0
+        self.total_size_gb = 0.0
+        self.stale = False
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        disk = self._rows[index.row()]
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            return f"{disk.name} ({disk.device}) - {disk.size_label}"
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return disk.mount
+        if role == Qt.ItemDataRole.UserRole:
+            return disk
+        if role == self.NAME_ROLE:
+            return disk.name.lower()
+        if role == self.SIZE_ROLE:
+            return disk.size_bytes
+        if role == self.MOUNTED_ROLE:
+            return int(disk.mounted)
+        if role == Qt.ItemDataRole.ForegroundRole and self.stale:
+            return QColor(STALE_COLOR)
+        return None
+
+    def set_stale(self, stale):
+        if stale != self.stale:
+            self.stale = stale
+            if self._rows:
+                self.dataChanged.emit(self.index(0), self.index(len(self._rows) - 1), [Qt.ItemDataRole.ForegroundRole])
+
+    def disks(self):
+        return list(self._rows)
+
+    def _account(self, disk, sign):
+        self.total_size_gb += sign * disk.size_gb
+        if disk.mounted:
+            self.mounted_count += sign
+
+    def update_disks(self, disks):
+        """Apply a scan result; returns True if any row was added, removed or changed."""
+        incoming = {disk.device: disk for disk in disks}
+        changed = False
+
+        # Removals, bottom-up so pending row numbers stay valid
+        for row in range(len(self._rows) - 1, -1, -1):
+            if self._rows[row].device not in incoming:
+                changed = True
+                self.beginRemoveRows(QModelIndex(), row, row)
+                self._account(self._rows[row], -1)
+                del self._rows[row]
+                self.endRemoveRows()
+
+        # Changes in place
+        for row, disk in enumerate(self._rows):
+            fresh = incoming.pop(disk.device)
+            if fresh != disk:
+                changed = True
+                self._account(disk, -1)
+                self._rows[row] = fresh
+                self._account(fresh, 1)
+                index = self.index(row)
+                self.dataChanged.emit(index, index)
+
+        # New disks go at the end in one batch
+        if incoming:
+            first = len(self._rows)
+            self.beginInsertRows(QModelIndex(), first, first + len(incoming) - 1)
+            for disk in incoming.values():
+                self._rows.append(disk)
+                self._account(disk, 1)
+            self.endInsertRows()
+            changed = True
+        return changed
+
+
+class DiskFilterProxy(QSortFilterProxyModel):
+    """Sorts the disk list by name, size or mount state and filters by text and mount state."""
+    SORT_ROLES = {
+        "Name": DiskListModel.NAME_ROLE,
+        "Size": DiskListModel.SIZE_ROLE,
+        "Mount State": DiskListModel.MOUNTED_ROLE,
+    }
+    MOUNT_FILTERS = ["All Disks", "Mounted", "Not Mounted"]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._needle = ""
+        self._mount_filter = "All Disks"
+        self.setDynamicSortFilter(True)
+
+    def set_sort_key(self, key):
+        self.setSortRole(self.SORT_ROLES[key])
+        order = Qt.SortOrder.AscendingOrder if key == "Name" else Qt.SortOrder.DescendingOrder
+        self.sort(0, order)
+
+    def set_filter_text(self, text):
+        self._needle = text.strip().lower()
+        self.invalidateFilter()
+
+    def set_mount_filter(self, mount_filter):
+        self._mount_filter = mount_filter
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        disk = self.sourceModel().index(source_row, 0, source_parent).data(Qt.ItemDataRole.UserRole)
+        if self._mount_filter != "All Disks":
+            if disk.mounted != (self._mount_filter == "Mounted"):
+                return False
+        if self._needle:
+            return self._needle in f"{disk.name} {disk.device} {disk.mount}".lower()
+        return True
+
+
+def format_quantity(value, is_bytes):
+    if not is_bytes:
+        return f"{value:.0f}"
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(value) < 1000 or unit == "GB":
+            break
+        value /= 1000
+    return f"{value:.0f} B" if unit == "B" else f"{value:.1f} {unit}"
+
+
+class TrendChart(QWidget):
+    """Line of bucket means over a min/max band, drawn straight from history.Point rows."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.points = []
+        self.is_bytes = True
+        self.span = (0, 1)
+        self.setMinimumHeight(60)
+
+    def set_points(self, points, since, until, is_bytes):
+        self.points = points
+        self.span = (since, until)
+        self.is_bytes = is_bytes
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setPen(QColor(Colors.TEXT_MEDIUM))
+        area = self.rect().adjusted(70, 8, -8, -20)
+        since, until = self.span
+        painter.drawText(QRect(area.left(), area.bottom() + 4, 150, 16), Qt.AlignmentFlag.AlignLeft,
+                         datetime.fromtimestamp(since).strftime("%Y-%m-%d %H:%M"))
+        painter.drawText(QRect(area.right() - 150, area.bottom() + 4, 150, 16), Qt.AlignmentFlag.AlignRight, "now")
+        if not self.points:
+            painter.drawText(area, Qt.AlignmentFlag.AlignCenter, "No history recorded for this range yet")
+            return
+
+        low = min(point.low for point in self.points)
+        high = max(point.high for point in self.points)
+        if high == low:
+            high, low = high + 1, max(0, low - 1)
+        painter.drawText(QRect(0, area.top() - 6, 64, 16), Qt.AlignmentFlag.AlignRight,
+                         format_quantity(high, self.is_bytes))
+        painter.drawText(QRect(0, area.bottom() - 10, 64, 16), Qt.AlignmentFlag.AlignRight,
+                         format_quantity(low, self.is_bytes))
+
+        def position(when, value):
+            x = area.left() + (when - since) / max(until - since, 1) * area.width()
+            return QPointF(x, area.bottom() - (value - low) / (high - low) * area.height())
+
+        band = QPolygonF([position(point.time, point.high) for point in self.points]
+                         + [position(point.time, point.low) for point in reversed(self.points)])
+        accent = QColor(Colors.ACCENT_PUSH)
+        accent.setAlpha(60)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(accent)
+        painter.drawPolygon(band)
+        painter.setPen(QPen(QColor(Colors.ACCENT_PUSH), 2))
+        painter.drawPolyline(QPolygonF([position(point.time, point.mean) for point in self.points]))
+        painter.setBrush(QColor(Colors.ACCENT_PUSH))
+        painter.drawEllipse(position(self.points[-1].time, self.points[-1].last), 3, 3)
+
+
+class LogConsole(QPlainTextEdit):
+    """Read-only log viewer that appends records in coalesced batches.
+
+    Records are queued and written on a short timer inside one edit block, so a
+    burst of thousands of log calls costs one layout pass instead of thousands.
+    The document is capped at ``max_blocks`` lines; older lines live on in the
+    LogBuffer.
+
+    Level and text filters are answered from the buffer's indexes. Changing a
+    filter draws the screenful of newest matches immediately and backfills
+    older matches above it in small chunks from the event loop.
+    """
+    COLORS = {
+        "info": "#00ff00",
+        "success": "#30d158",
+        "warning": "#ff9500",
+        "error": "#ff453a"
+    }
+    FLUSH_INTERVAL_MS = 100
+    BACKFILL_CHUNK = 250
+
+    def __init__(self, buffer, max_blocks=5000, parent=None):
+        super().__init__(parent)
+        self.setReadOnly(True)
+        self.setUndoRedoEnabled(False)
+        self.setMaximumBlockCount(max_blocks)
+        self.query = LogQuery(buffer, max_blocks)
+        self._pending = deque(maxlen=max_blocks)
+        self._backfill = []
+        self._clock = (None, "")
+
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(self.FLUSH_INTERVAL_MS)
+        self._flush_timer.timeout.connect(self.flush)
+
+        self._backfill_timer = QTimer(self)
+        self._backfill_timer.setSingleShot(True)
+        self._backfill_timer.timeout.connect(self._backfill_step)
+
+        self._time_format = QTextCharFormat()
+        self._time_format.setForeground(QColor("#888"))
+        self._level_formats = {}
+        for level, color in self.COLORS.items():
+            fmt = QTextCharFormat()
+            fmt.setForeground(QColor(color))
+            self._level_formats[level] = fmt
+        self._default_format = QTextCharFormat()
+        self._default_format.setForeground(QColor("#fff"))
+
+    def enqueue(self, record):
+        if not self.query.offer(record):
+            return
+        self._pending.append(record)
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    def _timestamp(self, timestamp):
+        # Many records share a second; only format when it changes
+        second = int(timestamp)
+        if self._clock[0] != second:
+            self._clock = (second, time.strftime("[%H:%M:%S] ", time.localtime(second)))
+        return self._clock[1]
+
+    def _insert(self, cursor, record):
+        cursor.insertText(self._timestamp(record.timestamp), self._time_format)
+        cursor.insertText(record.message, self._level_formats.get(record.level, self._default_format))
+
+    def _following(self):
+        # Only follow the tail if the user hasn't scrolled up to read something
+        scrollbar = self.verticalScrollBar()
+        return scrollbar.value() >= scrollbar.maximum() - 2
+
+    def flush(self):
+        if not self._pending:
+            return
+        records = list(self._pending)
+        self._pending.clear()
+        follow = self._following()
+
+        cursor = QTextCursor(self.document())
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        cursor.beginEditBlock()
+        for record in records:
+            if self.document().characterCount() > 1:
+                cursor.insertBlock()
+            self._insert(cursor, record)
+        cursor.endEditBlock()
+
+        if follow:
+            self.verticalScrollBar().setValue(self.verticalScrollBar().maximum())
+
+    def set_filter(self, level=None, needle=""):
+        """Show only records of ``level`` (None for all) containing ``needle``."""
+        matches = self.query.update(level, needle)
+        self._pending.clear()
+        self._backfill_timer.stop()
+        super().clear()
+
+        # A few screens' worth now, the rest from the event loop
+        line_height = max(1, self.fontMetrics().lineSpacing())
+        visible = max(100, 2 * self.viewport().height() // line_height)
+        self._backfill = matches[:-visible]
+        self._pending.extend(matches[-visible:])
+        self.flush()
+        self.verticalScrollBar().setValue(self.verticalScrollBar().maximum())
+        if self._backfill:
+            self._backfill_timer.start(0)
+
+    def _backfill_step(self):
+        chunk = self._backfill[-self.BACKFILL_CHUNK:]
+        del self._backfill[-self.BACKFILL_CHUNK:]
+        follow = self._following()
+        scrollbar = self.verticalScrollBar()
+        position = scrollbar.value()
+
+        cursor = QTextCursor(self.document())
+        cursor.movePosition(QTextCursor.MoveOperation.Start)
+        cursor.beginEditBlock()
+        for record in chunk:
+            self._insert(cursor, record)
+            cursor.insertBlock()
+        cursor.endEditBlock()
+
+        scrollbar.setValue(scrollbar.maximum() if follow else position + len(chunk))
+        if self._backfill:
+            self._backfill_timer.start(0)
+
+    def clear(self):
+        self._pending.clear()
+        self._backfill = []
+        self._backfill_timer.stop()
+        super().clear()
+        self.query.update(self.query.level, self.query.needle)
 
 
 class AnimatedButton(QPushButton):
@@ -145,24 +933,106 @@ class AnimatedButton(QPushButton):
 class EnhancedSimulatorKiller(QWidget):
     def __init__(self):
         super().__init__()
+        # The widget tree is built by init_ui; in tray-only mode it is dropped while hidden
+        self.ui_root = None
+        self.ui_built = False
         self.main_layout = None
         self.title_bar = None
+        self.old_pos = None
+        self.status_text = "Ready"
+        self.process_model = ProcessTableModel(self)
+        self.process_proxy = ProcessFilterProxy(self)
+        self.process_timer = None
+        self.patterns_edit = QTextEdit()
+        self.process_patterns_edit = QTextEdit()
+        self.disk_matcher = None
+        self.process_matcher = None
+        self.notify_check = QCheckBox("Show notifications")
+        self.tasks = TaskBridge(core.runner, self)
+        self.disk_model = DiskListModel(self)
+        self.disk_proxy = DiskFilterProxy(self)
+        self.clear_cache_check = QCheckBox("Clear simulator caches on eject")
+        self.idle_cleanup_check = QCheckBox("Run heavy cleanup only when the system is idle")
+        self.idle_monitor = IdleMonitor()
+        self.cancel_generation = 0
+        self.scan_interval = QSpinBox()
+        self.force_unmount_check = QCheckBox("Always force unmount")
+        self.timeout_spin = QSpinBox()
+        self.stall_threshold_spin = QSpinBox()
+        self.metrics_check = QCheckBox("Serve Prometheus metrics on localhost")
+        self.metrics_port_spin = QSpinBox()
+        self.metrics_server = None
+        self.cache_measure_timer = None
+        self.stall_watchdog = StallWatchdog(on_stall=self.ui_stalled)
+        self.heartbeat_timer = None
+        self.watching_stalls = False
+        self.history = TrendHistory()
+        self.history_check = QCheckBox("Record disk-usage history")
+        self.history_warned = False
+        self.tray_only_check = QCheckBox("Tray-only mode: closing the window keeps watching from the tray")
+        self.quitting = False
+        self.auto_eject_check = QCheckBox("Auto-eject unmounted disks")
+        self.auto_eject_rules_edit = QTextEdit()
+        self.auto_eject = AutoEjectEngine()
+        self.mount_watch_timer = None
+        self.mount_signature = None
+        self.mount_changed_at = None
+        self.auto_eject_warned = False
+        self.auto_eject_held = {}
+        self.auto_scan_check = QCheckBox("Auto-scan on startup")
+        self.trace_check = QCheckBox("Record timing spans")
+        self.diagnostics_timer = None
+        self.save_pwd_check = QCheckBox("Save in Keychain")
+        self.password_input = QLineEdit()
+        self.log_buffer = LogBuffer()
+        self.log_sink = logsink.JsonlLogSink()
+        self.log_exporter = None
+        self.tray_icon = QSystemTrayIcon(self)
+        self.notices = NoticeQueue()
+        self.notice_timer = QTimer(self)
+        self.notice_timer.setSingleShot(True)
+        self.notice_timer.timeout.connect(self.flush_notifications)
+        self.scan_timer = None
+        self.scan_policy = None
+        self.last_probe = None
+        self.scan_pause_reason = None
+        self.last_scan_report = time.monotonic()
+        self.drag_position = None
+        self.sip_probe = SipProbe()
+        self.sip_enabled = False
+        self.scan_snapshot = ScanSnapshot()
+        self.selected_disks = []
+        # Tab index -> builder for tabs that are only constructed when first shown
+        self.pending_tabs = {}
+        self.startup_marks = {}
+        self.init_window()
+        # Setting values are read before the Settings tab exists
+        self.init_setting_defaults()
+        self.init_ui()
+        self.start_monitoring()
+        self.init_system_tray()
+        self.restore_snapshot()
+        self.mark_startup("constructed")
+
+    def create_view_widgets(self):
+        """Widgets that only exist while the window does; init_ui creates a fresh set on every build."""
         self.eject_selected_btn = AccentButton("⏏️ Eject Selected")
         self.eject_selected_btn.setObjectName("EjectSelectedButton")
-        self.old_pos = None
         self.space_stat = self.create_stat_widget("Space Used", "0 GB")
         self.mounted_stat = self.create_stat_widget("Mounted Disks", "0")
         self.connection_indicator = QLabel("●")
-        self.status_label = QLabel("Ready")
+        self.status_label = QLabel(self.status_text)
         self.scan_btn = AccentButton("🔍 Scan Disks")
         self.scan_btn.setObjectName("ScanDisksButton")
         self.log_level_combo = QComboBox()
-        self.process_table = QTableWidget()
-        self.patterns_edit = QTextEdit()
-        self.notify_check = QCheckBox("Show notifications")
+        self.process_table = QTableView()
+        self.process_filter_edit = QLineEdit()
+        self.live_refresh_check = QCheckBox("Live refresh (1s)")
         self.progress_bar = QProgressBar()
         self.nuclear_btn = AccentButton("☢️ Nuclear Option")
         self.nuclear_btn.setObjectName("NuclearOptionButton")
+        self.cancel_btn = AccentButton("⏹ Cancel")
+        self.cancel_btn.setObjectName("CancelButton")
         # Placeholders for new process tab/process buttons
         self.refresh_processes_btn = None
         self.kill_selected_btn = None
@@ -170,71 +1040,168 @@ class EnhancedSimulatorKiller(QWidget):
         self.save_btn = None
         self.clear_log_btn = None
         self.export_log_btn = None
-        self.disk_list = QListWidget()
-        self.clear_cache_check = QCheckBox("Clear simulator caches on eject")
-        self.scan_interval = QSpinBox()
-        self.force_unmount_check = QCheckBox("Always force unmount")
-        self.timeout_spin = QSpinBox()
+        self.disk_list = QListView()
+        self.disk_filter_edit = QLineEdit()
+        self.disk_mount_combo = QComboBox()
+        self.disk_sort_combo = QComboBox()
         self.process_stat = self.create_stat_widget("Simulator Processes", "0")
+        self.trend_chart = TrendChart()
+        self.trend_series_combo = QComboBox()
+        self.trend_range_combo = QComboBox()
+        self.trend_label = QLabel()
         self.tab_widget = QTabWidget()
-        self.container = QFrame(self)
-        self.auto_eject_check = None
-        self.auto_scan_check = QCheckBox("Auto-scan on startup")
-        self.save_pwd_check = QCheckBox("Save in Keychain")
-        self.password_input = QLineEdit()
+        self.diagnostics_table = QTableWidget(0, len(DIAGNOSTICS_COLUMNS))
+        self.capture_mode_combo = QComboBox()
+        self.capture_btn = None
+        self.export_trace_btn = None
+        self.capture_view = QPlainTextEdit()
+        self.diagnostics_page = None
         # Placeholder for the green zoom button (assigned in create_title_bar)
         self.green_button = None
-        self.log_viewer = QTextEdit()
-        self.tray_icon = QSystemTrayIcon(self)
-        self.fade_in = None
-        self.scan_timer = None
-        self.fade_out = None
-        self.drag_position = None
-        self.disk_scanner = DiskScanner()
-        self.process_monitor = ProcessMonitor()
-        self.selected_disks = []
-        # Add SIP status banner method before UI init
-        # (Method defined below)
-        self.init_ui()
-        self.init_system_tray()
+        # Backfills from the retained log buffer when the Activity Log tab is built
+        self.log_viewer = LogConsole(self.log_buffer)
+        self.log_search_edit = QLineEdit()
+        self.pending_tabs = {}
+
+    def create_notice_popup(self):
+        self.notice_popup = QLabel(self.ui_root)
+        self.notice_popup.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.notice_popup.setWordWrap(True)
+        self.notice_popup.hide()
+        self.notice_effect = QGraphicsOpacityEffect(self.notice_popup)
+        self.notice_popup.setGraphicsEffect(self.notice_effect)
+        self.notice_fade = QPropertyAnimation(self.notice_effect, b"opacity", self.notice_popup)
+        self.notice_fade.setDuration(200)
+        self.notice_fade.finished.connect(self.notification_faded)
+        self.notice_hide_timer = QTimer(self.notice_popup)
+        self.notice_hide_timer.setSingleShot(True)
+        self.notice_hide_timer.timeout.connect(lambda: self.fade_notification(0))
+
+    def mark_startup(self, name):
+        self.startup_marks[name] = (time.perf_counter() - LAUNCHED_AT) * 1000
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if "first_paint" not in self.startup_marks:
+            self.mark_startup("first_paint")
+            # Let this paint reach the screen before doing any startup work
+            QTimer.singleShot(0, self.finish_startup)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.update_heartbeat()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.update_heartbeat()
+
+    def changeEvent(self, event):
+        super().changeEvent(event)
+        if event.type() == QEvent.Type.WindowStateChange:
+            self.update_heartbeat()
+
+    def update_heartbeat(self, *_args):
+        """Run the heartbeat and stall watchdog only while the window is on screen or work is pending.
+
+        The heartbeat wakes the GUI thread 20 times a second; a hidden or
+        minimized window with nothing to do has no stalls worth catching.
+        """
+        if self.heartbeat_timer is None:
+            return
+        on_screen = self.isVisible() and not self.isMinimized()
+        wanted = self.watching_stalls and self.ui_built and (on_screen or self.tasks.pending > 0)
+        if wanted == self.heartbeat_timer.isActive():
+            return
+        if wanted:
+            self.heartbeat_timer.start(int(self.stall_watchdog.interval * 1000))
+            self.stall_watchdog.start()
+        else:
+            self.heartbeat_timer.stop()
+            self.stall_watchdog.stop()
 
-    def add_sip_status_banner(self):
-        import subprocess
+    def finish_startup(self):
+        self.watching_stalls = True
+        self.update_heartbeat()
 
-        try:
-            output = subprocess.check_output(["csrutil", "status"], text=True).strip().lower()
-            sip_enabled = "enabled" in output
-        except Exception:
-            sip_enabled = False
+        self.sip_probe.result_signal.connect(self.add_sip_status_banner)
+        self.sip_probe.start()
+
+        # Initial scan; restored rows are always rescanned so they stop being stale
+        if self.auto_scan_check.isChecked() or self.disk_model.stale:
+            self.scan_disks()
 
-        if sip_enabled:
+        # Automatically populate Process Manager on startup
+        self.refresh_processes()
+
+        self.update_cache_measuring()
+        self.refresh_trend()
+
+        # The event loop is free again once this fires
+        QTimer.singleShot(0, self.report_startup)
+
+    def report_startup(self):
+        self.mark_startup("interactive")
+        marks = self.startup_marks
+        self.log(f"Startup: window built {marks['constructed']:.0f} ms, first paint {marks['first_paint']:.0f} ms, "
+                 f"interactive {marks['interactive']:.0f} ms", "info")
+        # Build the remaining tabs while idle so the first switch to them is instant
+        QTimer.singleShot(0, self.build_pending_tabs)
+
+    def add_sip_status_banner(self, sip_enabled):
+        self.sip_enabled = sip_enabled
+        if sip_enabled and self.ui_built:
             banner = QLabel("⚠️ System Integrity Protection (SIP) is ENABLED. Some functions may not work.")
             banner.setStyleSheet("background-color: #aa0000; color: white; padding: 10px; border-radius: 8px;")
             banner.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.layout().addWidget(banner)
-
-    def init_ui(self):
+            self.main_layout.insertWidget(0, banner)
+
+    def add_lazy_tab(self, builder, title):
+        page = QWidget()
+        QVBoxLayout(page)
+        index = self.tab_widget.addTab(page, title)
+        self.pending_tabs[index] = builder
+        return page
+
+    def build_tab(self, index):
+        builder = self.pending_tabs.pop(index, None)
+        if builder:
+            builder(self.tab_widget.widget(index).layout())
+
+    def build_pending_tabs(self):
+        # One tab per event loop pass keeps each step short
+        if self.pending_tabs:
+            self.build_tab(next(iter(self.pending_tabs)))
+            QTimer.singleShot(0, self.build_pending_tabs)
+
+    def init_window(self):
         self.setWindowTitle("iOS Simulator Disk Ejector Pro")
         self.setFixedSize(900, 700)
         self.setWindowFlags(Qt.WindowType.FramelessWindowHint | Qt.WindowType.WindowStaysOnTopHint)
         self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
 
+        # Apply advanced styling
+        self.setStyleSheet(ADVANCED_STYLESHEET)
+
+        # The widget tree hangs off one root widget so tray-only mode can drop and rebuild it
+        window_layout = QVBoxLayout(self)
+        window_layout.setContentsMargins(0, 0, 0, 0)
+
+    def init_ui(self):
+        self.create_view_widgets()
+        self.ui_root = QWidget(self)
+
         # Main container with gradient background
+        self.container = QFrame(self.ui_root)
         self.container.setObjectName("MainContainer")
         self.container.setGeometry(0, 0, 900, 700)
 
-        # Apply advanced styling
-        self.setStyleSheet(self.get_advanced_stylesheet())
-
         # Main layout
-        main_layout = QVBoxLayout()
-        self.setLayout(main_layout)
+        main_layout = QVBoxLayout(self.ui_root)
         main_layout.setContentsMargins(0, 0, 0, 20)
         main_layout.setSpacing(0)
         self.main_layout = main_layout  # Store reference for SIP banner insertion
 
-        # SIP status banner (dynamically added if SIP is enabled)
-        self.add_sip_status_banner()
+        # SIP status banner is inserted once the background probe reports
 
         # Custom title bar
         self.create_title_bar(main_layout)
@@ -246,219 +1213,110 @@ class EnhancedSimulatorKiller(QWidget):
         # Dashboard tab
         self.create_dashboard_tab()
 
-        # Process Manager tab
-        self.create_process_tab()
-
-        # Settings tab
-        self.create_settings_tab()
-
-        # Activity Log tab
-        self.create_log_tab()
+        # The other tabs are built when first shown (or when the app goes idle)
+        self.add_lazy_tab(self.create_process_tab, "🔧 Process Manager")
+        self.add_lazy_tab(self.create_settings_tab, "⚙️ Settings")
+        self.add_lazy_tab(self.create_log_tab, "📋 Activity Log")
+        self.diagnostics_page = self.add_lazy_tab(self.create_diagnostics_tab, "🩺 Diagnostics")
+        self.tab_widget.currentChanged.connect(self.build_tab)
+        self.tab_widget.currentChanged.connect(self.diagnostics_tab_changed)
 
         # Status bar
         self.create_status_bar(main_layout)
 
-        # Start monitoring
-        self.start_monitoring()
+        self.create_notice_popup()
+        self.layout().addWidget(self.ui_root)
+        self.ui_built = True
 
-    @staticmethod
-    def get_advanced_stylesheet():
-        return """
-        QFrame#MainContainer {
-            background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                stop:0 rgba(28, 28, 30, 240),
-                stop:0.5 rgba(44, 44, 46, 240),
-                stop:1 rgba(28, 28, 30, 240));
-            border-radius: 12px;
-            border: 1px solid rgba(255, 255, 255, 0.1);
-        }
-
-        QLabel#TitleLabel {
-            color: white;
-            font-size: 18px;
-            font-weight: bold;
-            padding: 10px;
-            background: transparent;
-        }
-
-        QPushButton {
-            background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                stop:0 rgba(255, 59, 48, 200),
-                stop:1 rgba(255, 45, 35, 200));
-            color: white;
-            border: none;
-            border-radius: 8px;
-            padding: 10px 20px;
-            font-weight: 600;
-            font-size: 14px;
-        }
-
-        QPushButton:hover {
-            background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                stop:0 rgba(255, 69, 58, 255),
-                stop:1 rgba(255, 55, 45, 255));
-        }
-
-        QPushButton:pressed {
-            background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                stop:0 rgba(200, 50, 40, 255),
-                stop:1 rgba(180, 40, 30, 255));
-        }
-
-        QPushButton#RefreshButton {
-            background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                stop:0 rgba(10, 132, 255, 200),
-                stop:1 rgba(0, 122, 255, 200));
-        }
-
-        QPushButton#RefreshButton:hover {
-            background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                stop:0 rgba(20, 142, 255, 255),
-                stop:1 rgba(10, 132, 255, 255));
-        }
-
-        QTabWidget#MainTabs {
-            background: transparent;
-            border: none;
-        }
-
-        QTabWidget::pane {
-            background: rgba(44, 44, 46, 100);
-            border: 1px solid rgba(255, 255, 255, 0.1);
-            border-radius: 8px;
-            padding: 10px;
-        }
-
-        QTabBar::tab {
-            background: rgba(72, 72, 74, 150);
-            color: rgba(255, 255, 255, 0.7);
-            padding: 10px 20px;
-            margin-right: 5px;
-            border-top-left-radius: 8px;
-            border-top-right-radius: 8px;
-            font-weight: 500;
-        }
-
-        QTabBar::tab:selected {
-            background: rgba(99, 99, 102, 200);
-            color: white;
-        }
-
-        QListWidget {
-            background: rgba(30, 30, 32, 200);
-            border: 1px solid rgba(255, 255, 255, 0.1);
-            border-radius: 8px;
-            padding: 5px;
-            color: white;
-            font-size: 13px;
-        }
-
-        QListWidget::item {
-            padding: 8px;
-            margin: 2px;
-            border-radius: 6px;
-            background: rgba(72, 72, 74, 100);
-        }
-
-        QListWidget::item:selected {
-            background: rgba(10, 132, 255, 150);
-        }
-
-        QListWidget::item:hover {
-            background: rgba(99, 99, 102, 150);
-        }
-
-        QTableWidget {
-            background: rgba(30, 30, 32, 200);
-            border: 1px solid rgba(255, 255, 255, 0.1);
-            border-radius: 8px;
-            gridline-color: rgba(255, 255, 255, 0.05);
-            color: white;
-        }
-
-        QTableWidget::item {
-            padding: 5px;
-        }
-
-        QHeaderView::section {
-            background: rgba(58, 58, 60, 200);
-            color: white;
-            padding: 8px;
-            border: none;
-            font-weight: 600;
-        }
-
-        QTextEdit {
-            background: rgba(30, 30, 32, 200);
-            border: 1px solid rgba(255, 255, 255, 0.1);
-            border-radius: 8px;
-            color: #00ff00;
-            font-family: 'Menlo', 'Monaco', monospace;
-            font-size: 12px;
-            padding: 10px;
-        }
-
-        QProgressBar {
-            background: rgba(72, 72, 74, 200);
-            border: none;
-            border-radius: 4px;
-            height: 8px;
-            text-align: center;
-        }
-
-        QProgressBar::chunk {
-            background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
-                stop:0 rgba(52, 199, 89, 255),
-                stop:1 rgba(48, 209, 88, 255));
-            border-radius: 4px;
-        }
-
-        QCheckBox {
-            color: white;
-            spacing: 8px;
-        }
-
-        QCheckBox::indicator {
-            width: 18px;
-            height: 18px;
-            border: 2px solid rgba(255, 255, 255, 0.3);
-            border-radius: 4px;
-            background: rgba(72, 72, 74, 200);
-        }
-
-        QCheckBox::indicator:checked {
-            background: rgba(48, 209, 88, 255);
-            border-color: rgba(48, 209, 88, 255);
-        }
-
-        QLineEdit {
-            background: rgba(72, 72, 74, 200);
-            border: 1px solid rgba(255, 255, 255, 0.2);
-            border-radius: 6px;
-            padding: 8px;
-            color: white;
-            font-size: 14px;
-        }
-
-        QLineEdit:focus {
-            border-color: rgba(10, 132, 255, 255);
-        }
-
-        QGroupBox {
-            color: rgba(255, 255, 255, 0.9);
-            font-weight: 600;
-            border: 1px solid rgba(255, 255, 255, 0.1);
-            border-radius: 8px;
-            margin-top: 10px;
-            padding-top: 10px;
-        }
-
-        QGroupBox::title {
-            subcontrol-origin: margin;
-            left: 10px;
-            padding: 0 10px 0 10px;
-        }
+    def setting_widgets(self):
+        """Settings controls; they outlive the widget tree so their values and connections survive a rebuild."""
+        return (self.auto_scan_check, self.auto_eject_check, self.auto_eject_rules_edit, self.scan_interval,
+                self.force_unmount_check, self.clear_cache_check, self.idle_cleanup_check, self.notify_check,
+                self.tray_only_check, self.timeout_spin, self.stall_threshold_spin, self.metrics_check,
+                self.metrics_port_spin, self.history_check, self.patterns_edit, self.process_patterns_edit,
+                self.trace_check, self.password_input, self.save_pwd_check)
+
+    def teardown_ui(self):
+        """Drop the widget tree while the window is hidden (tray-only mode).
+
+        Models, settings, the task bridge, history and the watchers (auto-scan,
+        mount watch, cache measuring, metrics) keep running; rebuild_ui draws a
+        new tree from them.
         """
+        if not self.ui_built:
+            return
+        self.ui_built = False
+        # Nothing on screen to keep responsive or to refresh
+        self.update_heartbeat()
+        self.process_timer.stop()
+        self.diagnostics_timer.stop()
+        for widget in self.setting_widgets():
+            widget.setParent(None)
+        self.layout().removeWidget(self.ui_root)
+        self.ui_root.deleteLater()
+        self.ui_root = None
+        self.main_layout = None
+        self.log("Window closed to the tray; interface released", "info")
+
+    def rebuild_ui(self):
+        start = time.perf_counter()
+        self.init_ui()
+        if self.sip_enabled:
+            self.add_sip_status_banner(True)
+        self.update_disk_stats()
+        self.update_process_stats()
+        self.refresh_trend()
+        self.update_heartbeat()
+        self.log(f"Window rebuilt in {(time.perf_counter() - start) * 1000:.0f} ms", "info")
+        QTimer.singleShot(0, self.build_pending_tabs)
+
+    def hide_to_tray(self):
+        self.hide()
+        self.teardown_ui()
+        # The native window and its backing store go too; showing the window creates new ones
+        self.destroy()
+
+    def show_from_tray(self):
+        if not self.ui_built:
+            self.rebuild_ui()
+        self.showNormal()
+        self.raise_()
+        self.activateWindow()
+
+    def quit_app(self):
+        """Quit for real; in tray-only mode closing the window only hides it."""
+        self.quitting = True
+        if self.close():
+            QApplication.quit()
+
+    def init_setting_defaults(self):
+        self.auto_scan_check.setChecked(True)
+        self.scan_interval.setRange(5, 300)
+        self.scan_interval.setValue(30)
+        self.notify_check.setChecked(True)
+        self.timeout_spin.setRange(5, 60)
+        self.timeout_spin.setValue(15)
+        core.runner.default_timeout = self.timeout_spin.value()
+        self.timeout_spin.valueChanged.connect(lambda seconds: setattr(core.runner, 'default_timeout', seconds))
+        self.stall_threshold_spin.setRange(50, 5000)
+        self.stall_threshold_spin.setSingleStep(50)
+        self.stall_threshold_spin.setValue(100)
+        self.stall_watchdog.threshold = self.stall_threshold_spin.value() / 1000
+        self.stall_threshold_spin.valueChanged.connect(
+            lambda ms: setattr(self.stall_watchdog, 'threshold', ms / 1000))
+        self.history_check.setChecked(True)
+        # Without a tray there is nothing to come back from
+        self.tray_only_check.setChecked(QSystemTrayIcon.isSystemTrayAvailable())
+        self.tray_only_check.setEnabled(QSystemTrayIcon.isSystemTrayAvailable())
+        self.metrics_port_spin.setRange(1024, 65535)
+        self.metrics_port_spin.setValue(metrics.DEFAULT_PORT)
+        self.patterns_edit.setPlainText("\n".join(core.DISK_KEYWORDS))
+        self.process_patterns_edit.setPlainText("\n".join(core.PROCESS_KEYWORDS))
+        self.auto_eject_rules_edit.setPlainText(DEFAULT_RULES)
+        self.apply_patterns()
+        self.trace_check.setChecked(True)
+        tracer.enabled = True
+        self.trace_check.toggled.connect(lambda enabled: setattr(tracer, 'enabled', enabled))
 
     def create_title_bar(self, layout):
         title_bar = QFrame()
@@ -627,6 +1485,12 @@ class EnhancedSimulatorKiller(QWidget):
         self.nuclear_btn.clicked.connect(self.nuclear_option)
         controls_layout.addWidget(self.nuclear_btn)
 
+        self.cancel_btn.setEnabled(self.tasks.pending > 0)
+        self.cancel_btn.setToolTip("Stop running disk and process operations")
+        self.cancel_btn.clicked.connect(self.cancel_operations)
+        self.tasks.busy_changed.connect(self.cancel_btn.setEnabled)
+        controls_layout.addWidget(self.cancel_btn)
+
         layout.addLayout(controls_layout)
 
         # Progress bar
@@ -637,10 +1501,63 @@ class EnhancedSimulatorKiller(QWidget):
         disk_group = QGroupBox("Detected Simulator Disks")
         disk_layout = QVBoxLayout(disk_group)
 
-        self.disk_list.setSelectionMode(QListWidget.SelectionMode.MultiSelection)
+        # Filter and sort controls (handled by the proxy model)
+        disk_controls = QHBoxLayout()
+        self.disk_filter_edit.setPlaceholderText("Filter disks...")
+        self.disk_filter_edit.textChanged.connect(self.disk_proxy.set_filter_text)
+        disk_controls.addWidget(self.disk_filter_edit)
+        self.disk_mount_combo.addItems(DiskFilterProxy.MOUNT_FILTERS)
+        self.disk_mount_combo.currentTextChanged.connect(self.disk_proxy.set_mount_filter)
+        disk_controls.addWidget(self.disk_mount_combo)
+        self.disk_sort_combo.addItems(list(DiskFilterProxy.SORT_ROLES))
+        self.disk_sort_combo.currentTextChanged.connect(self.disk_proxy.set_sort_key)
+        disk_controls.addWidget(self.disk_sort_combo)
+        disk_layout.addLayout(disk_controls)
+
+        self.disk_proxy.setSourceModel(self.disk_model)
+        # The proxy outlives rebuilt views; start it from the fresh controls' values
+        self.disk_proxy.set_filter_text(self.disk_filter_edit.text())
+        self.disk_proxy.set_mount_filter(self.disk_mount_combo.currentText())
+        self.disk_proxy.set_sort_key(self.disk_sort_combo.currentText())
+        self.disk_list.setModel(self.disk_proxy)
+        self.disk_list.setSelectionMode(QListView.SelectionMode.MultiSelection)
         disk_layout.addWidget(self.disk_list)
 
-        layout.addWidget(disk_group)
+        # The trend chart below can be dragged smaller or collapsed to give the list more room
+        disk_splitter = QSplitter(Qt.Orientation.Vertical)
+        disk_splitter.addWidget(disk_group)
+        layout.addWidget(disk_splitter, 1)
+
+        # Growth of caches, disk images and process counts from the recorded history
+        trend_group = QGroupBox("Usage Trend")
+        trend_layout = QHBoxLayout(trend_group)
+        trend_controls = QVBoxLayout()
+        trend_controls.setSpacing(4)
+        self.trend_series_combo.addItem("All simulator caches", "caches.bytes")
+        for category in core.CACHE_PATHS:
+            self.trend_series_combo.addItem(category, cache_series(category))
+        self.trend_series_combo.addItem("Simulator disk images", "disks.bytes")
+        self.trend_series_combo.addItem("Mounted disks", "disks.mounted")
+        self.trend_series_combo.addItem("Simulator processes", "processes")
+        self.trend_series_combo.currentIndexChanged.connect(self.refresh_trend)
+        trend_controls.addWidget(self.trend_series_combo)
+        self.trend_range_combo.addItems(list(TREND_RANGES))
+        self.trend_range_combo.setCurrentText("7 days")
+        self.trend_range_combo.currentIndexChanged.connect(self.refresh_trend)
+        trend_controls.addWidget(self.trend_range_combo)
+        self.trend_label.setStyleSheet("color: rgba(255, 255, 255, 0.6); font-size: 11px;")
+        self.trend_label.setWordWrap(True)
+        trend_controls.addWidget(self.trend_label)
+        trend_controls.addStretch()
+        self.trend_series_combo.setFixedWidth(200)
+        self.trend_range_combo.setFixedWidth(200)
+        self.trend_label.setFixedWidth(200)
+        trend_layout.addLayout(trend_controls)
+        trend_layout.addWidget(self.trend_chart, 1)
+        disk_splitter.addWidget(trend_group)
+        disk_splitter.setCollapsible(0, False)
+        disk_splitter.setStretchFactor(0, 1)
+        disk_splitter.setSizes([180, 110])
 
         # Password input
         pwd_layout = QHBoxLayout()
@@ -658,9 +1575,7 @@ class EnhancedSimulatorKiller(QWidget):
 
         self.tab_widget.addTab(dashboard, "📊 Dashboard")
 
-    def create_process_tab(self):
-        process_widget = QWidget()
-        layout = QVBoxLayout(process_widget)
+    def create_process_tab(self, layout):
 
         # Process controls
         controls = QHBoxLayout()
@@ -682,38 +1597,52 @@ class EnhancedSimulatorKiller(QWidget):
 
         layout.addLayout(controls)
 
-        # Process table
-        self.process_table.setColumnCount(5)
-        self.process_table.setHorizontalHeaderLabels(["Select", "PID", "CPU %", "Memory %", "Process Name"])
+        # Filter and live refresh
+        filter_layout = QHBoxLayout()
+        self.process_filter_edit.setPlaceholderText("Filter processes...")
+        self.process_filter_edit.textChanged.connect(self.process_proxy.setFilterFixedString)
+        filter_layout.addWidget(self.process_filter_edit)
+        self.live_refresh_check.toggled.connect(self.toggle_live_refresh)
+        filter_layout.addWidget(self.live_refresh_check)
+        layout.addLayout(filter_layout)
+
+        # Process table (sorting and filtering happen in the proxy)
+        self.process_proxy.setSourceModel(self.process_model)
+        self.process_proxy.setFilterFixedString(self.process_filter_edit.text())
+        self.process_table.setModel(self.process_proxy)
+        self.process_table.setSortingEnabled(True)
+        self.process_table.sortByColumn(1, Qt.SortOrder.AscendingOrder)
+        self.process_table.verticalHeader().setVisible(False)
         self.process_table.horizontalHeader().setStretchLastSection(True)
-        self.process_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        self.process_table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
 
         layout.addWidget(self.process_table)
 
-        self.tab_widget.addTab(process_widget, "🔧 Process Manager")
-
-    def create_settings_tab(self):
-        settings_widget = QWidget()
-        layout = QVBoxLayout(settings_widget)
+    def create_settings_tab(self, layout):
 
         # Auto-scan settings
         auto_group = QGroupBox("Automatic Operations")
         auto_layout = QVBoxLayout(auto_group)
 
-        self.auto_scan_check.setChecked(True)
         self.auto_scan_check.setToolTip("Automatically scan for simulator disks on startup")
         auto_layout.addWidget(self.auto_scan_check)
 
-        self.auto_eject_check = QCheckBox("Auto-eject unmounted disks")
+        self.auto_eject_check.setToolTip("Detach disks matching the rules below as soon as they appear")
         auto_layout.addWidget(self.auto_eject_check)
 
+        rules_label = QLabel("Auto-eject rules (name:, mount:, min_gb:, max_gb:, min_age: joined by ;  "
+                             "allow: protects a volume name)")
+        rules_label.setStyleSheet("color: rgba(255, 255, 255, 0.6); font-size: 11px;")
+        rules_label.setWordWrap(True)
+        auto_layout.addWidget(rules_label)
+        self.auto_eject_rules_edit.setMaximumHeight(100)
+        auto_layout.addWidget(self.auto_eject_rules_edit)
+
         # Scan interval
         interval_layout = QHBoxLayout()
         scan_interval_label = QLabel("Scan Interval (seconds):")
         scan_interval_label.setStyleSheet("color: white;")
         interval_layout.addWidget(scan_interval_label)
-        self.scan_interval.setRange(5, 300)
-        self.scan_interval.setValue(30)
         interval_layout.addWidget(self.scan_interval)
         auto_layout.addLayout(interval_layout)
 
@@ -727,31 +1656,69 @@ class EnhancedSimulatorKiller(QWidget):
 
         advanced_layout.addWidget(self.clear_cache_check)
 
-        self.notify_check.setChecked(True)
+        self.idle_cleanup_check.setToolTip("Wait for no running builds, low load and quiet disks before deleting "
+                                           "caches or device data, and pause if a build starts")
+        advanced_layout.addWidget(self.idle_cleanup_check)
+
         advanced_layout.addWidget(self.notify_check)
 
+        self.tray_only_check.setToolTip("Closing the window hides it to the tray and frees the interface; auto-scan, "
+                                        "auto-eject, history and metrics keep running. Quit from the tray or the menu.")
+        advanced_layout.addWidget(self.tray_only_check)
+
         # Timeout setting
         timeout_layout = QHBoxLayout()
-        timeout_label = QLabel("Operation Timeout (ms):")
+        timeout_label = QLabel("Operation Timeout (seconds):")
         timeout_label.setStyleSheet("color: white;")
         timeout_layout.addWidget(timeout_label)
-        self.timeout_spin.setRange(5, 60)
-        self.timeout_spin.setValue(15)
         timeout_layout.addWidget(self.timeout_spin)
         advanced_layout.addLayout(timeout_layout)
 
+        stall_layout = QHBoxLayout()
+        stall_label = QLabel("Log UI stalls longer than (ms):")
+        stall_label.setStyleSheet("color: white;")
+        stall_label.setToolTip("Report any handler that keeps the window from responding for this long")
+        stall_layout.addWidget(stall_label)
+        stall_layout.addWidget(self.stall_threshold_spin)
+        advanced_layout.addLayout(stall_layout)
+
+        metrics_layout = QHBoxLayout()
+        self.metrics_check.setToolTip("Expose scan, eject, kill and cleanup counters at http://127.0.0.1:PORT/metrics; "
+                                      "scraping reads the running totals and never starts a scan")
+        metrics_layout.addWidget(self.metrics_check)
+        port_label = QLabel("Port:")
+        port_label.setStyleSheet("color: white;")
+        metrics_layout.addWidget(port_label)
+        metrics_layout.addWidget(self.metrics_port_spin)
+        advanced_layout.addLayout(metrics_layout)
+
+        self.history_check.setToolTip("Keep scan results and cache sizes in ~/Library/Application Support/"
+                                      "SimulatorEjector/history.sqlite3 for the dashboard's trend chart")
+        advanced_layout.addWidget(self.history_check)
+
         layout.addWidget(advanced_group)
 
         # Disk patterns
         patterns_group = QGroupBox("Disk Detection Patterns")
         patterns_layout = QVBoxLayout(patterns_group)
 
-        self.patterns_edit.setPlainText("Simulator\nXcode\niOS\nwatchOS\ntvOS")
         self.patterns_edit.setMaximumHeight(100)
         patterns_layout.addWidget(self.patterns_edit)
 
         layout.addWidget(patterns_group)
 
+        process_patterns_group = QGroupBox("Process Detection Patterns")
+        process_patterns_layout = QVBoxLayout(process_patterns_group)
+
+        self.process_patterns_edit.setMaximumHeight(100)
+        process_patterns_layout.addWidget(self.process_patterns_edit)
+
+        layout.addWidget(process_patterns_group)
+
+        patterns_help = QLabel("One per line: text, globs (iOS*Runtime), re:regex, !exclude, # comment")
+        patterns_help.setStyleSheet("color: rgba(255, 255, 255, 0.6); font-size: 11px;")
+        layout.addWidget(patterns_help)
+
         # Save settings button
         self.save_btn = AccentButton("💾 Save Settings")
         self.save_btn.setObjectName("SaveButton")
@@ -760,11 +1727,7 @@ class EnhancedSimulatorKiller(QWidget):
 
         layout.addStretch()
 
-        self.tab_widget.addTab(settings_widget, "⚙️ Settings")
-
-    def create_log_tab(self):
-        log_widget = QWidget()
-        layout = QVBoxLayout(log_widget)
+    def create_log_tab(self, layout):
 
         # Log controls
         log_controls = QHBoxLayout()
@@ -783,18 +1746,57 @@ class EnhancedSimulatorKiller(QWidget):
         log_label = QLabel("Log Level:")
         log_label.setStyleSheet("color: white;")
         log_controls.addWidget(log_label)
-        self.log_level_combo.addItems(["All", "Info", "Warning", "Error"])
+        self.log_level_combo.addItems(["All", "Info", "Success", "Warning", "Error"])
         self.log_level_combo.currentTextChanged.connect(self.filter_log)
         log_controls.addWidget(self.log_level_combo)
 
+        # Text search
+        self.log_search_edit.setPlaceholderText("Search log...")
+        self.log_search_edit.textChanged.connect(lambda _text: self.filter_log(self.log_level_combo.currentText()))
+        log_controls.addWidget(self.log_search_edit)
+
         log_controls.addStretch()
         layout.addLayout(log_controls)
 
-        # Log viewer
-        self.log_viewer.setReadOnly(True)
+        # Log viewer; after a tray-only rebuild it starts empty and backfills from the buffer
         layout.addWidget(self.log_viewer)
+        self.filter_log(self.log_level_combo.currentText())
+
+    def create_diagnostics_tab(self, layout):
+
+        controls = QHBoxLayout()
+        self.trace_check.setToolTip("Time every scan, parse, command, eject, delete and UI update")
+        controls.addWidget(self.trace_check)
+
+        clear_btn = AnimatedButton("🗑️ Clear")
+        clear_btn.clicked.connect(self.clear_trace)
+        controls.addWidget(clear_btn)
+
+        self.export_trace_btn = AnimatedButton("📤 Export Trace")
+        self.export_trace_btn.setToolTip("Save the recorded spans as Chrome trace-event JSON (chrome://tracing, Perfetto)")
+        self.export_trace_btn.clicked.connect(self.export_trace)
+        controls.addWidget(self.export_trace_btn)
 
-        self.tab_widget.addTab(log_widget, "📋 Activity Log")
+        controls.addStretch()
+
+        self.capture_mode_combo.addItems(["cProfile", "Sampling"])
+        controls.addWidget(self.capture_mode_combo)
+        self.capture_btn = AnimatedButton("⏱ Profile Next Operation")
+        self.capture_btn.clicked.connect(self.capture_next_operation)
+        controls.addWidget(self.capture_btn)
+        layout.addLayout(controls)
+
+        self.diagnostics_table.setHorizontalHeaderLabels(DIAGNOSTICS_COLUMNS)
+        self.diagnostics_table.verticalHeader().setVisible(False)
+        self.diagnostics_table.horizontalHeader().setStretchLastSection(True)
+        self.diagnostics_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        layout.addWidget(self.diagnostics_table, 2)
+
+        self.capture_view.setReadOnly(True)
+        self.capture_view.setPlaceholderText("Profiles of single operations appear here")
+        layout.addWidget(self.capture_view, 1)
+
+        tracer.on_capture = partial(self.tasks.bus.call, self.show_capture)
 
     def create_status_bar(self, layout):
         status_frame = QFrame()
@@ -860,7 +1862,8 @@ class EnhancedSimulatorKiller(QWidget):
             tray_menu = QMenu()
 
             show_action = tray_menu.addAction("Show")
-            show_action.triggered.connect(self.show)
+            show_action.triggered.connect(self.show_from_tray)
+            self.tray_icon.activated.connect(self.tray_activated)
 
             tray_menu.addSeparator()
 
@@ -873,108 +1876,319 @@ class EnhancedSimulatorKiller(QWidget):
             tray_menu.addSeparator()
 
             quit_action = tray_menu.addAction("Quit")
-            quit_action.triggered.connect(self.close)
+            quit_action.triggered.connect(self.quit_app)
 
             self.tray_icon.setContextMenu(tray_menu)
             self.tray_icon.show()
 
+    def tray_activated(self, reason):
+        if reason == QSystemTrayIcon.ActivationReason.Trigger:
+            self.show_from_tray()
+
     def start_monitoring(self):
         # Connect signals
-        self.disk_scanner.update_signal.connect(self.update_disk_list)
-        self.disk_scanner.progress_signal.connect(self.update_progress)
+        self.tasks.progress.connect(self.update_progress)
+        self.tasks.failed.connect(lambda message: self.log(message, "error"))
 
-        self.process_monitor.update_signal.connect(self.update_process_list)
+        # Live process refresh (only runs while enabled on the Process Manager tab)
+        self.process_timer = QTimer(self)
+        self.process_timer.timeout.connect(lambda: self.refresh_processes(background=True))
 
-        # Auto-scan timer
+        # Auto-scan: the timer ticks at the configured interval and runs a cheap
+        # probe; the adaptive policy decides whether a full scan is due
+        self.scan_policy = AdaptiveScanPolicy(self.scan_interval.value())
         self.scan_timer = QTimer()
         self.scan_timer.timeout.connect(self.auto_scan)
-        self.scan_timer.start(30000)  # 30 seconds
-
-        # Initial scan
-        if self.auto_scan_check.isChecked():
-            self.scan_disks()
+        self.scan_timer.start(self.scan_interval.value() * 1000)
+        self.scan_interval.valueChanged.connect(self.set_scan_interval)
+
+        # Two stat calls a tick; a change means a volume was just mounted or unmounted
+        self.mount_watch_timer = QTimer()
+        self.mount_watch_timer.timeout.connect(self.watch_mounts)
+        # Rescan when a disk held back by an auto-eject min_age rule comes due
+        self.auto_eject_timer = QTimer(self)
+        self.auto_eject_timer.setSingleShot(True)
+        self.auto_eject_timer.timeout.connect(lambda: self.scan_disks(background=True))
+        self.auto_eject_check.toggled.connect(self.toggle_auto_eject)
+
+        # Diagnostics figures are only recomputed while their tab is on screen
+        self.diagnostics_timer = QTimer(self)
+        self.diagnostics_timer.timeout.connect(self.refresh_diagnostics)
+
+        # Cache sizes for the metrics endpoint and the history are measured in the background
+        self.cache_measure_timer = QTimer(self)
+        self.cache_measure_timer.timeout.connect(self.measure_caches)
+        self.metrics_check.toggled.connect(self.toggle_metrics)
+        self.history_check.toggled.connect(self.update_cache_measuring)
+
+        # Heartbeat for the stall watchdog; runs from finish_startup on, while update_heartbeat wants it
+        self.heartbeat_timer = QTimer(self)
+        self.heartbeat_timer.timeout.connect(self.stall_watchdog.beat)
+        self.tasks.busy_changed.connect(self.update_heartbeat)
+
+        # The initial scans are started from finish_startup, after the first paint
+
+    def scan_disks(self, background=False):
+        self.log("Scanning for simulator disks...", "info")
+        self.show_progress(0)
+        self.set_status("Scanning disks...")
+
+        # Requests made while a scan is queued or running collapse into one follow-up scan
+        self.tasks.submit(self.update_disk_list, core.scan_disks, self.tasks.report_progress, self.disk_matcher,
+                          kind="scan_disks", priority=BACKGROUND if background else INTERACTIVE, exclusive={"disks"},
+                          coalesce=True, preemptible=background)
+
+    def restore_snapshot(self):
+        """Show the previous run's scan results, greyed out, until fresh scans replace them."""
+        sections = self.scan_snapshot.load()
+        if not sections:
+            return
 
-        # Automatically populate Process Manager on startup
-        self.refresh_processes()
+        if 'disks' in sections:
+            self.disk_model.update_disks(sections['disks'][1])
+            self.disk_model.set_stale(True)
+            self.update_disk_stats()
+        if 'processes' in sections:
+            processes = sections['processes'][1]
+            self.process_model.update_processes(processes)
+            self.process_model.set_stale(True)
+            self.update_process_stats()
+
+        saved_at = max(saved_at for saved_at, _rows in sections.values())
+        self.set_status(f"Showing results from {datetime.fromtimestamp(saved_at):%H:%M}, rescanning...")
+
+    def set_status(self, text):
+        # Kept while the window is torn down so a rebuilt status bar picks it up
+        self.status_text = text
+        if self.ui_built:
+            self.status_label.setText(text)
+
+    def show_progress(self, value):
+        """Show the progress bar at ``value``, or hide it when ``value`` is None."""
+        if not self.ui_built:
+            return
+        self.progress_bar.setVisible(value is not None)
+        if value is not None:
+            self.progress_bar.setValue(value)
 
-    def scan_disks(self):
-        self.log("Scanning for simulator disks...", "info")
-        self.progress_bar.setVisible(True)
-        self.progress_bar.setValue(0)
-        self.status_label.setText("Scanning disks...")
+    def update_disk_stats(self):
+        if not self.ui_built:
+            return
+        # Update stats from the model's running totals
+        self.mounted_stat.findChild(QLabel, "Mounted DisksValue").setText(str(self.disk_model.mounted_count))
+        self.mounted_stat.setToolTip(f"{self.disk_model.rowCount()} simulator disk(s) detected")
+        self.space_stat.findChild(QLabel, "Space UsedValue").setText(f"{self.disk_model.total_size_gb:.1f} GB")
 
-        if not self.disk_scanner.isRunning():
-            self.disk_scanner.start()
+    def update_process_stats(self):
+        if self.ui_built:
+            self.process_stat.findChild(QLabel, "Simulator ProcessesValue").setText(str(self.process_model.rowCount()))
 
     def update_disk_list(self, disks):
-        self.disk_list.clear()
-        total_size = 0
+        changed = self.disk_model.update_disks(disks)
+        if self.scan_policy:
+            self.scan_policy.record_scan(changed)
+        self.disk_model.set_stale(False)
+        self.scan_snapshot.save('disks', disks, DiskRecord, force=True)
+        self.record_history(disks=disks)
+        self.update_disk_stats()
+
+        self.show_progress(None)
+        self.set_status(f"Found {len(disks)} simulator disk(s)")
+        self.log(f"Scan complete: {len(disks)} disks found", "info")
 
-        for disk in disks:
-            item = QListWidgetItem(f"{disk['name']} ({disk['device']}) - {disk['size']}")
-            item.setData(Qt.ItemDataRole.UserRole, disk)
-            self.disk_list.addItem(item)
+        if self.auto_eject_check.isChecked():
+            self.run_auto_eject(disks)
 
-            # Calculate total size
-            try:
-                size_gb = float(disk['size'].split()[0])
-                total_size += size_gb
-            except:
-                pass
+    def toggle_auto_eject(self, enabled):
+        if enabled:
+            self.mount_signature = core.mount_signature()
+            self.mount_watch_timer.start(250)
+            self.log("Auto-eject enabled", "info")
+            self.scan_disks()
+        else:
+            self.mount_watch_timer.stop()
+            self.auto_eject_timer.stop()
+            self.log("Auto-eject disabled", "info")
 
-        # Update stats
-        self.mounted_stat.findChild(QLabel, "Mounted DisksValue").setText(str(len(disks)))
-        self.space_stat.findChild(QLabel, "Space UsedValue").setText(f"{total_size:.1f} GB")
+    def watch_mounts(self):
+        signature = core.mount_signature()
+        if signature == self.mount_signature:
+            return
+        self.mount_signature = signature
+        # The directory's mtime is when the mount happened, which is where latency starts
+        self.mount_changed_at = max((mtime for mtime in signature if mtime), default=0) / 1e9 or time.time()
+        self.scan_disks()
 
-        self.progress_bar.setVisible(False)
-        self.status_label.setText(f"Found {len(disks)} simulator disk(s)")
-        self.log(f"Scan complete: {len(disks)} disks found", "info")
+    def run_auto_eject(self, disks):
+        seen_at, self.mount_changed_at = self.mount_changed_at, None
+        candidates = self.auto_eject.observe(disks, seen_at)
+
+        # One timer, re-aimed at the earliest due time, however many scans asked
+        wait = self.auto_eject.next_due(disks)
+        if wait is not None:
+            delay = int(wait * 1000) + 100
+            if not self.auto_eject_timer.isActive() or delay < self.auto_eject_timer.remainingTime():
+                self.auto_eject_timer.start(delay)
+
+        if candidates:
+            self.tasks.submit(partial(self.auto_eject_checked, candidates), core.runtimes_in_use,
+                              kind="runtimes_in_use")
+
+    def auto_eject_checked(self, candidates, in_use):
+        if in_use is None:
+            if not self.auto_eject_warned:
+                self.auto_eject_warned = True
+                self.log("Auto-eject skipped: simctl could not say which runtimes are in use", "warning")
+            return
 
-    def update_progress(self, value):
-        self.progress_bar.setValue(value)
+        to_eject, skipped = self.auto_eject.select(candidates, in_use)
+        # Every rescan re-evaluates held-back disks; only log when the reason changes
+        held, self.auto_eject_held = self.auto_eject_held, {}
+        for disk, reason in skipped:
+            self.auto_eject_held[disk.device] = reason
+            if held.get(disk.device) != reason:
+                self.log(f"Auto-eject held back {disk.device} ({disk.name}): {reason}", "warning")
+        if not to_eject:
+            return
 
-    def refresh_processes(self):
-        self.log("Refreshing process list...", "info")
-        self.status_label.setText("Scanning processes...")
+        devices = [disk.device for disk in to_eject]
+        self.log(f"Auto-ejecting {len(devices)} disk(s)...", "info")
+        self.eject_devices(devices, lambda: self.scan_disks(background=True), self.auto_ejected)
+
+    def auto_ejected(self, device, ok):
+        latency = self.auto_eject.record_result(device, ok)
+        if latency is not None:
+            self.log(f"Auto-ejected {device} {latency:.2f} s after it appeared", "success")
+
+    def toggle_metrics(self, enabled):
+        if self.metrics_server:
+            self.metrics_server.shutdown()
+            self.metrics_server.server_close()
+            self.metrics_server = None
+            self.log("Metrics endpoint stopped", "info")
+        if enabled:
+            port = self.metrics_port_spin.value()
+            try:
+                self.metrics_server = metrics.serve(port)
+            except OSError as e:
+                self.show_notification(f"Cannot serve metrics on port {port}: {e}", "error")
+                self.metrics_check.setChecked(False)
+                return
+            self.log(f"Serving metrics at http://127.0.0.1:{port}/metrics", "info")
+        self.metrics_port_spin.setEnabled(self.metrics_server is None)
+        self.update_cache_measuring()
+
+    def cache_measuring_wanted(self):
+        return self.metrics_server is not None or self.history_check.isChecked()
+
+    def update_cache_measuring(self):
+        wanted = self.cache_measuring_wanted()
+        if wanted and not self.cache_measure_timer.isActive():
+            # Not during startup: the first measurement comes a few minutes in
+            self.cache_measure_timer.start(CACHE_MEASURE_FIRST * 1000)
+        elif not wanted:
+            self.cache_measure_timer.stop()
+
+    def measure_caches(self):
+        if not self.cache_measuring_wanted():
+            return
+        self.cache_measure_timer.start(CACHE_MEASURE_INTERVAL * 1000)
+        # Sizing walks every cache folder, so it waits for an idle machine; the
+        # wait holds no resources, so a real cleanup is never queued behind it
+        gate = IdleGate(self.idle_monitor)
 
-        if not self.process_monitor.isRunning():
-            self.process_monitor.start()
+        def idle():
+            # A dry run only sizes the folders; clean_caches records the sizes in the reclaimable gauge
+            self.tasks.submit(lambda report: self.record_history(caches=report),
+                              partial(core.clean_caches, dry_run=True), kind="measure_caches", priority=BACKGROUND,
+                              shared={"fs:caches"})
 
-    def update_process_list(self, processes):
-        self.process_table.setRowCount(len(processes))
+        self.wait_for_idle(gate, idle)
 
-        for i, proc in enumerate(processes):
-            # Checkbox
-            checkbox = QCheckBox()
-            self.process_table.setCellWidget(i, 0, checkbox)
+    def record_history(self, **results):
+        if not self.history_check.isChecked():
+            return
+        # Samples are buffered and written about once a minute; the chart follows each write
+        if self.history.record(scan_values(**results)):
+            self.refresh_trend()
+        elif self.history.error and not self.history_warned:
+            self.history_warned = True
+            self.log(f"Disk-usage history is not being recorded: {self.history.error}", "warning")
+
+    def refresh_trend(self):
+        if not self.ui_built:
+            return
+        name = self.trend_series_combo.currentData()
+        until = time.time()
+        since = until - TREND_RANGES[self.trend_range_combo.currentText()]
+        is_bytes = name not in ("disks.mounted", "processes")
+        points = self.history.points(name, since, until)
+        self.trend_chart.set_points(points, since, until, is_bytes)
+        if not points:
+            self.trend_label.setText("")
+            return
+        text = f"{format_quantity(points[-1].last, is_bytes)} now"
+        growth = growth_per_day(points)
+        if growth is not None:
+            sign = "+" if growth >= 0 else "-"
+            text += f", {sign}{format_quantity(abs(growth), is_bytes)}/day"
+        self.trend_label.setText(text)
 
-            # Process info
-            self.process_table.setItem(i, 1, QTableWidgetItem(proc['pid']))
-            self.process_table.setItem(i, 2, QTableWidgetItem(f"{proc['cpu']}%"))
-            self.process_table.setItem(i, 3, QTableWidgetItem(f"{proc['mem']}%"))
-            self.process_table.setItem(i, 4, QTableWidgetItem(proc['name']))
+    def update_progress(self, value):
+        if self.ui_built:
+            self.progress_bar.setValue(value)
+
+    def refresh_processes(self, background=False):
+        # Live refresh ticks every second; keep them out of the activity log
+        if not background:
+            self.log("Refreshing process list...", "info")
+            self.set_status("Scanning processes...")
+
+        self.tasks.submit(self.update_process_list, core.list_processes, self.process_matcher, kind="scan_processes",
+                          priority=BACKGROUND if background else INTERACTIVE, exclusive={"processes"},
+                          coalesce=True, preemptible=background)
+
+    def toggle_live_refresh(self, enabled):
+        if enabled:
+            self.process_timer.start(1000)
+        else:
+            self.process_timer.stop()
+
+    def update_process_list(self, processes):
+        self.process_model.update_processes(processes)
+        self.process_model.set_stale(False)
+        self.scan_snapshot.save('processes', processes, ProcessRecord)
+        self.record_history(processes=processes)
 
         # Update stat
-        self.process_stat.findChild(QLabel, "Simulator ProcessesValue").setText(str(len(processes)))
-        self.status_label.setText(f"Found {len(processes)} simulator process(es)")
+        self.update_process_stats()
+        self.set_status(f"Found {len(processes)} simulator process(es)")
+
+    def refuse_stale(self, model, rescan):
+        """True (after starting ``rescan``) when ``model`` still shows the previous run's rows.
+
+        Those rows may name disks or processes that are gone or have been
+        replaced, so nothing destructive acts on them until a scan has.
+        """
+        if not model.stale:
+            return False
+        self.show_notification("Results are from the last run; rescanning, try again when it finishes", "warning")
+        rescan()
+        return True
 
     def eject_selected(self):
-        selected_items = self.disk_list.selectedItems()
+        if self.refuse_stale(self.disk_model, self.scan_disks):
+            return
+        selected_items = self.disk_list.selectionModel().selectedIndexes()
         if not selected_items:
             self.show_notification("No disks selected", "warning")
             return
 
-        # Kill simulator processes before unmounting
-        try:
-            subprocess.run(["killall", "Simulator", "launchd_sim", "CoreSimulator"], stderr=subprocess.DEVNULL)
-        except Exception as e:
-            self.log(f"Exception killing simulators: {e}", level="error")
-
-        # Gather selected disks as dictionaries with 'device' keys
+        # Gather the selected disks' records
         self.selected_disks = []
-        for item in selected_items:
-            disk = item.data(Qt.ItemDataRole.UserRole)
-            if isinstance(disk, dict) and 'device' in disk:
+        for index in selected_items:
+            disk = index.data(Qt.ItemDataRole.UserRole)
+            if isinstance(disk, DiskRecord):
                 self.selected_disks.append(disk)
 
         if not self.selected_disks:
@@ -982,48 +2196,88 @@ class EnhancedSimulatorKiller(QWidget):
             return
 
         self.log(f"Ejecting {len(self.selected_disks)} selected disk(s)...", "info")
+        devices = [disk.device for disk in self.selected_disks]
 
-        for disk in self.selected_disks:
-            response = self.force_unmount_disk(disk['device'])
-            if "successful" in response.lower():
-                self.log(f"{disk['device']} ejected ✅", level="success")
-            else:
-                self.log(f"❌ Failed to eject {disk['device']}: {response}", level="error")
+        def ejected():
+            # "12 disks ejected, 2 failed" right away rather than after the coalescing window
+            self.flush_notifications()
+            # Rescan
+            self.scan_disks()
 
-        self.show_notification(f"Eject operation complete for {len(self.selected_disks)} disk(s)", "success")
-        # Rescan
-        self.scan_disks()
+        def quit_done(result):
+            ok, message = result
+            if not ok:
+                self.log(message, level="error")
+            self.eject_devices(devices, ejected, notify=True)
 
-    @staticmethod
-    def force_unmount_disk(device: str) -> str:
-        try:
-            result = subprocess.run(
-                ["hdiutil", "detach", "-force", device],
-                capture_output=True, text=True, timeout=10
-            )
-            if result.returncode == 0:
-                return f"Detached {device}"
-            else:
-                return result.stderr.strip() or result.stdout.strip()
-        except subprocess.TimeoutExpired:
-            return f"Timeout detaching {device}"
-        except Exception as e:
-            return f"Exception detaching {device}: {e}"
+        # Kill simulator processes before unmounting
+        self.tasks.submit(quit_done, core.quit_simulators, exclusive={"processes"})
 
-    def eject_disk(self, disk_id: str, password: str):
-        try:
-            result = subprocess.run(
-                ["hdiutil", "detach", "-force", disk_id],
-                capture_output=True, text=True, timeout=10
-            )
-            if result.returncode == 0:
-                self.log(f"✅ Detached {disk_id}", level="success")
+    def run_batch(self, fn, items, on_result, on_complete=None, job_options=None):
+        """Call ``fn(item)`` for each item as a scheduler job.
+
+        ``job_options(item)`` returns the job's scheduler options (kind,
+        resources). ``on_result(item, result)`` runs on the GUI thread as each
+        finishes and ``on_complete()`` once all have. Cancelled items never
+        report back.
+        """
+        remaining = [len(items)]
+
+        def done(item, result):
+            on_result(item, result)
+            remaining[0] -= 1
+            if not remaining[0] and on_complete:
+                on_complete()
+
+        for item in items:
+            self.tasks.submit(partial(done, item), fn, item, **(job_options(item) if job_options else {}))
+        if not items and on_complete:
+            on_complete()
+
+    def run_sequence(self, steps, on_complete=None):
+        """Run ``(description, fn, exclusive)`` steps one after another as scheduler jobs.
+
+        Each ``fn`` returns ``(ok, message)``, which is logged as the step finishes.
+        """
+        if not steps:
+            if on_complete:
+                on_complete()
+            return
+        description, fn, exclusive = steps[0]
+        self.log(description, "info")
+
+        def done(result):
+            ok, message = result
+            self.log(message, "success" if ok else "error")
+            self.run_sequence(steps[1:], on_complete)
+
+        self.tasks.submit(done, fn, exclusive=exclusive)
+
+    def eject_devices(self, devices, on_complete=None, on_result=None, notify=False):
+        def ejected(device, result):
+            ok, message = result
+            if ok:
+                self.log(f"{device} ejected ✅", level="success")
             else:
-                self.log(f"⚠️ Detach failed {disk_id}: {result.stderr.strip()}", level="error")
-        except subprocess.TimeoutExpired:
-            self.log(f"⏱️ Timeout detaching {disk_id}", level="error")
-        except Exception as e:
-            self.log(f"❌ Exception detaching {disk_id}: {e}", level="error")
+                self.log(f"❌ Failed to eject {device}: {message}", level="error")
+            if notify:
+                self.notify_result("eject", ok)
+            if on_result:
+                on_result(device, ok)
+
+        # Ejects run side by side but never alongside a disk scan
+        self.run_batch(core.eject_disk, devices, ejected, on_complete,
+                       lambda device: dict(kind="eject", exclusive={f"disk:{device}"}, shared={"disks"}))
+
+    def cancel_operations(self):
+        count = self.tasks.cancel_all()
+        # Also ends any wait for idle; its next check sees the new generation
+        self.cancel_generation += 1
+        # Cancelled jobs never call back, so release the auto-ejects they were running
+        self.auto_eject.abandon()
+        self.show_progress(None)
+        self.log(f"Cancelled {count} running or queued operation(s)", "warning")
+        self.show_notification("Operations cancelled", "warning")
 
     def nuclear_option(self):
         reply = QMessageBox.warning(self, "Nuclear Option",
@@ -1032,301 +2286,435 @@ class EnhancedSimulatorKiller(QWidget):
 
         if reply != QMessageBox.StandardButton.Yes:
             return
-
-        password = self.get_password()
-        if not password:
+        if self.refuse_stale(self.disk_model, self.scan_disks):
+            return
+        if self.refuse_stale(self.process_model, self.refresh_processes):
             return
 
-        self.log("Executing nuclear option...", "warning")
-        self.progress_bar.setVisible(True)
-        self.progress_bar.setValue(0)
+        def authorised(password):
+            gate = self.idle_gate()
 
-        # Kill all processes
-        self.progress_bar.setValue(25)
-        self.kill_all_simulators()
+            def start():
+                self.log("Executing nuclear option...", "warning")
+                self.show_progress(0)
 
-        # Delete all simulator devices
-        self.log("Deleting all simulator devices...", "info")
-        try:
-            subprocess.run(["xcrun", "simctl", "shutdown", "all"], check=False)
-            subprocess.run(["xcrun", "simctl", "delete", "all"], check=False)
-            self.log("All simulator devices deleted", "success")
-        except Exception as e:
-            self.log(f"Failed to delete simulator devices: {e}", "error")
+                # Kill all processes
+                self.show_progress(25)
+                self.tasks.submit(killed, core.kill_all_simulators, password, exclusive={"processes"})
 
-        # Remove device directories and profiles
-        self.log("Removing device directories and profiles...", "info")
-        try:
-            devices_path = os.path.expanduser("~/Library/Developer/CoreSimulator/Devices")
-            profiles_path = os.path.expanduser("~/Library/Developer/CoreSimulator/Profiles")
-            subprocess.run(["rm", "-rf", devices_path], check=False)
-            subprocess.run(["rm", "-rf", profiles_path], check=False)
-            self.log("Device directories and profiles removed", "success")
-        except Exception as e:
-            self.log(f"Failed to remove directories: {e}", "error")
+            def killed(results):
+                self.log_kill_results(results)
+                self.run_sequence([
+                    ("Deleting all simulator devices...", core.delete_simulator_devices,
+                     {"disks", "processes", "fs:devices"}),
+                    ("Removing device directories and profiles...", partial(core.remove_device_data, gate=gate),
+                     {"fs:devices"}),
+                    # Prevent CoreSimulator from remounting disks
+                    ("Disabling CoreSimulator service...", core.disable_core_simulator_service, {"processes"}),
+                ], rescan)
 
-        # Prevent CoreSimulator from remounting disks
-        self.log("Disabling CoreSimulator service...", "info")
-        try:
-            subprocess.run(
-                ["sudo", "launchctl", "disable", "system/com.apple.CoreSimulator.CoreSimulatorService"],
-                check=False
-            )
-            self.log("CoreSimulator service disabled", "success")
-        except Exception as e:
-            self.log(f"Failed to disable CoreSimulator service: {e}", "error")
+            def rescan():
+                # Get a fresh list, then force unmount exactly what it found
+                self.show_progress(50)
+                self.tasks.submit(scanned, core.scan_disks, None, self.disk_matcher, kind="scan_disks",
+                                  exclusive={"disks"})
 
-        # Force unmount all disks
-        self.progress_bar.setValue(50)
-        self.scan_disks()  # Get fresh list
+            def scanned(disks):
+                self.update_disk_list(disks)
+                self.nuclear_unmount_all(password, disks, gate)
 
-        # Wait for scan to complete
-        QTimer.singleShot(1000, lambda: self.nuclear_unmount_all(password))
+            self.when_idle("Nuclear option", gate, start)
 
-    def nuclear_unmount_all(self, password):
-        self.progress_bar.setValue(75)
+        self.with_password(authorised)
 
-        # Unmount all found disks using the new eject_disk logic
-        for i in range(self.disk_list.count()):
-            item = self.disk_list.item(i)
-            disk = item.data(Qt.ItemDataRole.UserRole)
-            self.eject_disk(disk['device'], password)
+    def nuclear_unmount_all(self, password, disks, gate=None):
+        self.show_progress(75)
 
-        # Clear all caches
-        self.clear_all_simulator_caches()
+        def finished():
+            self.show_progress(None)
 
-        self.progress_bar.setValue(100)
-        self.progress_bar.setVisible(False)
+            self.show_notification("Nuclear option complete!", "success")
+            self.log("Nuclear option completed", "success")
+            self.log_idle_stats("Nuclear option", gate)
 
-        self.show_notification("Nuclear option complete!", "success")
-        self.log("Nuclear option completed", "success")
+            # Final scan
+            QTimer.singleShot(500, self.scan_disks)
 
-        # Final scan
-        QTimer.singleShot(500, self.scan_disks)
+        # Unmount all found disks, then clear all caches
+        devices = [disk.device for disk in disks]
+        self.eject_devices(devices, lambda: self.clear_all_simulator_caches(finished, gate))
 
     def kill_selected_processes(self):
-        selected_pids = []
-
-        for row in range(self.process_table.rowCount()):
-            checkbox = self.process_table.cellWidget(row, 0)
-            if checkbox and checkbox.isChecked():
-                pid = self.process_table.item(row, 1).text()
-                selected_pids.append(pid)
+        if self.refuse_stale(self.process_model, self.refresh_processes):
+            return
+        selected = self.process_model.checked_processes()
 
-        if not selected_pids:
+        if not selected:
             self.show_notification("No processes selected", "warning")
             return
 
-        password = self.get_password()
-        if not password:
-            return
+        def authorised(password):
+            def killed(proc, result):
+                ok, message = result
+                self.log(message, "success" if ok else "error")
+                self.notify_result("kill", ok)
 
-        for pid in selected_pids:
-            self.kill_process(pid, password)
+            def all_killed():
+                self.flush_notifications()
+                self.refresh_processes()
 
-        # Refresh process list
-        self.refresh_processes()
+            # Each kill checks the PID still has the start time that was listed;
+            # refresh the process list once every kill has finished
+            self.run_batch(lambda proc: core.kill_process(proc.pid, password, proc.start), selected, killed,
+                           all_killed,
+                           lambda proc: dict(kind="kill", exclusive={f"pid:{proc.pid}"}, shared={"processes"}))
 
-    def kill_process(self, pid, password):
-        try:
-            script = f'do shell script "kill -9 {pid}" with administrator privileges password "{password}"'
-            subprocess.run(["osascript", "-e", script], check=False)
-            self.log(f"Killed process {pid}", "success")
-        except Exception as e:
-            self.log(f"Failed to kill process {pid}: {str(e)}", "error")
+        self.with_password(authorised)
+
+    def log_kill_results(self, results):
+        for cmd, ok in results:
+            self.log(f"Executed: {cmd}" if ok else f"Failed: {cmd}", "info" if ok else "warning")
 
     def kill_all_simulators(self):
-        password = self.get_password()
-        if not password:
-            return
+        def authorised(password):
+            def killed(results):
+                self.log_kill_results(results)
+                self.show_notification("All simulator processes killed", "success")
+                self.refresh_processes()
 
-        commands = [
-            "pkill -9 -f Simulator",
-            "pkill -9 -f CoreSimulator",
-            "pkill -9 -f SimulatorTrampoline",
-            "killall -9 com.apple.CoreSimulator.CoreSimulatorService"
-        ]
+            self.tasks.submit(killed, core.kill_all_simulators, password, exclusive={"processes"})
 
-        for cmd in commands:
-            try:
-                script = f'do shell script "{cmd}" with administrator privileges password "{password}"'
-                subprocess.run(["osascript", "-e", script], check=False)
-                self.log(f"Executed: {cmd}", "info")
-            except:
-                pass
-
-        self.show_notification("All simulator processes killed", "success")
-        self.refresh_processes()
+        self.with_password(authorised)
 
     def clear_simulator_cache(self, device):
         # Clear specific simulator cache
-        cache_paths = [
-            "~/Library/Developer/CoreSimulator/Caches",
-            "~/Library/Developer/CoreSimulator/Devices/*/data/Library/Caches"
-        ]
-
-        for path in cache_paths:
-            try:
-                subprocess.run(["rm", "-rf", path], check=False)
+        def cleared(paths):
+            for path in paths:
                 self.log(f"Cleared cache: {path}", "info")
-            except:
-                pass
 
-    def clear_all_simulator_caches(self):
-        self.log("Clearing all simulator caches...", "info")
+        self.tasks.submit(cleared, lambda: [entry['path'] for entry in core.clean_caches(["CoreSimulator Caches"])]
+                          + core.clear_device_caches(), kind="clean_caches", exclusive={"fs:caches", "fs:devices"})
+
+    def clear_all_simulator_caches(self, on_complete=None, gate=None):
+        # Part of a larger job (nuclear option) that already waited for idle, or on its own
+        own_gate = gate is None
+        if own_gate:
+            gate = self.idle_gate()
+
+        def start():
+            self.log("Clearing all simulator caches...", "info")
+            self.tasks.submit(cleared, partial(core.clean_caches, gate=gate), kind="clean_caches",
+                              exclusive={"fs:caches"})
+
+        def cleared(report):
+            for entry in report:
+                if entry['error']:
+                    self.log(f"Failed to clear {entry['path']}: {entry['error']}", "error")
+                else:
+                    self.log(f"Cleared: {entry['path']}", "success")
+            self.record_history(caches=report)
+            # The clean just measured every folder; the next background measurement can wait
+            if self.cache_measure_timer.isActive():
+                self.cache_measure_timer.start(CACHE_MEASURE_INTERVAL * 1000)
+            if own_gate:
+                self.log_idle_stats("Cache cleanup", gate)
+            if on_complete:
+                on_complete()
+
+        if own_gate:
+            self.when_idle("Cache cleanup", gate, start)
+        else:
+            start()
 
-        cache_paths = [
-            "~/Library/Developer/CoreSimulator/Caches",
-            "~/Library/Developer/CoreSimulator/Temp",
-            "~/Library/Caches/com.apple.CoreSimulator",
-            "~/Library/Developer/Xcode/DerivedData"
-        ]
+    def idle_gate(self):
+        """A fresh IdleGate if idle-aware cleanup is enabled, else None."""
+        if not self.idle_cleanup_check.isChecked():
+            return None
+        return IdleGate(self.idle_monitor, stop_check=core.runner.check_cancelled)
 
-        for path in cache_paths:
-            try:
-                expanded_path = subprocess.run(["echo", path], capture_output=True, text=True).stdout.strip()
-                subprocess.run(["rm", "-rf", expanded_path], check=False)
-                self.log(f"Cleared: {path}", "success")
-            except:
-                pass
+    def when_idle(self, name, gate, then):
+        """Call ``then()`` once ``gate`` sees an idle system (right away without a gate)."""
+        if gate is None:
+            then()
+            return
+        self.log(f"{name} queued until the system is idle", "info")
+        self.wait_for_idle(gate, then)
 
-    def get_password(self):
-        password = self.password_input.text()
+    def wait_for_idle(self, gate, then):
+        """Call ``then()`` once ``gate.poll()`` reports idle; Cancel Operations drops the wait.
 
-        if not password and self.save_pwd_check.isChecked():
-            # Try to get from keychain
-            try:
-                result = subprocess.run(
-                    ["security", "find-generic-password", "-s", "SimulatorEjector", "-w"],
-                    capture_output=True, text=True
-                )
-                if result.returncode == 0:
-                    password = result.stdout.strip()
-            except:
-                pass
-
-        if not password:
-            self.show_notification("Please enter admin password", "error")
-            return None
+        Each check is a short scheduler job and the time between checks is a
+        QTimer, so a wait that lasts a whole build holds no pool worker.
+        """
+        generation = self.cancel_generation
 
-        # Save to keychain if requested
-        if self.save_pwd_check.isChecked():
-            try:
-                subprocess.run([
-                    "security", "add-generic-password",
-                    "-a", "SimulatorEjector",
-                    "-s", "SimulatorEjector",
-                    "-w", password
-                ], check=False)
-            except:
-                pass
+        def polled(idle):
+            if generation != self.cancel_generation:
+                return
+            if idle:
+                then()
+            else:
+                QTimer.singleShot(int(gate.poll_interval * 1000), poll)
 
-        return password
+        def poll():
+            if generation == self.cancel_generation:
+                self.tasks.submit(polled, gate.poll, kind="idle_poll", priority=BACKGROUND)
 
-    def show_notification(self, message, level="info"):
-        # Color based on level
-        colors = {
-            "info": "rgba(10, 132, 255, 255)",
-            "success": "rgba(48, 209, 88, 255)",
-            "warning": "rgba(255, 159, 10, 255)",
-            "error": "rgba(255, 69, 58, 255)"
-        }
-
-        # Create popup
-        popup = QLabel(message, self)
-        popup.setStyleSheet(f"""
-            QLabel {{
-                background: {colors.get(level, colors['info'])};
-                color: white;
-                font-weight: bold;
-                padding: 15px 25px;
-                border-radius: 10px;
-                font-size: 14px;
-            }}
-        """)
-        popup.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        popup.adjustSize()
+        poll()
 
-        # Position at top center
-        popup.move((self.width() - popup.width()) // 2, 60)
+    def log_idle_stats(self, name, gate):
+        if gate is None:
+            return
+        stats = gate.finish()
+        reasons = f" ({'; '.join(stats['reasons'])})" if stats['reasons'] else ""
+        self.log(f"{name}: waited {stats['waited']:.0f} s for idle, ran {stats['ran']:.0f} s, "
+                 f"paused {stats['pauses']} time(s) for {stats['paused']:.0f} s{reasons}", "info")
+
+    def with_password(self, then):
+        """Call ``then(password)`` once the admin password is known.
+
+        A typed password wins; otherwise, with "Save in Keychain" on, the
+        keychain is read in a scheduler job so ``security`` never blocks the
+        GUI thread. The password is only written back when it differs from
+        the stored one.
+        """
+        typed = self.password_input.text()
+        if not self.save_pwd_check.isChecked():
+            if typed:
+                then(typed)
+            else:
+                self.show_notification("Please enter admin password", "error")
+            return
 
-        # Fade in animation
-        effect = QGraphicsOpacityEffect()
-        popup.setGraphicsEffect(effect)
+        def looked_up(stored):
+            password = typed or stored
+            if not password:
+                self.show_notification("Please enter admin password", "error")
+                return
+            if password != stored:
+                self.tasks.submit(None, core.save_keychain_password, password, kind="keychain")
+            then(password)
 
-        self.fade_in = QPropertyAnimation(effect, b"opacity")
-        self.fade_in.setDuration(200)
-        self.fade_in.setStartValue(0)
-        self.fade_in.setEndValue(1)
+        self.tasks.submit(looked_up, core.keychain_password, kind="keychain")
 
-        popup.show()
-        self.fade_in.start()
+    def show_notification(self, message, level="info"):
+        # Bursts (bulk operations, repeated errors) come out as one popup and at most one tray message
+        self.notices.post(message, level)
+        self.notice_timer.start(int(self.notices.due_in() * 1000))
+
+    def notify_result(self, topic, ok):
+        self.notices.post_result(topic, ok)
+        self.notice_timer.start(int(self.notices.due_in() * 1000))
+
+    def flush_notifications(self):
+        self.notice_timer.stop()
+        notice = self.notices.flush()
+        if notice is None:
+            return
 
-        # Auto hide after 3 seconds
-        QTimer.singleShot(3000, lambda: self.fade_out_notification(popup, effect))
+        # While the window is torn down (tray-only mode) only the status text and the tray message go out
+        if self.ui_built:
+            # One popup is reused; a newer notice replaces the text of one still showing
+            popup = self.notice_popup
+            popup.setStyleSheet(NOTIFICATION_STYLE.format(color=NOTIFICATION_COLORS[notice.level]))
+            popup.setText(notice.message)
+            # As wide as the text (plus padding), wrapping only when a summary outgrows the window
+            popup.ensurePolished()
+            popup.setFixedWidth(min(popup.fontMetrics().horizontalAdvance(notice.message) + 60, self.width() - 80))
+            popup.adjustSize()
+            # Position at top center
+            popup.move((self.width() - popup.width()) // 2, 60)
+            popup.raise_()
+            if not popup.isVisible():
+                self.notice_effect.setOpacity(0)
+                popup.show()
+            self.fade_notification(1)
+            self.notice_hide_timer.start(3000)
 
         # Also update status bar
-        self.status_label.setText(message)
+        self.set_status(notice.message)
 
         # System notification if enabled
-        if self.notify_check.isChecked() and hasattr(self, 'tray_icon'):
-            self.tray_icon.showMessage("Simulator Ejector", message, QSystemTrayIcon.MessageIcon.Information, 2000)
-
-    def fade_out_notification(self, popup, effect):
-        self.fade_out = QPropertyAnimation(effect, b"opacity")
-        self.fade_out.setDuration(200)
-        self.fade_out.setStartValue(1)
-        self.fade_out.setEndValue(0)
-        self.fade_out.finished.connect(popup.deleteLater)
-        self.fade_out.start()
-
-    def log(self, message, level="info"):
-        timestamp = datetime.now().strftime("%H:%M:%S")
-
-        # Color coding
-        colors = {
-            "info": "#00ff00",
-            "success": "#30d158",
-            "warning": "#ff9500",
-            "error": "#ff453a"
-        }
+        if notice.tray and self.notify_check.isChecked() and hasattr(self, 'tray_icon'):
+            self.tray_icon.showMessage("Simulator Ejector", notice.tray, QSystemTrayIcon.MessageIcon.Information, 2000)
 
-        formatted_message = f'<span style="color: #888;">[{timestamp}]</span> <span style="color: {colors.get(level, "#fff")}">{message}</span>'
+    def fade_notification(self, opacity):
+        self.notice_fade.stop()
+        self.notice_fade.setStartValue(self.notice_effect.opacity())
+        self.notice_fade.setEndValue(opacity)
+        self.notice_fade.start()
 
-        self.log_viewer.append(formatted_message)
+    def notification_faded(self):
+        if self.notice_effect.opacity() == 0:
+            self.notice_popup.hide()
 
-        # Auto-scroll to bottom
-        scrollbar = QScrollBar(Qt.Orientation.Vertical)
-        scrollbar.setStyleSheet("QScrollBar:vertical { background: transparent; width: 12px; margin: 0px; }")
-        self.log_viewer.setVerticalScrollBar(scrollbar)
-        scrollbar.setValue(scrollbar.maximum())
+    def log(self, message, level="info"):
+        record = self.log_buffer.append(level, message)
+        if self.ui_built:
+            self.log_viewer.enqueue(record)
+        self.log_sink.write(record)
 
     def clear_log(self):
+        self.log_buffer.clear()
         self.log_viewer.clear()
         self.log("Log cleared", "info")
 
     def export_log(self):
-        content = self.log_viewer.toPlainText()
-        filename = f"simulator_ejector_log_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
+        if self.log_exporter and self.log_exporter.isRunning():
+            self.show_notification("Log export already in progress", "warning")
+            return
 
-        try:
-            with open(filename, 'w') as f:
-                f.write(content)
-            self.show_notification(f"Log exported to {filename}", "success")
-        except Exception as e:
-            self.show_notification(f"Failed to export log: {str(e)}", "error")
+        default_name = f"simulator_ejector_log_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
+        filename, _ = QFileDialog.getSaveFileName(
+            self, "Export Log", os.path.join(os.path.expanduser("~/Desktop"), default_name),
+            "Text (*.txt);;JSON Lines (*.jsonl)")
+        if not filename:
+            return
+
+        # Stream the persistent segments off the UI thread
+        self.log_exporter = LogExporter(self.log_sink, filename, as_json=filename.endswith(".jsonl"))
+        self.log_exporter.done_signal.connect(
+            lambda ok, message: self.show_notification(message, "success" if ok else "error"))
+        self.log_exporter.start()
+
+    def ui_stalled(self, stall):
+        self.log(f"UI stalled {stall.duration * 1000:.0f} ms in {stall.handler}, blocked at {stall.blocked_at}",
+                 "warning")
+        if tracer.enabled:
+            duration = int(stall.duration * 1e9)
+            tracer.record(Span(stall.handler.split(" ", 1)[0], "stall", time.perf_counter_ns() - duration, duration,
+                               self.stall_watchdog.thread_id, "\n".join(stall.stack[-20:])))
+
+    def diagnostics_tab_changed(self, index):
+        if self.tab_widget.widget(index) is self.diagnostics_page:
+            self.refresh_diagnostics()
+            self.diagnostics_timer.start(1000)
+        else:
+            self.diagnostics_timer.stop()
+
+    def refresh_diagnostics(self):
+        stats = sorted(tracer.stats().items(), key=lambda item: item[1]['total'], reverse=True)
+        table = self.diagnostics_table
+        table.setRowCount(len(stats))
+        limits = [f"≤{bound:g} ms" for bound in BUCKETS_MS[:-1]] + [f">{BUCKETS_MS[-2]:g} ms"]
+        for row, ((category, name), entry) in enumerate(stats):
+            peak = max(entry['buckets'])
+            histogram = "".join(HISTOGRAM_BARS[-(-count * (len(HISTOGRAM_BARS) - 1) // peak)]
+                                for count in entry['buckets'])
+            values = (name, category, str(entry['count']), f"{entry['p50']:.1f}", f"{entry['p95']:.1f}",
+                      f"{entry['max']:.1f}", f"{entry['total']:.0f}", histogram)
+            for column, value in enumerate(values):
+                item = table.item(row, column)
+                if item is None:
+                    item = QTableWidgetItem()
+                    table.setItem(row, column, item)
+                item.setText(value)
+            table.item(row, len(values) - 1).setToolTip(
+                "\n".join(f"{limit}: {count}" for limit, count in zip(limits, entry['buckets']) if count))
+
+    def clear_trace(self):
+        tracer.clear()
+        self.refresh_diagnostics()
+
+    def export_trace(self):
+        default_name = f"simulator_ejector_trace_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        filename, _ = QFileDialog.getSaveFileName(
+            self, "Export Trace", os.path.join(os.path.expanduser("~/Desktop"), default_name), "JSON (*.json)")
+        if not filename:
+            return
+        self.tasks.submit(lambda count: self.show_notification(f"Exported {count} spans to {filename}", "success"),
+                          tracer.export_chrome, filename, kind="export_trace", priority=BACKGROUND)
+
+    def capture_next_operation(self):
+        mode = "profile" if self.capture_mode_combo.currentText() == "cProfile" else "sample"
+        tracer.capture_next(mode)
+        self.capture_view.setPlainText(f"Waiting for the next operation ({self.capture_mode_combo.currentText()})...")
+        self.log("Profiling the next operation", "info")
+
+    def show_capture(self, capture):
+        if self.ui_built:
+            self.capture_view.setPlainText(f"{capture.name}: {capture.duration:.1f} ms\n\n{capture.report}")
+        self.log(f"Profiled {capture.name} ({capture.duration:.1f} ms); see the Diagnostics tab", "info")
 
     def filter_log(self, level):
-        # TODO: Implement log filtering
-        pass
+        self.log_viewer.set_filter(None if level == "All" else level.lower(), self.log_search_edit.text())
 
     def save_settings(self):
         # TODO: Implement settings persistence
+        if not self.apply_patterns():
+            return
         self.show_notification("Settings saved", "success")
 
+    def apply_patterns(self):
+        """Recompile the detection patterns and auto-eject rules; rescan if the patterns changed.
+
+        Returns False, keeping the previous matchers, if a pattern is invalid.
+        """
+        try:
+            disk_matcher = compile_patterns(self.patterns_edit.toPlainText())
+            process_matcher = compile_patterns(self.process_patterns_edit.toPlainText())
+        except PatternError as e:
+            self.show_notification(f"Invalid pattern, {e}", "error")
+            return False
+        try:
+            self.auto_eject.set_rules(*parse_rules(self.auto_eject_rules_edit.toPlainText()))
+        except PatternError as e:
+            self.show_notification(f"Invalid auto-eject rule, {e}", "error")
+            return False
+        if not disk_matcher or not process_matcher:
+            self.show_notification("Detection patterns need at least one non-exclude pattern", "error")
+            return False
+
+        first = self.disk_matcher is None
+        disks_changed = disk_matcher is not self.disk_matcher
+        processes_changed = process_matcher is not self.process_matcher
+        self.disk_matcher, self.process_matcher = disk_matcher, process_matcher
+        if first or not (disks_changed or processes_changed):
+            return True
+        self.log("Detection patterns updated", "info")
+        if disks_changed:
+            self.scan_disks()
+        if processes_changed:
+            self.refresh_processes()
+        return True
+
+    def set_scan_interval(self, seconds):
+        self.scan_policy.set_base_interval(seconds)
+        self.scan_timer.setInterval(seconds * 1000)
+
     def auto_scan(self):
         if self.auto_scan_check.isChecked():
-            self.scan_disks()
+            self.tasks.submit(self.auto_scan_probed, core.activity_probe, kind="activity_probe",
+                              priority=BACKGROUND, coalesce=True)
+
+    def auto_scan_probed(self, probe):
+        policy = self.scan_policy
+        reason = policy.pause_reason(probe['on_battery'], probe['load_per_cpu'])
+        if reason != self.scan_pause_reason:
+            self.scan_pause_reason = reason
+            self.log(f"Auto-scan paused: {reason}" if reason else "Auto-scan resumed", "info")
+
+        # New volumes or a fresh Xcode/Simulator launch mean disks are about to change
+        previous, self.last_probe = self.last_probe, probe
+        if previous and (probe['mounts'] != previous['mounts'] or probe['apps'] - previous['apps']):
+            policy.wake(scan_now=True)
+
+        if not reason and policy.due():
+            self.scan_disks(background=True)
+
+        if time.monotonic() - self.last_scan_report >= 3600:
+            self.last_scan_report = time.monotonic()
+            self.log_scan_report()
+
+    def log_scan_report(self):
+        report = self.scan_policy.report()
+        self.log(f"Auto-scan: {report['scans']} scans in {report['hours']:.1f} h vs {report['fixed_scans']:.0f} "
+                 f"at a fixed {self.scan_policy.base_interval} s interval "
+                 f"({report['saved_per_hour']:.0f} saved per hour)", "info")
+        report = self.auto_eject.report()
+        if 'median' in report:
+            self.log(f"Auto-eject: {report['ejected']} ejected, {report['failed']} failed, mount to eject "
+                     f"median {report['median']:.2f} s, p95 {report['p95']:.2f} s, max {report['max']:.2f} s", "info")
 
     def show_menu(self):
         menu = QMenu(self)
@@ -1358,7 +2746,7 @@ class EnhancedSimulatorKiller(QWidget):
         menu.addSeparator()
 
         quit_action = menu.addAction("Quit")
-        quit_action.triggered.connect(self.close)
+        quit_action.triggered.connect(self.quit_app)
 
         menu.exec(self.mapToGlobal(QPoint(self.width() - 150, 50)))
 
@@ -1391,10 +2779,24 @@ class EnhancedSimulatorKiller(QWidget):
     # (Old drag code replaced by macOS-style above)
 
     def closeEvent(self, event):
+        if self.tray_only_check.isChecked() and not self.quitting and self.tray_icon.isVisible():
+            event.ignore()
+            self.hide_to_tray()
+            return
+
         # Save settings before closing
         # Cleanup
         if hasattr(self, 'tray_icon'):
             self.tray_icon.hide()
+        core.runner.shutdown()
+        self.watching_stalls = False
+        self.update_heartbeat()
+        if self.metrics_server:
+            self.metrics_server.shutdown()
+            self.metrics_server.server_close()
+        self.log_sink.close()
+        self.scan_snapshot.flush()
+        self.history.close()
         event.accept()
 
 
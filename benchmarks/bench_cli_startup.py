@@ -0,0 +1,57 @@
+"""Startup-time guard for the headless CLI.
+
+    python benchmarks/bench_cli_startup.py --runs 20
+
+Times ``python -m simcleaner --help`` in fresh interpreters and checks that
+importing the CLI pulls in neither PyQt6 nor the scan/eject core. Exits
+non-zero if the median is over budget or a heavy module leaked in, so it can
+run as a CI step.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+TARGET_MS = 150
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FORBIDDEN = ("PyQt6", "simcleaner.core", "simcleaner.logsink", "json")
+
+CHECK_IMPORTS = f"""
+import sys
+import simcleaner.cli
+leaked = [name for name in {FORBIDDEN!r} if name in sys.modules]
+print(",".join(leaked))
+"""
+
+
+def time_run(command):
+    start = time.perf_counter()
+    subprocess.run(command, cwd=ROOT, stdout=subprocess.DEVNULL, check=True)
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    baseline = [time_run([sys.executable, "-c", "pass"]) for _ in range(args.runs)]
+    cli = [time_run([sys.executable, "-m", "simcleaner", "--help"]) for _ in range(args.runs)]
+
+    leaked = subprocess.run([sys.executable, "-c", CHECK_IMPORTS], cwd=ROOT, capture_output=True,
+                            text=True, check=True).stdout.strip()
+
+    median = statistics.median(cli)
+    print(f"bare interpreter   median {statistics.median(baseline):7.1f} ms")
+    print(f"simcleaner --help  median {median:7.1f} ms   max {max(cli):7.1f} ms")
+    print(f"modules leaked into CLI import: {leaked or 'none'}")
+
+    ok = median < TARGET_MS and not leaked
+    print(f"target {TARGET_MS} ms, no heavy imports: {'OK' if ok else 'FAILED'}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,135 @@
+"""Worker-to-UI delivery: one queued signal per event versus the event bus.
+
+    python benchmarks/bench_event_bus.py --disks 300 --ejects 100 --runs 3
+
+Runs a disk scan (with per-line progress) and a batch of ejects against the
+fake diskutil/hdiutil from fake_tools.py, on the real scheduler and command
+runner, with a progress bar on screen (offscreen platform). The work is
+delivered two ways: the previous bridge, which emitted one queued signal
+per progress line and per finished job, and the GUI's TaskBridge, which
+goes through simcleaner.eventbus. Reports the queued cross-thread signals,
+progress bar updates, UI-thread CPU time and wall time until the last
+result was applied.
+"""
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from fake_tools import FakeTools
+
+from PyQt6.QtCore import QEventLoop, QObject, pyqtSignal
+from PyQt6.QtWidgets import QApplication, QProgressBar
+
+
+class PerEventBridge(QObject):
+    """The previous TaskBridge delivery: a queued signal for every progress value and every job."""
+    finished = pyqtSignal(object)
+    progress = pyqtSignal(int)
+
+    def __init__(self, runner):
+        from simcleaner.scheduler import Scheduler
+        super().__init__()
+        self.signals = 0
+        self.scheduler = Scheduler(runner, self._emit_finished)
+        self.finished.connect(self._deliver)
+
+    def _emit_finished(self, job):
+        self.signals += 1
+        self.finished.emit(job)
+
+    def report_progress(self, value):
+        self.signals += 1
+        self.progress.emit(value)
+
+    def submit(self, callback, fn, *args, **options):
+        from simcleaner.scheduler import Job
+        job = Job(options.pop('kind', fn.__name__), fn, args, **options)
+        return self.scheduler.submit(job, callback)
+
+    def _deliver(self, job):
+        for callback in job.callbacks:
+            callback(job.result)
+
+
+def run_once(bridge, signals, ejects):
+    from simcleaner import core
+
+    bar = QProgressBar()
+    bar.resize(400, 24)
+    bar.show()
+    updates = [0]
+
+    def set_value(value):
+        updates[0] += 1
+        bar.setValue(value)
+
+    bridge.progress.connect(set_value)
+    loop = QEventLoop()
+    remaining = [1 + len(ejects)]
+
+    def done(_result):
+        remaining[0] -= 1
+        if not remaining[0]:
+            loop.quit()
+
+    start_wall = time.perf_counter()
+    start_cpu = time.thread_time()
+    bridge.submit(done, core.scan_disks, bridge.report_progress, kind="scan_disks", exclusive={"disks"})
+    for device in ejects:
+        bridge.submit(done, core.eject_disk, device, kind="eject", exclusive={f"disk:{device}"}, shared={"disks"})
+    loop.exec()
+    cpu = (time.thread_time() - start_cpu) * 1000
+    wall = (time.perf_counter() - start_wall) * 1000
+    bar.close()
+    return signals(), updates[0], cpu, wall
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--disks", type=int, default=300)
+    parser.add_argument("--ejects", type=int, default=100)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench-event-bus-")
+    try:
+        tools = FakeTools(workdir, disks=args.disks, latency={"*": 0.002})
+        os.environ.update(tools.install())
+        app = QApplication.instance() or QApplication(sys.argv)
+
+        from simcleaner import core
+        from XcodeCleaner import TaskBridge
+
+        lines = len(core._run(["diskutil", "list"]).stdout.splitlines())
+        ejects = [f"/dev/disk{i + 10}" for i in range(args.ejects)]
+        print(f"scan of {lines} diskutil lines plus {len(ejects)} ejects, median of {args.runs} runs\n")
+        print(f"{'delivery':<12} {'signals':>8} {'bar updates':>12} {'UI CPU ms':>10} {'wall ms':>8}")
+
+        for label in ("per event", "event bus"):
+            rows = []
+            for _ in range(args.runs):
+                if label == "per event":
+                    bridge = PerEventBridge(core.runner)
+                    signals = lambda: bridge.signals
+                else:
+                    bridge = TaskBridge(core.runner)
+                    signals = lambda: bridge.bus.stats['wakes']
+                rows.append(run_once(bridge, signals, ejects))
+                bridge.deleteLater()
+            signals, updates, cpu, wall = (statistics.median(column) for column in zip(*rows))
+            print(f"{label:<12} {signals:8.0f} {updates:12.0f} {cpu:10.1f} {wall:8.0f}")
+        core.runner.shutdown()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
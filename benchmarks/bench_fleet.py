@@ -0,0 +1,129 @@
+"""Fleet controller against several local agents running on fake tools.
+
+    python benchmarks/bench_fleet.py --agents 8 --rounds 5 --max-parallel 3
+
+Starts ``--agents`` real ``python -m simcleaner agent`` processes on free
+localhost ports, each with its own HOME (a synthetic cache tree) and its own
+fake diskutil/ps/hdiutil from fake_tools.py, one of them deliberately slow
+to answer. Then times, from a FleetClient:
+
+* scanning every host one after another on fresh connections, the way a
+  script looping over hosts would, against one concurrent fan-out;
+* repeated inventory rounds, counting TCP connections opened (pooled
+  keep-alive connections are reused across rounds);
+* a cleanup with at most ``--max-parallel`` hosts cleaning at once;
+* a host that never answers, which costs one per-host timeout.
+"""
+import argparse
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, ROOT)
+
+from fake_tools import FakeTools, build_developer_tree
+
+from simcleaner import fleet
+
+TOKEN = "bench-token"
+
+
+def start_agent(index, workdir, args):
+    home = os.path.join(workdir, f"home{index}")
+    os.makedirs(home)
+    build_developer_tree(home, args.cache_files, devices=0)
+    # The last agent is the slow one
+    latency = args.slow_latency if index == args.agents - 1 else args.latency
+    tools = FakeTools(os.path.join(workdir, f"tools{index}"), disks=args.disks, processes=200,
+                      latency={"*": latency})
+    env = dict(os.environ, **tools.install(), HOME=home, SIMCLEANER_AGENT_TOKEN=TOKEN)
+    proc = subprocess.Popen([sys.executable, "-m", "simcleaner", "agent", "--port", "0", "--name", f"ci-{index:02d}"],
+                            cwd=ROOT, env=env, stderr=subprocess.PIPE, text=True)
+    line = proc.stderr.readline()
+    if "listening on" not in line:
+        proc.kill()
+        raise SystemExit(f"agent {index} did not start: {line}{proc.stderr.read()}")
+    return proc, (f"ci-{index:02d}", line.split()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--agents", type=int, default=8)
+    parser.add_argument("--disks", type=int, default=10)
+    parser.add_argument("--cache-files", type=int, default=2000)
+    parser.add_argument("--latency", type=float, default=0.01, help="seconds per fake tool call")
+    parser.add_argument("--slow-latency", type=float, default=0.05, help="tool latency on the slowest agent")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--max-parallel", type=int, default=3)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench-fleet-")
+    procs = []
+    silent = socket.socket()
+    try:
+        agents = []
+        for index in range(args.agents):
+            proc, agent = start_agent(index, workdir, args)
+            procs.append(proc)
+            agents.append(agent)
+        print(f"{len(agents)} agents up, {args.disks} disks and {args.cache_files} cache files each\n")
+
+        start = time.perf_counter()
+        for agent in agents:
+            client = fleet.FleetClient([agent], TOKEN)
+            client.scan()
+            client.close()
+        sequential = time.perf_counter() - start
+
+        client = fleet.FleetClient(agents, TOKEN)
+        start = time.perf_counter()
+        results = client.scan()
+        fan_out = time.perf_counter() - start
+        rows = fleet.merge_disks(results)
+        print(f"scan, one host at a time     {sequential * 1000:8.0f} ms")
+        print(f"scan, fanned out             {fan_out * 1000:8.0f} ms  ({len(rows)} disks merged, "
+              f"slowest host {max(result.seconds for result in results) * 1000:.0f} ms)")
+
+        before = client.stats['connections']
+        start = time.perf_counter()
+        for _ in range(args.rounds):
+            client.inventory()
+        elapsed = (time.perf_counter() - start) / args.rounds
+        print(f"inventory round              {elapsed * 1000:8.0f} ms  "
+              f"({client.stats['connections'] - before} new connections over {args.rounds} rounds "
+              f"of {len(agents)} hosts)")
+
+        start = time.perf_counter()
+        results = client.clean(max_parallel=args.max_parallel)
+        elapsed = time.perf_counter() - start
+        removed = sum(1 for row in fleet.merge_caches(results) if row[3])
+        print(f"clean, {args.max_parallel} hosts at a time     {elapsed * 1000:8.0f} ms  "
+              f"({sum(result.ok for result in results)}/{len(results)} ok, {removed} cache folders removed)")
+        client.close()
+
+        # Accepts connections but never answers
+        silent.bind(("127.0.0.1", 0))
+        silent.listen()
+        dead = ("dead", f"http://127.0.0.1:{silent.getsockname()[1]}")
+        client = fleet.FleetClient(agents + [dead], TOKEN, timeout=1.0)
+        start = time.perf_counter()
+        results = client.scan()
+        elapsed = time.perf_counter() - start
+        client.close()
+        print(f"scan with a hung host        {elapsed * 1000:8.0f} ms  (timeout 1 s; dead host: {results[-1].error})")
+    finally:
+        silent.close()
+        for proc in procs:
+            proc.terminate()
+            proc.wait()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Trend history: ingest cost, file size and chart query latency.
+
+    python benchmarks/bench_history.py --days 120 --interval 300
+
+Feeds TrendHistory ``--days`` of synthetic samples (every series the GUI
+records, one scan every ``--interval`` seconds) through its normal
+record/flush path with a fake clock, so compaction runs as it would in real
+use. A plain ``(series, time, value)`` table holding every raw sample is
+built alongside it for comparison. The benchmark then times the dashboard's
+query for each chart range against that store and against a GROUP BY over
+the raw samples.
+"""
+import argparse
+import os
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from simcleaner import history
+
+RANGES = {"24 hours": history.DAY, "7 days": 7 * history.DAY, "30 days": 30 * history.DAY,
+          "1 year": 365 * history.DAY}
+SERIES = ["disks.mounted", "disks.bytes", "processes", "caches.bytes", "cache.CoreSimulator Caches",
+          "cache.CoreSimulator Temp", "cache.CoreSimulator User Caches", "cache.DerivedData"]
+
+
+def median_ms(fn, runs):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=int, default=120)
+    parser.add_argument("--interval", type=int, default=300, help="seconds between synthetic scans")
+    parser.add_argument("--runs", type=int, default=50)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench-history-")
+    try:
+        now = [1_700_000_000.0]
+        store = history.TrendHistory(os.path.join(workdir, "history.sqlite3"), clock=lambda: now[0])
+        raw = sqlite3.connect(os.path.join(workdir, "raw.sqlite3"))
+        raw.execute("CREATE TABLE samples (series TEXT, time INTEGER, value REAL)")
+        raw.execute("CREATE INDEX samples_series_time ON samples (series, time)")
+
+        scans = args.days * history.DAY // args.interval
+        record_seconds = 0.0
+        raw_rows = []
+        for scan in range(scans):
+            now[0] += args.interval
+            # DerivedData grows through the day and is cleaned every night
+            derived = (scan * args.interval % history.DAY) * 5000.0
+            values = {name: 1e9 + scan * 1000 + index for index, name in enumerate(SERIES)}
+            values["cache.DerivedData"] = derived
+            values["processes"] = 20 + scan % 7
+            start = time.perf_counter()
+            store.record(values)
+            record_seconds += time.perf_counter() - start
+            raw_rows.extend((name, int(now[0]), value) for name, value in values.items())
+            if len(raw_rows) > 50_000:
+                with raw:
+                    raw.executemany("INSERT INTO samples VALUES (?, ?, ?)", raw_rows)
+                raw_rows = []
+        with raw:
+            raw.executemany("INSERT INTO samples VALUES (?, ?, ?)", raw_rows)
+        store.flush()
+        samples = scans * len(SERIES)
+
+        counts = store.row_counts()
+        store.close()
+        size = os.path.getsize(store.path)
+        for suffix in ("-wal", "-shm"):
+            if os.path.exists(store.path + suffix):
+                size += os.path.getsize(store.path + suffix)
+        print(f"{samples} samples over {args.days} days ({scans} scans of {len(SERIES)} series)")
+        print(f"record()           {record_seconds / scans * 1e6:8.1f} us per scan, writes included")
+        print(f"history file       {size / 1024:8.0f} KB  ({counts.get(history.MINUTE, 0)} minute, "
+              f"{counts.get(history.HOUR, 0)} hourly, {counts.get(history.DAY, 0)} daily rows)")
+        print(f"raw sample table   {os.path.getsize(os.path.join(workdir, 'raw.sqlite3')) / 1024:8.0f} KB\n")
+
+        store = history.TrendHistory(store.path, clock=lambda: now[0])
+        print(f"{'range':<10} {'points':>7} {'history ms':>11} {'raw GROUP BY ms':>16}")
+        for label, span in RANGES.items():
+            since = now[0] - span
+            resolution = history.resolution_for(span)
+            points = store.points("cache.DerivedData", since, now[0])
+            aggregated = median_ms(lambda: store.points("cache.DerivedData", since, now[0]), args.runs)
+            naive = median_ms(lambda: raw.execute(
+                "SELECT time - time % ?, count(*), avg(value), min(value), max(value) FROM samples "
+                "WHERE series = ? AND time >= ? GROUP BY 1 ORDER BY 1",
+                (resolution, "cache.DerivedData", int(since))).fetchall(), args.runs)
+            print(f"{label:<10} {len(points):7d} {aggregated:11.2f} {naive:16.2f}")
+        store.close()
+        raw.close()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Idle-aware cleanup against scripted fake load sources.
+
+    python benchmarks/bench_idle_cleanup.py --files 20000
+
+Builds a throwaway cache tree, then deletes it through IdleGate while fake
+sources play a build host's day in fast-forward: high load at first, a quiet
+spell, an xcodebuild that starts halfway through the delete, then quiet
+again. Prints when the delete started, when it paused and resumed, and the
+waiting / running / paused totals the GUI logs. Runs on any OS.
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from simcleaner import core
+from simcleaner.idle import IdleGate, IdleMonitor
+
+
+class Script:
+    """Fake load, build and disk I/O sources driven by elapsed wall time."""
+
+    def __init__(self, busy_until, build_after_checkpoints, build_for):
+        self.start = time.monotonic()
+        self.busy_until = busy_until
+        self.build_after_checkpoints = build_after_checkpoints
+        self.build_for = build_for
+        self.build_started = None
+        self.checkpoints = 0
+
+    def elapsed(self):
+        return time.monotonic() - self.start
+
+    def load(self):
+        return 2.0 if self.elapsed() < self.busy_until else 0.1
+
+    def builds(self):
+        if self.build_started is not None and time.monotonic() - self.build_started < self.build_for:
+            return {"xcodebuild"}
+        return set()
+
+    def disk_io(self):
+        return 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=20_000)
+    parser.add_argument("--poll", type=float, default=0.05, help="gate poll interval (s)")
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="idle-bench-")
+    tree = os.path.join(root, "DerivedData")
+    for i in range(args.files):
+        folder = os.path.join(tree, f"Project{i % 20}", f"Build{i % 200}")
+        os.makedirs(folder, exist_ok=True)
+        with open(os.path.join(folder, f"obj{i}.o"), "wb") as handle:
+            handle.write(b"\0" * 64)
+
+    script = Script(busy_until=0.5, build_after_checkpoints=args.files // 400, build_for=0.6)
+    monitor = IdleMonitor(load=script.load, builds=script.builds, disk_io=script.disk_io)
+    gate = IdleGate(monitor, poll_interval=args.poll, sleep=time.sleep)
+
+    checkpoint = gate.checkpoint
+
+    def scripted_checkpoint():
+        script.checkpoints += 1
+        if script.checkpoints == script.build_after_checkpoints:
+            script.build_started = time.monotonic()
+            print(f"{script.elapsed():6.2f} s  xcodebuild starts")
+        paused_before = gate.stats['pauses']
+        checkpoint()
+        if gate.stats['pauses'] != paused_before:
+            print(f"{script.elapsed():6.2f} s  delete resumed after pause")
+
+    gate.checkpoint = scripted_checkpoint
+    try:
+        gate.wait_idle()
+        print(f"{script.elapsed():6.2f} s  delete starts")
+        core.remove_tree(tree, gate)
+        stats = gate.finish()
+        print(f"{script.elapsed():6.2f} s  delete finished, tree gone: {not os.path.exists(tree)}")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    print(f"waited {stats['waited']:.2f} s, ran {stats['ran']:.2f} s, paused {stats['pauses']} time(s) "
+          f"for {stats['paused']:.2f} s: {'; '.join(stats['reasons'])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Headless benchmark: legacy per-message QTextEdit logging vs. LogBuffer + LogConsole.
+
+    python benchmarks/bench_log.py --lines 100000
+
+The legacy path is the pre-LogConsole ``log()``: format HTML, append it to a
+QTextEdit and install a freshly allocated QScrollBar on every call. The new
+path appends to the bounded LogBuffer and lets LogConsole flush coalesced
+batches on its timer. Each run reports wall time and RSS growth at each
+quarter of the run; with --lines above the buffer capacity the new path
+plateaus. The legacy run is capped with --legacy-lines because it slows down
+as the log grows.
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import QApplication, QScrollBar, QTextEdit
+
+LEVELS = ["info", "success", "warning", "error"]
+
+
+def current_rss_mb():
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except OSError:
+        import resource
+        # Peak rather than current RSS, in bytes on macOS
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 2 ** 20
+
+
+def legacy_log(viewer, message, level):
+    timestamp = datetime.now().strftime("%H:%M:%S")
+    colors = {"info": "#00ff00", "success": "#30d158", "warning": "#ff9500", "error": "#ff453a"}
+    formatted_message = (f'<span style="color: #888;">[{timestamp}]</span> '
+                         f'<span style="color: {colors.get(level, "#fff")}">{message}</span>')
+    viewer.append(formatted_message)
+    scrollbar = QScrollBar(Qt.Orientation.Vertical)
+    scrollbar.setStyleSheet("QScrollBar:vertical { background: transparent; width: 12px; margin: 0px; }")
+    viewer.setVerticalScrollBar(scrollbar)
+    scrollbar.setValue(scrollbar.maximum())
+
+
+def measure(label, app, lines, log_one):
+    rss_before = current_rss_mb()
+    checkpoints = []
+    start = time.perf_counter()
+    for i in range(lines):
+        log_one(f"Ejected /dev/disk{i % 512}s1 (iOS 17.{i % 5} Simulator runtime)", LEVELS[i % 4])
+        if i % 1000 == 0:
+            app.processEvents()
+        if (i + 1) % max(1, lines // 4) == 0:
+            checkpoints.append(current_rss_mb() - rss_before)
+    app.processEvents()
+    elapsed = time.perf_counter() - start
+    growth = "  ".join(f"+{mb:.1f}" for mb in checkpoints)
+    print(f"{label:<8} {lines:>7} lines  {elapsed:8.2f} s  {lines / elapsed:10.0f} lines/s  "
+          f"RSS MB at each quarter: {growth}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, default=100_000)
+    parser.add_argument("--legacy-lines", type=int, default=20_000)
+    parser.add_argument("--capacity", type=int, default=50_000, help="LogBuffer capacity")
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    from simcleaner.logbuffer import LogBuffer
+    from XcodeCleaner import LogConsole
+
+    viewer = QTextEdit()
+    viewer.setReadOnly(True)
+    viewer.show()
+    measure("legacy", app, min(args.lines, args.legacy_lines), lambda msg, lvl: legacy_log(viewer, msg, lvl))
+    viewer.close()
+
+    buffer = LogBuffer(args.capacity)
+    console = LogConsole(buffer)
+    console.show()
+
+    def log_one(message, level):
+        console.enqueue(buffer.append(level, message))
+
+    measure("batched", app, args.lines, log_one)
+    console.flush()
+    print(f"buffered records {len(buffer)}, viewer lines {console.document().blockCount()}")
+
+
+if __name__ == "__main__":
+    main()
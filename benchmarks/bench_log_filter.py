@@ -0,0 +1,80 @@
+"""Headless benchmark: switching log level/text filters over a large LogBuffer.
+
+    python benchmarks/bench_log_filter.py --records 200000
+
+Fills a LogBuffer, then times LogConsole.set_filter for a series of level
+and search changes, including the repaint of the first screenful. Backfilling
+older matches above the visible lines happens afterwards from the event loop
+and is reported separately.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt6.QtWidgets import QApplication
+
+TARGET_MS = 50
+FILTERS = [
+    ("All", ""),
+    ("error", ""),
+    ("warning", ""),
+    ("All", "d"),
+    ("All", "disk"),
+    ("All", "disk5"),
+    ("All", "disk51"),
+    ("All", "disk511"),
+    ("error", "disk511"),
+    ("info", "timeout"),
+    ("All", "no such text"),
+    ("All", ""),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=200_000)
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    from simcleaner.logbuffer import LEVELS, LogBuffer
+    from XcodeCleaner import LogConsole
+
+    rng = random.Random(7)
+    buffer = LogBuffer(args.records)
+    for i in range(args.records):
+        if rng.random() < 0.01:
+            buffer.append("error", f"Timeout detaching /dev/disk{rng.randrange(600)}")
+        else:
+            buffer.append(rng.choice(LEVELS), f"Ejected /dev/disk{rng.randrange(600)}s1 (iOS 17.{i % 5} runtime)")
+
+    console = LogConsole(buffer)
+    console.resize(860, 520)
+    console.show()
+    app.processEvents()
+
+    worst = 0.0
+    for level, needle in FILTERS:
+        start = time.perf_counter()
+        console.set_filter(None if level == "All" else level, needle)
+        console.viewport().repaint()
+        elapsed = (time.perf_counter() - start) * 1000
+        worst = max(worst, elapsed)
+
+        start = time.perf_counter()
+        while console._backfill:
+            app.processEvents()
+        backfill = (time.perf_counter() - start) * 1000
+        print(f"{level:<8} {needle!r:<16} {len(console.query._matches):>6} matches  "
+              f"{elapsed:7.2f} ms to first paint   {backfill:7.1f} ms backfill")
+
+    verdict = "OK" if worst < TARGET_MS else "OVER BUDGET"
+    print(f"worst filter switch {worst:.2f} ms (target {TARGET_MS} ms): {verdict}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Metrics: cost of an update, and scrape latency while workers keep updating.
+
+    python benchmarks/bench_metrics.py --scrapes 200 --writers 4
+
+Times counter, gauge and histogram updates on the shared registry, then
+serves it on a free localhost port and scrapes it repeatedly while
+``--writers`` threads record ejects, scans and deletes as fast as they can.
+A scrape only formats in-memory totals, so its latency should stay flat and
+no external tool is ever run.
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+import urllib.request
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from simcleaner import metrics
+
+
+def per_call_ns(fn, calls):
+    start = time.perf_counter_ns()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter_ns() - start) / calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=100_000)
+    parser.add_argument("--scrapes", type=int, default=200)
+    parser.add_argument("--writers", type=int, default=4)
+    args = parser.parse_args()
+
+    updates = (
+        ("counter inc", lambda: metrics.ejects.inc(result="ok")),
+        ("gauge set", lambda: metrics.reclaimable_bytes.set(123, category="DerivedData")),
+        ("histogram observe", lambda: metrics.eject_seconds.observe(0.3)),
+    )
+    for label, fn in updates:
+        print(f"{label:<20} {per_call_ns(fn, args.calls):7.0f} ns")
+
+    server = metrics.serve(0)
+    url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+    stop = threading.Event()
+    writes = [0] * args.writers
+
+    def writer(index):
+        while not stop.is_set():
+            metrics.ejects.inc(result="failed" if index % 2 else "ok")
+            metrics.eject_seconds.observe(0.1 * index)
+            metrics.scan_seconds.observe(0.5, kind="disks")
+            metrics.delete_seconds.observe(2.0, category=f"category {index}")
+            writes[index] += 1
+
+    threads = [threading.Thread(target=writer, args=(i,), daemon=True) for i in range(args.writers)]
+    for thread in threads:
+        thread.start()
+    latencies = []
+    size = 0
+    for _ in range(args.scrapes):
+        start = time.perf_counter()
+        with urllib.request.urlopen(url) as response:
+            size = len(response.read())
+        latencies.append((time.perf_counter() - start) * 1000)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    server.shutdown()
+    server.server_close()
+
+    latencies.sort()
+    print(f"\n{args.scrapes} scrapes of {size / 1024:.1f} KB with {args.writers} writers "
+          f"({sum(writes)} updates meanwhile):")
+    print(f"  median {latencies[len(latencies) // 2]:.2f} ms, p95 {latencies[int(len(latencies) * 0.95)]:.2f} ms, "
+          f"max {latencies[-1]:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""Multi-user cache sweep: one user at a time versus users and workers in parallel.
+
+    python benchmarks/bench_multi_user.py --users 12 --files 1000 --max-users 4 --per-user 2 --io-latency 0.1
+
+Builds a synthetic ``/Users`` layout in a temporary directory (a Shared
+folder and ``--users`` homes, each with ``--files`` cache files spread over
+CoreSimulator caches and DerivedData projects by fake_tools) and runs
+simcleaner.homes.sweep over it three ways: one user and one thread at a
+time, as a loop over ``clean`` per account would; ``--max-users`` users at
+once with one thread each; and ``--max-users`` users with ``--per-user``
+threads each. Each way is timed as a dry run (sizing only) and as a real
+clean on a fresh tree. A sampler watches the sweep's threads to check the
+limits held, and the tree is walked afterwards to check nothing was left.
+
+A temporary directory on a local SSD answers metadata calls from memory, so
+``--io-latency`` adds that many milliseconds to every lstat and unlink the
+sweep makes, standing in for a cold disk or network-mounted homes where the
+workers spend their time waiting; 0 measures this machine's own syscalls.
+"""
+import argparse
+import contextlib
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+from fake_tools import build_developer_tree
+
+from simcleaner import homes
+
+
+def build_users(root, users, files):
+    shutil.rmtree(root, ignore_errors=True)
+    os.makedirs(os.path.join(root, "Shared", "Library"))
+    for index in range(users):
+        # Uneven homes, as on a real build machine: a few accounts hold most of the caches
+        build_developer_tree(os.path.join(root, f"ci{index:02d}"), files * (3 if index % 4 == 0 else 1),
+                             devices=0, seed=index)
+
+
+@contextlib.contextmanager
+def slow_metadata(latency_ms):
+    """Make os.lstat and os.unlink (which the sweep's sizing and shutil.rmtree use) wait ``latency_ms``."""
+    real = {name: getattr(os, name) for name in ("lstat", "unlink")}
+
+    def slowed(fn):
+        def call(*args, **kwargs):
+            time.sleep(latency_ms / 1000)
+            return fn(*args, **kwargs)
+        return call
+
+    if latency_ms:
+        for name, fn in real.items():
+            setattr(os, name, slowed(fn))
+    try:
+        yield
+    finally:
+        for name, fn in real.items():
+            setattr(os, name, fn)
+
+
+def cache_files(root):
+    return sum(len(files) for _dir, _dirs, files in os.walk(root))
+
+
+class ThreadSampler:
+    """Peak number of sweep worker threads, overall and for any one user."""
+
+    def __init__(self, interval=0.001):
+        self.interval = interval
+        self.peak_total = 0
+        self.peak_user = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            per_user = {}
+            for thread in threading.enumerate():
+                # Per-user pools name their threads Sweep-<user>_<n>
+                if thread.name.startswith("Sweep-"):
+                    user = thread.name[len("Sweep-"):].rsplit("_", 1)[0]
+                    per_user[user] = per_user.get(user, 0) + 1
+            self.peak_total = max(self.peak_total, sum(per_user.values()))
+            self.peak_user = max(self.peak_user, max(per_user.values(), default=0))
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+def timed_sweep(root, dry_run, max_users, per_user, latency_ms):
+    found = homes.discover_homes(root)
+    with slow_metadata(latency_ms), ThreadSampler() as sampler:
+        start = time.perf_counter()
+        results = homes.sweep(found, dry_run=dry_run, max_users=max_users, per_user=per_user)
+        elapsed = (time.perf_counter() - start) * 1000
+    return elapsed, results, sampler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=12)
+    parser.add_argument("--files", type=int, default=1000, help="cache files per ordinary user (some get 3x)")
+    parser.add_argument("--max-users", type=int, default=4)
+    parser.add_argument("--per-user", type=int, default=2)
+    parser.add_argument("--io-latency", type=float, default=0.1, metavar="MS",
+                        help="added to every lstat and unlink during the sweeps (0 for none)")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench-multi-user-")
+    root = os.path.join(workdir, "Users")
+    try:
+        build_users(root, args.users, args.files)
+        total_files = cache_files(root)
+        found = homes.discover_homes(root)
+        print(f"{len(found)} homes under a synthetic /Users (Shared skipped), {total_files} cache files, "
+              f"{args.io_latency:g} ms per lstat/unlink\n")
+        print(f"{'mode':<22} {'size ms':>8} {'clean ms':>9} {'peak threads':>13} {'per user':>9} {'left':>5}")
+
+        modes = (("one user at a time", 1, 1), (f"{args.max_users} users x 1", args.max_users, 1),
+                 (f"{args.max_users} users x {args.per_user}", args.max_users, args.per_user))
+        for label, max_users, per_user in modes:
+            sizing, cleaning, left = [], [], 0
+            for _ in range(args.runs):
+                build_users(root, args.users, args.files)
+                elapsed, _results, sampler = timed_sweep(root, True, max_users, per_user, args.io_latency)
+                sizing.append(elapsed)
+                elapsed, results, sampler = timed_sweep(root, False, max_users, per_user, args.io_latency)
+                cleaning.append(elapsed)
+                left = cache_files(root)
+            print(f"{label:<22} {statistics.median(sizing):8.0f} {statistics.median(cleaning):9.0f} "
+                  f"{sampler.peak_total:13d} {sampler.peak_user:9d} {left:5d}")
+
+        print("\nper user, last clean:")
+        for result in results:
+            entries = sum(1 for entry in result.caches if entry['removed'])
+            print(f"  {result.user:<8} {entries} cache folders emptied in {result.seconds * 1000:6.0f} ms, "
+                  f"{result.errors} error(s)")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
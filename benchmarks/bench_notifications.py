@@ -0,0 +1,150 @@
+"""Notification bursts: one popup per call versus the coalescing queue.
+
+    python benchmarks/bench_notifications.py --burst 200
+
+Fires ``--burst`` per-disk eject results at a window (offscreen), first the
+way show_notification used to handle them, with a new QLabel, opacity
+effect, fade animations and tray message for each, and then through the
+GUI's NoticeQueue path. For each it reports the cost of posting, the CPU the
+event loop then spends painting and animating until the popups are shown,
+how many popups were alive at once and how many tray messages went out.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtCore import QEventLoop, QPropertyAnimation, QTimer
+from PyQt6.QtWidgets import QApplication, QGraphicsOpacityEffect, QLabel, QWidget
+
+from simcleaner.notices import NoticeQueue
+
+# Seconds of event loop watched after a burst; covers the queue window and the fade-in
+OBSERVE = 1.0
+
+
+def run_loop(seconds):
+    loop = QEventLoop()
+    QTimer.singleShot(int(seconds * 1000), loop.quit)
+    loop.exec()
+
+
+def loop_cpu_ms(seconds):
+    """CPU milliseconds the event loop spends over the next ``seconds`` (paints, animations)."""
+    start = time.process_time()
+    run_loop(seconds)
+    return (time.process_time() - start) * 1000
+
+
+class PerCallWindow(QWidget):
+    """The previous show_notification, reduced to its widgets and timers."""
+
+    def __init__(self):
+        super().__init__()
+        self.resize(900, 700)
+        self.tray_messages = 0
+        self.fade_in = None
+        self.fade_out = None
+
+    def show_notification(self, message):
+        popup = QLabel(message, self)
+        popup.setStyleSheet("QLabel { background: rgba(48, 209, 88, 255); color: white; font-weight: bold; "
+                            "padding: 15px 25px; border-radius: 10px; font-size: 14px; }")
+        popup.adjustSize()
+        popup.move((self.width() - popup.width()) // 2, 60)
+        effect = QGraphicsOpacityEffect()
+        popup.setGraphicsEffect(effect)
+        self.fade_in = QPropertyAnimation(effect, b"opacity")
+        self.fade_in.setDuration(200)
+        self.fade_in.setStartValue(0)
+        self.fade_in.setEndValue(1)
+        popup.show()
+        self.fade_in.start()
+        QTimer.singleShot(3000, lambda: self.fade_out_notification(popup, effect))
+        self.tray_messages += 1
+
+    def fade_out_notification(self, popup, effect):
+        self.fade_out = QPropertyAnimation(effect, b"opacity")
+        self.fade_out.setDuration(200)
+        self.fade_out.setStartValue(1)
+        self.fade_out.setEndValue(0)
+        self.fade_out.finished.connect(popup.deleteLater)
+        self.fade_out.start()
+
+
+class QueuedWindow(QWidget):
+    """The current path: NoticeQueue, one reused popup and one fade animation."""
+
+    def __init__(self):
+        super().__init__()
+        self.resize(900, 700)
+        self.tray_messages = 0
+        self.notices = NoticeQueue()
+        self.notice_timer = QTimer(self)
+        self.notice_timer.setSingleShot(True)
+        self.notice_timer.timeout.connect(self.flush_notifications)
+        self.popup = QLabel(self)
+        self.popup.hide()
+        self.effect = QGraphicsOpacityEffect(self.popup)
+        self.popup.setGraphicsEffect(self.effect)
+        self.fade = QPropertyAnimation(self.effect, b"opacity", self)
+        self.fade.setDuration(200)
+
+    def notify_result(self, ok):
+        self.notices.post_result("eject", ok)
+        self.notice_timer.start(int(self.notices.due_in() * 1000))
+
+    def flush_notifications(self):
+        notice = self.notices.flush()
+        if notice is None:
+            return
+        self.popup.setText(notice.message)
+        self.popup.adjustSize()
+        self.popup.show()
+        self.fade.stop()
+        self.fade.setStartValue(self.effect.opacity())
+        self.fade.setEndValue(1)
+        self.fade.start()
+        self.tray_messages += notice.tray is not None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--burst", type=int, default=200)
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    print(f"{args.burst} eject results in one burst\n")
+    print(f"{'path':<10} {'post us/call':>12} {'loop CPU ms':>12} {'popups':>7} {'tray msgs':>10}")
+
+    window = PerCallWindow()
+    window.show()
+    run_loop(0.2)
+    start = time.perf_counter()
+    for i in range(args.burst):
+        window.show_notification(f"/dev/disk{i} ejected")
+    post = (time.perf_counter() - start) / args.burst * 1e6
+    cpu = loop_cpu_ms(OBSERVE)
+    popups = len(window.findChildren(QLabel))
+    print(f"{'per call':<10} {post:12.1f} {cpu:12.1f} {popups:7d} {window.tray_messages:10d}")
+    window.close()
+
+    window = QueuedWindow()
+    window.show()
+    run_loop(0.2)
+    start = time.perf_counter()
+    for i in range(args.burst):
+        window.notify_result(i % 10 != 0)
+    post = (time.perf_counter() - start) / args.burst * 1e6
+    cpu = loop_cpu_ms(OBSERVE)
+    popups = len(window.findChildren(QLabel))
+    print(f"{'queued':<10} {post:12.1f} {cpu:12.1f} {popups:7d} {window.tray_messages:10d}")
+    print(f"\nshown: {window.popup.text()}")
+    window.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Line classification: compiled pattern matcher versus chained substring checks.
+
+    python benchmarks/bench_patterns.py --lines 100000
+
+Generates synthetic ``diskutil list`` and ``ps aux`` lines (about one in
+twenty simulator-related) and classifies them with the old
+``any(keyword in line ...)`` loop and with simcleaner.patterns. Both must
+agree; the extra pattern sets show what globs, regexes and excludes cost.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from simcleaner import core
+from simcleaner.patterns import compile_patterns
+
+DISK_LINES = (
+    "   1:                APFS Volume Macintosh HD            15.3 GB    disk3s1",
+    "   2:                APFS Volume Data                    402.1 GB   disk3s5",
+    "   0:      GUID_partition_scheme                        *1.0 TB     disk0",
+    "   1:                APFS Volume Time Machine Backup     812.0 GB   disk5s1",
+)
+SIM_DISK_LINES = (
+    "   1:                APFS Volume iOS 17.4 Simulator      18.2 GB    disk7s1",
+    "   1:                APFS Volume watchOS 10.2 Simulator  9.1 GB     disk9s1",
+    "   1:                APFS Volume Xcode Cache             3.2 GB     disk8s1",
+)
+PROCESS_LINES = (
+    "/usr/libexec/trustd --agent",
+    "/System/Applications/Mail.app/Contents/MacOS/Mail",
+    "/Applications/Slack.app/Contents/Frameworks/Slack Helper (Renderer).app/Contents/MacOS/Slack Helper",
+    "/usr/sbin/cfprefsd agent",
+)
+SIM_PROCESS_LINES = (
+    "/Library/Developer/PrivateFrameworks/CoreSimulator.framework/Versions/A/XPCServices/SimulatorTrampoline",
+    "/Applications/Xcode.app/Contents/Developer/Applications/Simulator.app/Contents/MacOS/Simulator",
+    "launchd_sim /Users/dev/Library/Developer/CoreSimulator/Devices/1234/data/var/run/launchd_bootstrap.plist",
+)
+
+
+def synthetic(count, plain, simulator, rng):
+    return [rng.choice(simulator) if rng.random() < 0.05 else rng.choice(plain) for _ in range(count)]
+
+
+def best_of(repeat, fn, lines):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        hits = fn(lines)
+        best = min(best, time.perf_counter() - start)
+    return best, hits
+
+
+def report(name, seconds, count, baseline=None):
+    speedup = f"  {baseline / seconds:4.1f}x" if baseline else ""
+    print(f"  {name:<34} {seconds * 1000:8.1f} ms  {count / seconds / 1e6:6.2f} M lines/s{speedup}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    rng = random.Random(42)
+
+    suites = (
+        ("disks", synthetic(args.lines, DISK_LINES, SIM_DISK_LINES, rng), core.DISK_KEYWORDS,
+         ("*Simulator*", "re:(iOS|watchOS|tvOS|xrOS) [\\d.]+", "Xcode", "!Backup")),
+        ("processes", synthetic(args.lines, PROCESS_LINES, SIM_PROCESS_LINES, rng), core.PROCESS_KEYWORDS,
+         ("CoreSimulator*", "Simulator", "launchd_sim", "re:SimulatorTrampoline$", "!Helper")),
+    )
+    for name, lines, keywords, extended in suites:
+        def chained(lines, keywords=keywords):
+            return sum(1 for line in lines if any(keyword in line for keyword in keywords))
+
+        matcher = compile_patterns(keywords)
+        extended_matcher = compile_patterns(extended)
+
+        def compiled(lines, matcher=matcher):
+            return sum(1 for line in lines if matcher(line))
+
+        def compiled_extended(lines):
+            return sum(1 for line in lines if extended_matcher(line))
+
+        print(f"{name}: {len(lines)} lines, {len(keywords)} keywords")
+        baseline, expected = best_of(args.repeat, chained, lines)
+        report("any(keyword in line)", baseline, len(lines))
+        seconds, hits = best_of(args.repeat, compiled, lines)
+        assert hits == expected, (hits, expected)
+        report("compiled matcher", seconds, len(lines), baseline)
+        seconds, _ = best_of(args.repeat, compiled_extended, lines)
+        report(f"compiled, {len(extended)} mixed patterns", seconds, len(lines), baseline)
+        print(f"  {expected} matching lines")
+
+
+if __name__ == "__main__":
+    main()
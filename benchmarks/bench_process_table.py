@@ -0,0 +1,125 @@
+"""Headless benchmark: legacy QTableWidget rebuild vs. the diffing ProcessTableModel.
+
+Runs under the ``offscreen`` Qt platform so it works over SSH and in CI:
+
+    python benchmarks/bench_process_table.py --rows 5000 --ticks 30
+
+Each tick simulates one live refresh: a few percent of processes exit, a few
+new ones start and about half of the rest report new CPU figures. The table
+is shown and sorted by CPU. "update" is the time spent applying the refresh to
+the table, which is what has to fit in a frame; "with repaint" adds a forced
+full repaint and event processing, which the offscreen raster backend makes
+noticeably slower than a real display.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import QApplication, QCheckBox, QTableView, QTableWidget, QTableWidgetItem
+
+from simcleaner.records import ProcessRecord
+
+FRAME_BUDGET_MS = 1000 / 60
+
+
+def synthetic_processes(count, churn, ticks, seed=1):
+    rng = random.Random(seed)
+    next_pid = 1000
+    live = []
+    for _ in range(count):
+        live.append(ProcessRecord(next_pid, '10:00AM', 0.0, 0.1,
+                                  f"/Applications/Simulator.app/Contents/MacOS/Simulator -id {next_pid}"))
+        next_pid += 1
+
+    snapshots = []
+    for _ in range(ticks):
+        survivors = [proc for proc in live if rng.random() >= churn]
+        for _ in range(count - len(survivors)):
+            survivors.append(ProcessRecord(next_pid, '10:01AM', 0.0, 0.1, f"launchd_sim {next_pid}"))
+            next_pid += 1
+        live = [proc._replace(cpu=round(rng.random() * 10, 1)) if rng.random() < 0.5 else proc
+                for proc in survivors]
+        snapshots.append(live)
+    return snapshots
+
+
+def legacy_update(table, processes):
+    # The pre-model update_process_list, reading records instead of dicts
+    table.setRowCount(len(processes))
+    for i, proc in enumerate(processes):
+        checkbox = QCheckBox()
+        table.setCellWidget(i, 0, checkbox)
+        table.setItem(i, 1, QTableWidgetItem(str(proc.pid)))
+        table.setItem(i, 2, QTableWidgetItem(f"{proc.cpu:.1f}%"))
+        table.setItem(i, 3, QTableWidgetItem(f"{proc.mem:.1f}%"))
+        table.setItem(i, 4, QTableWidgetItem(proc.name))
+
+
+def run(app, view, update, snapshots):
+    """Return per-refresh (update, update + repaint) timings in milliseconds."""
+    timings = []
+    for processes in snapshots:
+        start = time.perf_counter()
+        update(processes)
+        updated = time.perf_counter()
+        view.viewport().repaint()
+        app.processEvents()
+        timings.append(((updated - start) * 1000, (time.perf_counter() - start) * 1000))
+    return timings
+
+
+def percentiles(values):
+    values = sorted(values)
+    return values[len(values) // 2], values[min(len(values) - 1, int(len(values) * 0.95))]
+
+
+def report(label, timings):
+    update_median, update_p95 = percentiles([update for update, _ in timings])
+    total_median, total_p95 = percentiles([total for _, total in timings])
+    dropped = sum(1 for update, _ in timings if update > FRAME_BUDGET_MS)
+    print(f"{label:<8} update median {update_median:8.2f} ms  p95 {update_p95:8.2f} ms   "
+          f"with repaint median {total_median:8.2f} ms  p95 {total_p95:8.2f} ms   "
+          f"updates over frame budget {dropped}/{len(timings)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--ticks", type=int, default=30)
+    parser.add_argument("--churn", type=float, default=0.03, help="fraction of processes replaced per tick")
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    from XcodeCleaner import ProcessFilterProxy, ProcessTableModel
+
+    snapshots = synthetic_processes(args.rows, args.churn, args.ticks)
+    print(f"{args.rows} rows, {args.ticks} refreshes, {args.churn:.0%} churn")
+
+    table = QTableWidget()
+    table.setColumnCount(5)
+    table.resize(900, 600)
+    table.show()
+    report("legacy", run(app, table, lambda procs: legacy_update(table, procs), snapshots))
+    table.close()
+
+    model = ProcessTableModel()
+    proxy = ProcessFilterProxy()
+    proxy.setSourceModel(model)
+    view = QTableView()
+    view.setModel(proxy)
+    view.setSortingEnabled(True)
+    view.sortByColumn(2, Qt.SortOrder.DescendingOrder)
+    view.resize(900, 600)
+    view.show()
+    model.update_processes(snapshots[0])
+    report("model", run(app, view, model.update_processes, snapshots[1:]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Memory and re-parsing cost: dict rows versus records versus columnar batches.
+
+    python benchmarks/bench_records.py --rows 100000
+
+Parses the same synthetic ``ps aux`` lines three ways: into the dicts of
+strings list_processes used to return, into ProcessRecords, and into a
+RecordBatch. Reports what each result keeps alive per row, measured with
+tracemalloc (field strings, numbers and containers; the lines themselves are
+excluded). It also times what consumers did with the old rows on every
+refresh: sorting by CPU by parsing strings, versus the already parsed floats.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from simcleaner.records import ProcessRecord, RecordBatch
+
+
+def ps_lines(count, seed=1):
+    rng = random.Random(seed)
+    return [f"dev {1000 + i} {rng.random() * 10:.1f} {rng.random():.1f} 4268 1234 ?? S 10:00AM 0:01.00 "
+            f"/Applications/Simulator.app/Contents/MacOS/Simulator -id {i}" for i in range(count)]
+
+
+def as_dicts(lines):
+    rows = []
+    for line in lines:
+        parts = line.split()
+        rows.append({'pid': parts[1], 'start': parts[8], 'cpu': parts[2], 'mem': parts[3],
+                     'name': ' '.join(parts[10:])})
+    return rows
+
+
+def as_records(lines):
+    rows = []
+    for line in lines:
+        parts = line.split()
+        rows.append(ProcessRecord(int(parts[1]), sys.intern(parts[8]), float(parts[2]), float(parts[3]),
+                                  ' '.join(parts[10:])))
+    return rows
+
+
+def measure(build):
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    result = build()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    used = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    return result, used
+
+
+def best_of(repeat, fn):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    lines = ps_lines(args.rows)
+
+    dicts, dict_bytes = measure(lambda: as_dicts(lines))
+    records, record_bytes = measure(lambda: as_records(lines))
+    batch, batch_bytes = measure(lambda: RecordBatch(ProcessRecord, as_records(lines)))
+    assert list(batch) == records
+
+    print(f"{args.rows} process rows")
+    for label, used in (("list of dicts (old)", dict_bytes), ("list of ProcessRecord", record_bytes),
+                        ("RecordBatch", batch_bytes)):
+        ratio = f"  {dict_bytes / used:4.1f}x smaller" if used != dict_bytes else ""
+        print(f"  {label:<24} {used / 2 ** 20:7.1f} MB  {used / args.rows:6.0f} bytes/row{ratio}")
+
+    def sort_dicts():
+        sorted(dicts, key=lambda proc: float(proc['cpu']))
+
+    def sort_records():
+        sorted(records, key=lambda proc: proc.cpu)
+
+    def sort_batch():
+        column = batch.columns[ProcessRecord._fields.index("cpu")]
+        sorted(range(len(column)), key=column.__getitem__)
+
+    print("sort by CPU")
+    baseline = best_of(args.repeat, sort_dicts)
+    print(f"  {'float(proc[cpu]) (old)':<24} {baseline:7.1f} ms")
+    for label, fn in (("proc.cpu", sort_records), ("batch cpu column", sort_batch)):
+        elapsed = best_of(args.repeat, fn)
+        print(f"  {label:<24} {elapsed:7.1f} ms  {baseline / elapsed:4.1f}x")
+
+
+if __name__ == "__main__":
+    main()
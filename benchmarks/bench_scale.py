@@ -0,0 +1,285 @@
+"""Scale scenarios against generated stand-ins for diskutil, hdiutil, ps and xcrun.
+
+    python benchmarks/bench_scale.py                       # all scenarios, compared to the baseline
+    python benchmarks/bench_scale.py --disks 100 --processes 5000 --cache-files 2000000
+    python benchmarks/bench_scale.py -s gui_eject --save-baseline
+
+Each scenario runs in a fresh interpreter with HOME pointed at a temporary
+directory (holding a synthetic ~/Library/Developer tree for the cleanup
+scenarios) and PATH starting with the fake tools from fake_tools.py. GUI
+scenarios open the real window under the Qt offscreen platform. Reported per
+scenario:
+
+* wall: time from starting the operation to its results being applied;
+* calls: how many times an external tool ran;
+* rss: the child's peak resident set size (includes PyQt6 for GUI scenarios);
+* ui blocked: for GUI scenarios, how long the Qt event loop was unable to
+  service a 5 ms heartbeat, summed, and the longest single stall.
+
+Results are compared with benchmarks/baselines/bench_scale.json when it was
+recorded with the same parameters; --check exits 1 on a regression.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, ROOT)
+
+from fake_tools import FakeTools, build_developer_tree
+
+BASELINE = os.path.join(HERE, "baselines", "bench_scale.json")
+SCENARIOS = ("disk_scan", "process_scan", "cleanup", "gui_disk_scan", "gui_process_refresh", "gui_eject",
+             "gui_cleanup")
+PARAMS = ("disks", "processes", "cache_files", "eject_latency", "fail_rate")
+# A scenario regresses when wall or UI-blocked time grows by both of these
+REGRESSION_RATIO = 1.25
+REGRESSION_MS = 20.0
+
+
+# --- child side ---------------------------------------------------------------
+
+def peak_rss_mb():
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / 2 ** 20 if sys.platform == "darwin" else peak / 2 ** 10
+
+
+class Heartbeat:
+    """Measures how long the GUI thread goes without servicing a 5 ms timer."""
+
+    def __init__(self, interval_ms=5):
+        from PyQt6.QtCore import Qt, QTimer
+
+        self.interval = interval_ms / 1000
+        self.blocked = 0.0
+        self.longest = 0.0
+        self.last = None
+        self.timer = QTimer()
+        self.timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.timer.timeout.connect(self.tick)
+        self.timer.start(interval_ms)
+
+    def tick(self):
+        now = time.perf_counter()
+        if self.last is not None:
+            stall = now - self.last - self.interval
+            if stall > 0:
+                self.blocked += stall
+                self.longest = max(self.longest, stall)
+        self.last = now
+
+    def reset(self):
+        self.blocked = self.longest = 0.0
+        self.last = time.perf_counter()
+
+
+def wait_for(predicate, timeout=900):
+    """Run the Qt event loop until ``predicate()`` is true."""
+    from PyQt6.QtCore import QEventLoop, QTimer
+
+    loop = QEventLoop()
+    deadline = time.monotonic() + timeout
+    poll = QTimer()
+    poll.timeout.connect(lambda: (predicate() or time.monotonic() > deadline) and loop.quit())
+    poll.start(2)
+    if not predicate():
+        loop.exec()
+    poll.stop()
+    if not predicate():
+        raise TimeoutError("scenario did not finish")
+
+
+def open_window():
+    from PyQt6.QtWidgets import QApplication
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    import XcodeCleaner
+
+    window = XcodeCleaner.EnhancedSimulatorKiller()
+    # Keep periodic probes out of the measurement
+    window.auto_scan_check.setChecked(False)
+    window.show()
+    wait_for(lambda: "interactive" in window.startup_marks and window.tasks.pending == 0)
+    return app, window
+
+
+def count_files(path):
+    return sum(len(files) for _root, _dirs, files in os.walk(path))
+
+
+def run_scenario(name, tools):
+    from simcleaner import core
+
+    heartbeat = None
+    window = None
+    if name.startswith("gui_"):
+        _app, window = open_window()
+        if name == "gui_eject":
+            window.scan_disks()
+            wait_for(lambda: window.tasks.pending == 0)
+        heartbeat = Heartbeat()
+        wait_for(lambda: heartbeat.last is not None)
+
+    done = []
+    tools.reset_calls()
+    if heartbeat:
+        heartbeat.reset()
+    start = time.perf_counter()
+
+    if name == "disk_scan":
+        result = len(core.scan_disks())
+    elif name == "process_scan":
+        result = len(core.list_processes())
+    elif name == "cleanup":
+        result = sum(entry['removed'] for entry in core.clean_caches()) + len(core.clear_device_caches())
+    elif name == "gui_disk_scan":
+        window.disk_model.update_disks([])
+        window.scan_disks()
+        wait_for(lambda: window.tasks.pending == 0)
+        result = window.disk_model.rowCount()
+    elif name == "gui_process_refresh":
+        for _ in range(5):
+            window.refresh_processes()
+            wait_for(lambda: window.tasks.pending == 0)
+        result = window.process_model.rowCount()
+    elif name == "gui_eject":
+        devices = [disk.device for disk in window.disk_model.disks()]
+        window.eject_devices(devices, lambda: done.append(True))
+        wait_for(lambda: done)
+        result = len(devices)
+    elif name == "gui_cleanup":
+        window.clear_all_simulator_caches(lambda: done.append(True))
+        wait_for(lambda: done and window.tasks.pending == 0)
+        # Per-device caches are left for the nuclear option
+        result = count_files(os.path.expanduser("~/Library"))
+    else:
+        raise SystemExit(f"unknown scenario {name}")
+
+    wall = time.perf_counter() - start
+    report = {'wall_ms': wall * 1000, 'calls': tools.calls(), 'rss_mb': peak_rss_mb(), 'result': result}
+    if heartbeat:
+        report['ui_blocked_ms'] = heartbeat.blocked * 1000
+        report['ui_longest_ms'] = heartbeat.longest * 1000
+    if window:
+        window.close()
+    return report
+
+
+def child_main(name, workdir):
+    # Only for the call log; the tools themselves were installed by the parent
+    tools = FakeTools(os.path.join(workdir, "tools"))
+    print(json.dumps(run_scenario(name, tools)))
+
+
+# --- parent side --------------------------------------------------------------
+
+def prepare(name, args, workdir):
+    home = os.path.join(workdir, "home")
+    os.makedirs(home)
+    tools = FakeTools(os.path.join(workdir, "tools"), disks=args.disks, processes=args.processes,
+                      latency={"hdiutil": args.eject_latency}, fail_rate=args.fail_rate)
+    env = dict(os.environ, **tools.install(), HOME=home, QT_QPA_PLATFORM="offscreen")
+    if name in ("cleanup", "gui_cleanup"):
+        build_developer_tree(home, args.cache_files)
+    return env
+
+
+def run_child(name, args):
+    workdir = tempfile.mkdtemp(prefix=f"bench-scale-{name}-")
+    try:
+        env = prepare(name, args, workdir)
+        output = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", name, workdir],
+                                cwd=ROOT, env=env, capture_output=True, text=True)
+        if output.returncode != 0:
+            raise SystemExit(f"{name} failed:\n{output.stderr}")
+        return json.loads(output.stdout.strip().splitlines()[-1])
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def load_baseline():
+    try:
+        with open(BASELINE) as handle:
+            return json.load(handle)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_baseline(params, results):
+    saved = load_baseline()
+    if saved.get("params") != params:
+        saved = {"scenarios": {}}
+    saved["params"] = params
+    saved["machine"] = f"{platform.system()} {platform.machine()}, Python {platform.python_version()}"
+    saved["scenarios"].update(results)
+    os.makedirs(os.path.dirname(BASELINE), exist_ok=True)
+    with open(BASELINE, "w") as handle:
+        json.dump(saved, handle, indent=2, sort_keys=True)
+        handle.write("\n")
+
+
+def compare(report, base):
+    notes = []
+    regressed = False
+    for key in ("wall_ms", "ui_blocked_ms"):
+        if key in report and key in base:
+            now, then = report[key], base[key]
+            notes.append(f"{key.split('_')[0]} {(now - then) / max(then, 1e-9):+.0%}")
+            if now > then * REGRESSION_RATIO and now - then > REGRESSION_MS:
+                regressed = True
+    if 'calls' in base and report['calls'] != base['calls']:
+        notes.append(f"calls {base['calls']} -> {report['calls']}")
+        regressed = regressed or report['calls'] > base['calls']
+    return ("REGRESSED  " if regressed else "") + ", ".join(notes), regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-s", "--scenario", action="append", choices=SCENARIOS, help="run only these (repeatable)")
+    parser.add_argument("--disks", type=int, default=100)
+    parser.add_argument("--processes", type=int, default=5000)
+    parser.add_argument("--cache-files", type=int, default=100_000)
+    parser.add_argument("--eject-latency", type=float, default=0.05, help="seconds per hdiutil call")
+    parser.add_argument("--fail-rate", type=float, default=0.05, help="fraction of disks that stay busy")
+    parser.add_argument("--save-baseline", action="store_true", help="record these results as the baseline")
+    parser.add_argument("--check", action="store_true", help="exit 1 if any scenario regressed")
+    args = parser.parse_args()
+
+    params = {param: getattr(args, param) for param in PARAMS}
+    baseline = load_baseline()
+    if baseline and baseline.get("params") != params:
+        print("baseline was recorded with different parameters; not comparing")
+        baseline = {}
+    baseline = baseline.get("scenarios", {})
+    results = {}
+    any_regressed = False
+    print(f"{'scenario':<20} {'wall ms':>9} {'calls':>6} {'rss MB':>7} {'ui blocked':>11} {'longest':>8}  vs baseline")
+    for name in args.scenario or SCENARIOS:
+        report = results[name] = run_child(name, args)
+        note, regressed = compare(report, baseline[name]) if name in baseline else ("", False)
+        any_regressed |= regressed
+        blocked = f"{report['ui_blocked_ms']:9.1f}ms" if 'ui_blocked_ms' in report else f"{'-':>11}"
+        longest = f"{report['ui_longest_ms']:6.1f}ms" if 'ui_longest_ms' in report else f"{'-':>8}"
+        print(f"{name:<20} {report['wall_ms']:9.1f} {report['calls']:6d} {report['rss_mb']:7.1f} {blocked} "
+              f"{longest}  {note}")
+
+    if args.save_baseline:
+        save_baseline(params, results)
+        print(f"baseline saved to {os.path.relpath(BASELINE, ROOT)}")
+    return 1 if args.check and any_regressed else 0
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        child_main(sys.argv[2], sys.argv[3])
+    else:
+        sys.exit(main())
@@ -0,0 +1,63 @@
+"""Headless benchmark: GUI cold start, as reported by the window's own startup marks.
+
+    python benchmarks/bench_startup.py --runs 10
+
+Each run starts a fresh interpreter, opens the main window under the Qt
+offscreen platform and waits for the "interactive" mark. Times are measured
+from the start of XcodeCleaner's imports, so they include loading PyQt6.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MARKS = ("constructed", "first_paint", "interactive")
+
+CHILD = """
+import json, os, sys
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.getcwd())
+import XcodeCleaner as app_module
+from PyQt6.QtCore import QTimer
+from PyQt6.QtWidgets import QApplication
+
+app = QApplication(sys.argv)
+window = app_module.EnhancedSimulatorKiller()
+window.show()
+
+def poll():
+    if "interactive" in window.startup_marks:
+        print(json.dumps(window.startup_marks))
+        app.quit()
+    else:
+        QTimer.singleShot(1, poll)
+
+QTimer.singleShot(0, poll)
+app.exec()
+window.log_sink.close()
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    samples = {mark: [] for mark in MARKS}
+    for _ in range(args.runs):
+        output = subprocess.run([sys.executable, "-c", CHILD], cwd=ROOT, capture_output=True,
+                                text=True, check=True).stdout
+        marks = json.loads(output.strip().splitlines()[-1])
+        for mark in MARKS:
+            samples[mark].append(marks[mark])
+
+    for mark in MARKS:
+        values = samples[mark]
+        print(f"{mark:<12} median {statistics.median(values):7.1f} ms   max {max(values):7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Cost of the tracing spans, switched off and on, and of reading them back.
+
+    python benchmarks/bench_trace.py --calls 200000
+
+Times a trivial function called plainly, through @traced and inside
+``tracer.span()``, first with tracing off and then on, and reports the added
+cost per call. Then fills the ring buffer and times stats() (what the
+Diagnostics tab runs each second) and the Chrome trace export.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from simcleaner.trace import Tracer, traced, tracer
+
+
+def step(value):
+    return value + 1
+
+
+traced_step = traced("step", "bench")(step)
+
+
+def spanned_step(value):
+    with tracer.span("step", "bench"):
+        return value + 1
+
+
+def per_call_ns(fn, calls):
+    start = time.perf_counter_ns()
+    for i in range(calls):
+        fn(i)
+    return (time.perf_counter_ns() - start) / calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=200_000)
+    parser.add_argument("--spans", type=int, default=20_000, help="ring buffer size for the read-back timings")
+    args = parser.parse_args()
+
+    baseline = min(per_call_ns(step, args.calls) for _ in range(3))
+    print(f"{'plain call':<28} {baseline:8.0f} ns")
+    for enabled in (False, True):
+        tracer.enabled = enabled
+        for label, fn in (("@traced", traced_step), ("with tracer.span()", spanned_step)):
+            tracer.clear()
+            cost = min(per_call_ns(fn, args.calls) for _ in range(3))
+            print(f"{label + (' (on)' if enabled else ' (off)'):<28} {cost:8.0f} ns  (+{cost - baseline:.0f} ns)")
+    tracer.enabled = False
+
+    full = Tracer(capacity=args.spans, enabled=True)
+    names = [("scan_disks", "job"), ("diskutil", "subprocess"), ("parse_disk_info", "parse"), ("scan_disks", "ui")]
+    for i in range(args.spans):
+        name, category = names[i % len(names)]
+        with full.span(name, category):
+            pass
+
+    start = time.perf_counter()
+    stats = full.stats()
+    print(f"\nstats() over {len(full.spans)} spans ({len(stats)} operations): "
+          f"{(time.perf_counter() - start) * 1000:.1f} ms")
+
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "trace.json")
+        start = time.perf_counter()
+        count = full.export_chrome(filename)
+        print(f"Chrome trace export of {count} spans: {(time.perf_counter() - start) * 1000:.1f} ms, "
+              f"{os.path.getsize(filename) / 1024:.0f} KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""Idle cost of the app in the background: hidden window versus tray-only mode.
+
+    python benchmarks/bench_tray.py --seconds 60 --disks 50 --processes 200
+
+Each state runs in a fresh interpreter against the fake tools from
+fake_tools.py (offscreen platform, temporary home). The window is opened,
+every tab is built and the first scans finish; then it is left on screen,
+hidden with its widgets alive, or closed to the tray with tray-only mode,
+which drops the widget tree. Over the next ``--seconds`` the child counts
+Qt timer events delivered on the UI thread and the process's context
+switches (every thread waking up), and reports its resident memory. The
+tray-only run then shows the window again and times the rebuild.
+"""
+import argparse
+import gc
+import json
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+STATES = ("shown", "hidden", "tray-only")
+
+
+def rss_mb():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except OSError:
+        output = subprocess.run(["ps", "-o", "rss=", "-p", str(os.getpid())], capture_output=True, text=True).stdout
+        return int(output) / 1024
+
+
+def context_switches():
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_nvcsw + usage.ru_nivcsw
+
+
+def child(state, seconds):
+    from PyQt6.QtCore import QEvent, QEventLoop, QObject, QTimer
+    from PyQt6.QtWidgets import QApplication
+
+    class TimerCounter(QObject):
+        count = 0
+
+        def eventFilter(self, obj, event):
+            if event.type() == QEvent.Type.Timer:
+                self.count += 1
+            return False
+
+    def run_loop(secs):
+        loop = QEventLoop()
+        QTimer.singleShot(int(secs * 1000), loop.quit)
+        loop.exec()
+
+    app = QApplication(sys.argv)
+    import XcodeCleaner as app_module
+
+    window = app_module.EnhancedSimulatorKiller()
+    window.show()
+    while "interactive" not in window.startup_marks or window.pending_tabs or window.tasks.pending:
+        run_loop(0.1)
+    run_loop(1.0)
+
+    if state == "hidden":
+        window.hide()
+    elif state == "tray-only":
+        window.hide_to_tray()
+    # Let deleteLater and the last repaints go through before measuring
+    run_loop(1.0)
+    gc.collect()
+
+    counter = TimerCounter()
+    app.installEventFilter(counter)
+    switches = context_switches()
+    start = time.perf_counter()
+    run_loop(seconds)
+    elapsed = time.perf_counter() - start
+    result = {
+        'rss': rss_mb(),
+        'widgets': len(app.allWidgets()),
+        'timers': counter.count * 60 / elapsed,
+        'switches': (context_switches() - switches) * 60 / elapsed,
+    }
+    app.removeEventFilter(counter)
+
+    if state == "tray-only":
+        start = time.perf_counter()
+        window.show_from_tray()
+        window.repaint()
+        result['rebuild'] = (time.perf_counter() - start) * 1000
+        run_loop(0.5)
+        result['rows'] = window.disk_list.model().rowCount()
+
+    print(json.dumps(result))
+    window.quit_app()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=60, help="idle time measured per state")
+    parser.add_argument("--disks", type=int, default=50)
+    parser.add_argument("--processes", type=int, default=200)
+    parser.add_argument("--child", choices=STATES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, args.seconds)
+        return
+
+    from fake_tools import FakeTools
+
+    workdir = tempfile.mkdtemp(prefix="bench-tray-")
+    try:
+        tools = FakeTools(workdir, disks=args.disks, processes=args.processes)
+        env = dict(os.environ, **tools.install(), HOME=workdir)
+        print(f"{args.disks} disks, {args.processes} simulator processes, {args.seconds:.0f} s idle per state\n")
+        print(f"{'state':<10} {'RSS MB':>7} {'widgets':>8} {'Qt timers/min':>14} {'ctx switches/min':>17}")
+        for state in STATES:
+            output = subprocess.run([sys.executable, __file__, "--child", state, "--seconds", str(args.seconds)],
+                                    env=env, capture_output=True, text=True, check=True).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            print(f"{state:<10} {result['rss']:7.1f} {result['widgets']:8d} {result['timers']:14.0f} "
+                  f"{result['switches']:17.0f}")
+        print(f"\nrebuild on Show: {result['rebuild']:.0f} ms ({result['rows']} disks listed from the retained model)")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
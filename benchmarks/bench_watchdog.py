@@ -0,0 +1,86 @@
+"""Stall watchdog: detection accuracy and what it costs while nothing stalls.
+
+    python benchmarks/bench_watchdog.py --threshold 100 --idle 5
+
+Runs a Qt event loop (offscreen) with the heartbeat timer and StallWatchdog
+the GUI uses, then fires handlers that block for known times, half of them
+in time.sleep (GIL released, like a subprocess wait) and half spinning in
+Python. Reports which stalls were caught, the measured versus actual length
+and whether the culprit handler was named. Finally compares process CPU time
+over an idle stretch with and without the watchdog.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtCore import QEventLoop, QTimer
+from PyQt6.QtWidgets import QApplication
+
+from simcleaner.watchdog import StallWatchdog
+
+
+def sleeping_handler(seconds):
+    time.sleep(seconds)
+
+
+def spinning_handler(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+def run_loop(seconds):
+    loop = QEventLoop()
+    QTimer.singleShot(int(seconds * 1000), loop.quit)
+    loop.exec()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threshold", type=int, default=100, help="stall threshold in ms")
+    parser.add_argument("--idle", type=float, default=5.0, help="seconds of idle loop for the CPU comparison")
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    watchdog = StallWatchdog(threshold=args.threshold / 1000)
+    heartbeat = QTimer()
+    heartbeat.timeout.connect(watchdog.beat)
+    heartbeat.start(int(watchdog.interval * 1000))
+    watchdog.start()
+    run_loop(0.2)
+
+    durations = (0.05, 0.08, 0.15, 0.3, 0.6, 1.2)
+    print(f"threshold {args.threshold} ms, heartbeat every {watchdog.interval * 1000:.0f} ms\n")
+    print(f"{'handler':<18} {'blocked ms':>10} {'caught':>7} {'measured ms':>12} {'named':>6}")
+    for handler in (sleeping_handler, spinning_handler):
+        for seconds in durations:
+            before = len(watchdog.stalls)
+            QTimer.singleShot(0, lambda: handler(seconds))
+            run_loop(seconds + 0.3)
+            stalls = list(watchdog.stalls)[before:]
+            caught = stalls[-1] if stalls else None
+            named = caught is not None and handler.__name__ in caught.handler
+            measured = f"{caught.duration * 1000:.0f}" if caught else "-"
+            print(f"{handler.__name__:<18} {seconds * 1000:10.0f} {'yes' if caught else 'no':>7} {measured:>12} "
+                  f"{'yes' if named else ('-' if not caught else 'no'):>6}")
+
+    watchdog.stop()
+    heartbeat.stop()
+    print()
+    for label, watching in (("idle loop without watchdog", False), ("idle loop with watchdog", True)):
+        if watching:
+            heartbeat.start(int(watchdog.interval * 1000))
+            watchdog.start()
+        start = time.process_time()
+        run_loop(args.idle)
+        print(f"{label:<28} {(time.process_time() - start) * 1000:7.1f} ms CPU over {args.idle:g} s")
+    watchdog.stop()
+    app.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""Generated stand-ins for diskutil, hdiutil, ps, xcrun and friends, for benchmarks.
+
+    tools = FakeTools(workdir, disks=100, processes=5000, latency={"hdiutil": 0.05}, fail_rate=0.05)
+    env = tools.install()          # PATH (and nothing else) to run the app against
+    ...
+    tools.calls()                  # how many times any stand-in ran
+
+Everything a tool prints is generated up front, so a stand-in is a small
+shell script that logs its invocation, sleeps its configured latency and
+cats a file; it costs about what a fork/exec does and the numbers measure
+this app rather than the fakes. Failures are chosen per device from a seeded
+RNG, so two runs with the same settings fail the same ejects.
+
+build_developer_tree fills a fake home directory with the cache, DerivedData
+and per-device folders the cleanup paths delete.
+"""
+import json
+import os
+import random
+import stat
+
+SYSTEM_DISKS = ("Macintosh HD", "Data", "Preboot", "Recovery")
+OTHER_PROCESSES = (
+    "/usr/libexec/trustd --agent",
+    "/System/Applications/Mail.app/Contents/MacOS/Mail",
+    "/usr/sbin/cfprefsd agent",
+    "/System/Library/CoreServices/Finder.app/Contents/MacOS/Finder",
+)
+SIMULATOR_PROCESSES = (
+    "/Applications/Xcode.app/Contents/Developer/Applications/Simulator.app/Contents/MacOS/Simulator",
+    "/Library/Developer/PrivateFrameworks/CoreSimulator.framework/Versions/A/XPCServices/SimulatorTrampoline",
+    "launchd_sim /Users/dev/Library/Developer/CoreSimulator/Devices/{uuid}/data/var/run/launchd_bootstrap.plist",
+)
+# Tools the app may call that only need to succeed quietly, with their output
+QUIET_TOOLS = {
+    "csrutil": "System Integrity Protection status: enabled.\n",
+    "pmset": "Now drawing from 'AC Power'\n",
+    "killall": "",
+    "pkill": "",
+    "osascript": "",
+    "sudo": "",
+    "launchctl": "",
+}
+
+
+class FakeTools:
+    def __init__(self, workdir, disks=10, processes=100, other_processes=1000, latency=None, fail_rate=0.0,
+                 seed=1):
+        self.workdir = os.path.abspath(workdir)
+        self.bin = os.path.join(self.workdir, "bin")
+        self.data = os.path.join(self.workdir, "data")
+        self.log = os.path.join(self.workdir, "calls.log")
+        self.disks = disks
+        self.processes = processes
+        self.other_processes = other_processes
+        self.latency = latency or {}
+        self.fail_rate = fail_rate
+        self.rng = random.Random(seed)
+
+    def install(self):
+        """Write the tools and their canned output; returns env overrides (PATH)."""
+        os.makedirs(self.bin, exist_ok=True)
+        os.makedirs(os.path.join(self.data, "info"), exist_ok=True)
+        self._write_disks()
+        self._write_processes()
+        self._write_simctl()
+
+        self._tool("diskutil", 'case "$1" in\n'
+                               '  list) cat "$DATA/list.txt";;\n'
+                               '  info) cat "$DATA/info/${2##*/}.txt" 2>/dev/null || exit 1;;\n'
+                               'esac')
+        self._tool("hdiutil", 'if grep -qx "$3" "$DATA/fail.txt"; then\n'
+                              '  echo "hdiutil: couldn\'t unmount \\"$3\\" - Resource busy" >&2; exit 16\n'
+                              'fi\n'
+                              'echo "\\"$3\\" ejected."')
+        self._tool("ps", 'cat "$DATA/ps.txt"')
+        self._tool("pgrep", "exit 1")
+        self._tool("security", "exit 44")
+        self._tool("iostat", 'echo "    KB/t xfrs   MB"; echo "   20.00 1000 19.53"')
+        self._tool("xcrun", 'case "$*" in\n'
+                            '  *"list devices"*) cat "$DATA/booted.json";;\n'
+                            '  *"runtime list"*) cat "$DATA/runtimes.json";;\n'
+                            'esac')
+        for name, output in QUIET_TOOLS.items():
+            with open(os.path.join(self.data, f"{name}.txt"), "w") as handle:
+                handle.write(output)
+            self._tool(name, f'cat "$DATA/{name}.txt"')
+
+        self.reset_calls()
+        return {"PATH": self.bin + os.pathsep + os.environ.get("PATH", "")}
+
+    def _tool(self, name, body):
+        path = os.path.join(self.bin, name)
+        delay = self.latency.get(name, self.latency.get("*", 0))
+        with open(path, "w") as handle:
+            handle.write("#!/bin/sh\n"
+                         f'DATA="{self.data}"\n'
+                         f'echo "{name} $*" >> "{self.log}"\n'
+                         + (f"sleep {delay}\n" if delay else "")
+                         + body + "\n")
+        os.chmod(path, os.stat(path).st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+
+    def _write_disks(self):
+        lines = []
+        failing = []
+        number = 4
+        for name in SYSTEM_DISKS:
+            lines += [f"/dev/disk{number} (synthesized):",
+                      "   #:                       TYPE NAME                    SIZE       IDENTIFIER",
+                      f"   1:                APFS Volume {name:<23} 100.0 GB   disk{number}s1", ""]
+            number += 1
+        for i in range(self.disks):
+            device = f"/dev/disk{number}"
+            size = self.rng.randint(2, 20) * 10 ** 9
+            volume = f"iOS {17 + i % 3}.{i % 5} Simulator {i}"
+            mount = f"/Library/Developer/CoreSimulator/Volumes/iOS_{i}" if i % 3 else ""
+            lines += [f"{device} (disk image):",
+                      "   #:                       TYPE NAME                    SIZE       IDENTIFIER",
+                      f"   1:                APFS Volume {volume:<23} {size / 1e9:.1f} GB   disk{number}s1", ""]
+            with open(os.path.join(self.data, "info", f"disk{number}.txt"), "w") as handle:
+                handle.write(f"   Device Identifier:         disk{number}\n"
+                             f"   Volume Name:               {volume}\n"
+                             f"   Mount Point:               {mount}\n"
+                             f"   Disk Size:                 {size / 1e9:.1f} GB ({size} Bytes) "
+                             f"(exactly {size // 512} 512-Byte-Units)\n")
+            if self.rng.random() < self.fail_rate:
+                failing.append(device)
+            number += 1
+        with open(os.path.join(self.data, "list.txt"), "w") as handle:
+            handle.write("\n".join(lines) + "\n")
+        with open(os.path.join(self.data, "fail.txt"), "w") as handle:
+            handle.write("".join(device + "\n" for device in failing))
+        self.failing = failing
+        self.devices = [f"/dev/disk{n}" for n in range(4 + len(SYSTEM_DISKS), number)]
+
+    def _write_processes(self):
+        rows = []
+        pid = 1000
+        commands = [(self.rng.choice(SIMULATOR_PROCESSES), True) for _ in range(self.processes)]
+        commands += [(self.rng.choice(OTHER_PROCESSES), False) for _ in range(self.other_processes)]
+        self.rng.shuffle(commands)
+        for command, _ in commands:
+            command = command.format(uuid=f"{self.rng.getrandbits(128):032X}")
+            rows.append(f"dev {pid:>6} {self.rng.random() * 5:4.1f} {self.rng.random():4.1f} 4268 1234 ?? "
+                        f"S 10:{self.rng.randint(0, 59):02d}AM 0:01.00 {command}")
+            pid += 1
+        with open(os.path.join(self.data, "ps.txt"), "w") as handle:
+            handle.write("USER PID %CPU %MEM VSZ RSS TT STAT STARTED TIME COMMAND\n" + "\n".join(rows) + "\n")
+
+    def _write_simctl(self):
+        with open(os.path.join(self.data, "booted.json"), "w") as handle:
+            json.dump({"devices": {}}, handle)
+        with open(os.path.join(self.data, "runtimes.json"), "w") as handle:
+            json.dump({}, handle)
+
+    def calls(self, tool=None):
+        try:
+            with open(self.log) as handle:
+                return sum(1 for line in handle if tool is None or line.split(" ", 1)[0] == tool)
+        except OSError:
+            return 0
+
+    def reset_calls(self):
+        open(self.log, "w").close()
+
+
+def build_developer_tree(home, files, per_dir=500, devices=20, seed=1):
+    """Create ``files`` empty files under ``home``'s simulator and Xcode caches.
+
+    Spread over the CACHE_PATHS folders, DerivedData projects and
+    ``devices`` per-device Library/Caches folders. Returns the count created.
+    """
+    rng = random.Random(seed)
+    roots = [
+        "Library/Developer/CoreSimulator/Caches",
+        "Library/Developer/CoreSimulator/Temp",
+        "Library/Caches/com.apple.CoreSimulator",
+        "Library/Developer/Xcode/DerivedData",
+    ]
+    roots += [f"Library/Developer/CoreSimulator/Devices/{rng.getrandbits(128):032X}/data/Library/Caches"
+              for _ in range(devices)]
+    flags = os.O_CREAT | os.O_WRONLY
+    created = 0
+    folder = None
+    while created < files:
+        if created % per_dir == 0:
+            folder = os.path.join(home, roots[(created // per_dir) % len(roots)], f"Build{created // per_dir}",
+                                  "Intermediates.noindex")
+            os.makedirs(folder, exist_ok=True)
+        os.close(os.open(os.path.join(folder, f"obj{created}.o"), flags, 0o644))
+        created += 1
+    return created
@@ -0,0 +1,3 @@
+"""Qt-free building blocks shared by the XcodeCleaner GUI and its tooling."""
+
+__version__ = "2.0.0"
@@ -0,0 +1,5 @@
+import sys
+
+from simcleaner.cli import main
+
+sys.exit(main())
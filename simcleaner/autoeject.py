@@ -0,0 +1,229 @@
+"""Decide which freshly scanned disks to detach without asking.
+
+Rules come from the auto-eject rules box in Settings, one per line::
+
+    # comment
+    mount: Not Mounted
+    name: *Simulator*; mount: /Library/Developer/CoreSimulator/Volumes/; min_gb: 1
+    allow: iOS 17.4*
+
+Each rule is a ``;``-separated list of conditions that must all
+hold: ``name`` and ``mount`` take detection patterns (simcleaner.patterns
+syntax, so globs, ``re:`` and ``!`` excludes work), ``min_gb``/``max_gb``
+bound the size and ``min_age`` is how many seconds the disk must have been
+seen before it goes. ``allow`` lines protect matching volume names whatever
+the rules say, and volumes under the mount path of a runtime a booted
+simulator is using (core.runtimes_in_use) are never touched.
+
+AutoEjectEngine keeps the state that makes this safe to run on every scan:
+at most ``max_per_minute`` ejects per minute, and a volume that comes back
+``loop_limit`` times within ``loop_window`` seconds is left alone for the
+rest of the window instead of being fought forever. An eject that never
+reports back (its job was cancelled or failed) is given up after
+``in_flight_timeout`` seconds and counted as failed, so the disk becomes a
+candidate again and its first-seen time is dropped. It also records, per
+event, the seconds from the disk being seen (or the mount being noticed)
+to the eject finishing.
+"""
+import time
+from collections import deque
+
+from simcleaner.patterns import PatternError, compile_patterns
+
+DEFAULT_RULES = """\
+# Disk images attached without a volume
+mount: Not Mounted
+# Runtime volumes Xcode mounts on its own
+mount: /Library/Developer/CoreSimulator/Volumes/
+"""
+
+NUMBER_KEYS = ("min_gb", "max_gb", "min_age")
+
+
+def mount_in_use(mount, in_use_mounts):
+    """True if ``mount`` is, or is under, one of the core.runtimes_in_use mount paths."""
+    return any(mount == path or mount.startswith(path.rstrip("/") + "/") for path in in_use_mounts)
+
+
+class EjectRule:
+    __slots__ = ("text", "name", "mount", "min_gb", "max_gb", "min_age")
+
+    def __init__(self, text, name=None, mount=None, min_gb=None, max_gb=None, min_age=0.0):
+        self.text = text
+        self.name = name
+        self.mount = mount
+        self.min_gb = min_gb
+        self.max_gb = max_gb
+        self.min_age = min_age
+
+    def matches(self, disk, age):
+        if self.name is not None and not self.name(disk.name):
+            return False
+        if self.mount is not None and not self.mount(disk.mount):
+            return False
+        if self.min_gb is not None and disk.size_gb < self.min_gb:
+            return False
+        if self.max_gb is not None and disk.size_gb > self.max_gb:
+            return False
+        return age >= self.min_age
+
+
+def parse_rules(text):
+    """``(rules, allow_matcher)`` from rule text; raises PatternError on a bad line."""
+    rules = []
+    allow = []
+    for number, raw in enumerate(text.splitlines(), 1):
+        line = raw.strip()
+        if not line or line.startswith("#"):
+            continue
+        conditions = {}
+        for part in line.split(";"):
+            key, sep, value = part.partition(":")
+            key, value = key.strip().lower(), value.strip()
+            if not sep or not value:
+                raise PatternError(number, raw, f"expected 'key: value', got {part.strip()!r}")
+            conditions[key] = value
+        if "allow" in conditions:
+            if len(conditions) > 1:
+                raise PatternError(number, raw, "allow lines take a single pattern")
+            allow.append(conditions["allow"])
+            continue
+        options = {}
+        for key, value in conditions.items():
+            if key in ("name", "mount"):
+                try:
+                    options[key] = compile_patterns([value])
+                except PatternError as e:
+                    raise PatternError(number, raw, e.reason) from None
+            elif key in NUMBER_KEYS:
+                try:
+                    options[key] = float(value)
+                except ValueError:
+                    raise PatternError(number, raw, f"{key} must be a number") from None
+            else:
+                raise PatternError(number, raw, f"unknown condition {key!r}")
+        rules.append(EjectRule(line, **options))
+    return rules, compile_patterns(allow) if allow else None
+
+
+class AutoEjectEngine:
+    def __init__(self, rules=(), allow=None, max_per_minute=10, loop_limit=3, loop_window=600.0,
+                 in_flight_timeout=300.0, clock=time.time):
+        self.rules = list(rules)
+        self.allow = allow
+        self.max_per_minute = max_per_minute
+        self.loop_limit = loop_limit
+        self.loop_window = loop_window
+        self.in_flight_timeout = in_flight_timeout
+        self.clock = clock
+        self.first_seen = {}
+        self.in_flight = {}
+        self.recent = deque()
+        self.history = {}
+        self.suppressed = {}
+        self.latencies = deque(maxlen=500)
+        self.stats = {'ejected': 0, 'failed': 0, 'rate_limited': 0, 'loops': 0}
+
+    def set_rules(self, rules, allow=None):
+        self.rules = list(rules)
+        self.allow = allow
+
+    def observe(self, disks, seen_at=None):
+        """Note when each disk was first seen; returns the disks some rule wants gone.
+
+        ``seen_at`` backdates disks new to this scan, e.g. to the moment a
+        mount was noticed, so latencies cover the whole mount-to-eject path.
+        """
+        now = self.clock()
+        for device, started in list(self.in_flight.items()):
+            if now - started > self.in_flight_timeout:
+                self.record_result(device, False)
+        devices = {disk.device for disk in disks}
+        for device in list(self.first_seen):
+            if device not in devices and device not in self.in_flight:
+                del self.first_seen[device]
+        candidates = []
+        for disk in disks:
+            first = self.first_seen.setdefault(disk.device, min(seen_at or now, now))
+            if disk.device in self.in_flight:
+                continue
+            if self.allow is not None and self.allow(disk.name):
+                continue
+            if any(rule.matches(disk, now - first) for rule in self.rules):
+                candidates.append(disk)
+        return candidates
+
+    def next_due(self, disks):
+        """Seconds until a disk currently held back by ``min_age`` qualifies, or None."""
+        now = self.clock()
+        waits = [rule.min_age - (now - self.first_seen.get(disk.device, now))
+                 for disk in disks for rule in self.rules
+                 if rule.min_age and rule.matches(disk, rule.min_age)]
+        waits = [wait for wait in waits if wait > 0]
+        return min(waits) if waits else None
+
+    def select(self, candidates, in_use_mounts=()):
+        """Apply the in-use, loop and rate checks. Returns ``(to_eject, skipped)``.
+
+        ``skipped`` pairs a disk with the reason it was held back, for logging.
+        """
+        now = self.clock()
+        while self.recent and now - self.recent[0] > 60:
+            self.recent.popleft()
+        to_eject, skipped = [], []
+        for disk in candidates:
+            name = disk.name
+            mount = disk.mount
+            if mount_in_use(mount, in_use_mounts):
+                skipped.append((disk, "runtime in use by a booted simulator"))
+                continue
+            if self.suppressed.get(name, 0) > now:
+                continue
+            attempts = self.history.setdefault(name, deque())
+            while attempts and now - attempts[0] > self.loop_window:
+                attempts.popleft()
+            if len(attempts) >= self.loop_limit:
+                self.suppressed[name] = attempts[0] + self.loop_window
+                self.stats['loops'] += 1
+                skipped.append((disk, f"remounted {len(attempts)} times in {self.loop_window / 60:.0f} min; "
+                                      "leaving it alone for now"))
+                continue
+            if len(self.recent) >= self.max_per_minute:
+                self.stats['rate_limited'] += 1
+                skipped.append((disk, f"rate limit of {self.max_per_minute} ejects per minute reached"))
+                continue
+            attempts.append(now)
+            self.recent.append(now)
+            self.in_flight[disk.device] = now
+            to_eject.append(disk)
+        return to_eject, skipped
+
+    def record_result(self, device, ok):
+        """Eject finished; returns seconds since the disk was first seen."""
+        self.in_flight.pop(device, None)
+        first = self.first_seen.pop(device, None)
+        if not ok:
+            self.stats['failed'] += 1
+            return None
+        self.stats['ejected'] += 1
+        if first is None:
+            return None
+        latency = max(self.clock() - first, 0.0)
+        self.latencies.append(latency)
+        return latency
+
+    def abandon(self):
+        """Count every eject still in flight as failed, e.g. after their jobs were cancelled; returns how many."""
+        devices = list(self.in_flight)
+        for device in devices:
+            self.record_result(device, False)
+        return len(devices)
+
+    def report(self):
+        latencies = sorted(self.latencies)
+        report = dict(self.stats)
+        if latencies:
+            report['median'] = latencies[len(latencies) // 2]
+            report['p95'] = latencies[min(int(len(latencies) * 0.95), len(latencies) - 1)]
+            report['max'] = latencies[-1]
+        return report
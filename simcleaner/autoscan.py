@@ -0,0 +1,66 @@
+"""When to run the next background disk scan.
+
+A fixed 30 s poll runs ``diskutil`` around the clock even though simulator
+volumes only change when someone launches Xcode or a simulator. The policy
+here starts at the configured interval, doubles it after every scan that
+finds nothing new (up to ``max_factor`` times the base), and snaps back to
+the base interval as soon as a scan sees a change or a cheap probe notices
+activity. Scans are paused altogether on battery power or when the load
+average per CPU is above ``load_limit``.
+"""
+import time
+
+
+class AdaptiveScanPolicy:
+    def __init__(self, base_interval, max_factor=32, load_limit=1.5, clock=time.monotonic):
+        self.max_factor = max_factor
+        self.load_limit = load_limit
+        self.clock = clock
+        self.started = clock()
+        self.last_scan = None
+        self.quiet_scans = 0
+        self.scans = 0
+        self.set_base_interval(base_interval)
+
+    def set_base_interval(self, seconds):
+        self.base_interval = seconds
+        self.interval = seconds
+        self.quiet_scans = 0
+
+    def due(self):
+        return self.last_scan is None or self.clock() - self.last_scan >= self.interval
+
+    def wake(self, scan_now=False):
+        """Something happened (Xcode launched, a volume appeared): poll fast again."""
+        self.quiet_scans = 0
+        self.interval = self.base_interval
+        if scan_now:
+            self.last_scan = None
+
+    def record_scan(self, changed):
+        self.scans += 1
+        self.last_scan = self.clock()
+        if changed:
+            self.wake()
+        else:
+            self.quiet_scans += 1
+            self.interval = self.base_interval * min(2 ** self.quiet_scans, self.max_factor)
+
+    def pause_reason(self, on_battery, load_per_cpu):
+        if on_battery:
+            return "on battery power"
+        if load_per_cpu > self.load_limit:
+            return f"system load {load_per_cpu:.1f} per CPU"
+        return None
+
+    def report(self):
+        """Scans actually run versus a fixed poll at the base interval, since start."""
+        elapsed = max(self.clock() - self.started, 1e-9)
+        hours = elapsed / 3600
+        fixed = elapsed / self.base_interval
+        return {
+            'hours': hours,
+            'scans': self.scans,
+            'fixed_scans': fixed,
+            'saved_per_hour': (fixed - self.scans) / hours,
+        }
@@ -0,0 +1,380 @@
+"""Command-line front end: ``python -m simcleaner <command>``.
+
+Only argparse is imported up front; each command imports what it needs when
+it runs, so ``--help`` and quick commands start without paying for the rest.
+PyQt6 is never imported.
+"""
+import argparse
+import sys
+
+
+def _print_json(data):
+    import json
+    print(json.dumps(data, indent=2))
+
+
+def _human_size(num_bytes):
+    for unit in ("B", "KB", "MB", "GB"):
+        if num_bytes < 1024 or unit == "GB":
+            return f"{num_bytes:.1f} {unit}" if unit != "B" else f"{num_bytes} B"
+        num_bytes /= 1024
+
+
+def _disk_matcher(args):
+    """The matcher for ``--pattern`` options, or None for the built-in keywords."""
+    if not args.pattern:
+        return None
+    from simcleaner.patterns import PatternError, compile_patterns
+    try:
+        return compile_patterns(args.pattern)
+    except PatternError as e:
+        print(f"Invalid pattern {e}", file=sys.stderr)
+        sys.exit(2)
+
+
+def cmd_scan(args):
+    import subprocess
+    from simcleaner import core
+
+    matcher = _disk_matcher(args)
+    try:
+        result = {'disks': core.scan_disks(matcher=matcher)}
+        if args.processes:
+            result['processes'] = core.list_processes()
+    except (subprocess.TimeoutExpired, OSError) as e:
+        print(f"Scan failed: {e}", file=sys.stderr)
+        return 1
+
+    if args.json:
+        _print_json({section: [record._asdict() for record in records] for section, records in result.items()})
+        return 0
+    for disk in result['disks']:
+        print(f"{disk.device:<14} {disk.size_label:>8}  {disk.name}  ({disk.mount})")
+    print(f"{len(result['disks'])} simulator disk(s)")
+    for proc in result.get('processes', []):
+        print(f"{proc.pid:>7} {proc.cpu:>5.1f}% {proc.mem:>5.1f}%  {proc.name}")
+    if args.processes:
+        print(f"{len(result['processes'])} simulator process(es)")
+    return 0
+
+
+def cmd_eject(args):
+    import subprocess
+    from simcleaner import core
+
+    devices = list(args.devices)
+    if args.all:
+        matcher = _disk_matcher(args)
+        try:
+            disks = core.scan_disks(matcher=matcher)
+        except (subprocess.TimeoutExpired, OSError) as e:
+            print(f"Scan failed: {e}", file=sys.stderr)
+            return 1
+        devices += [disk.device for disk in disks if disk.device not in devices]
+    if not devices:
+        print("Nothing to eject: pass device identifiers or --all", file=sys.stderr)
+        return 2
+
+    if args.quit_simulators:
+        core.quit_simulators()
+    failures = 0
+    for device in devices:
+        ok, message = core.eject_disk(device, timeout=args.timeout)
+        failures += not ok
+        print(("ok    " if ok else "FAIL  ") + message)
+    return 1 if failures else 0
+
+
+def cmd_clean(args):
+    from simcleaner import core
+
+    if args.all_users or args.user:
+        return _clean_all_users(args)
+    if args.when_idle:
+        from simcleaner import idle
+        print("Waiting for the system to go idle...", file=sys.stderr)
+        report, stats = idle.run_when_idle(core.clean_caches, categories=args.category or None,
+                                           dry_run=args.dry_run)
+        print(f"waited {stats['waited']:.0f} s, ran {stats['ran']:.0f} s, "
+              f"paused {stats['pauses']} time(s) for {stats['paused']:.0f} s", file=sys.stderr)
+    else:
+        report = core.clean_caches(categories=args.category or None, dry_run=args.dry_run)
+    if args.json:
+        _print_json(report)
+    else:
+        verb = "would free" if args.dry_run else "freed"
+        for entry in report:
+            status = f"ERROR {entry['error']}" if entry['error'] else _human_size(entry['bytes'])
+            print(f"{entry['category']:<28} {status:>12}  {entry['path']}")
+        total = sum(entry['bytes'] for entry in report if entry['removed'] or args.dry_run)
+        print(f"Total {verb}: {_human_size(total)}")
+    return 1 if any(entry['error'] for entry in report) else 0
+
+
+def _clean_all_users(args):
+    from simcleaner import homes
+
+    found = homes.discover_homes(args.users_root, args.user)
+    for user in sorted(set(args.user or ()) - {home.user for home in found}):
+        print(f"No home for {user} under {args.users_root}", file=sys.stderr)
+    if not found:
+        print(f"No user homes under {args.users_root}", file=sys.stderr)
+        return 2
+
+    options = dict(categories=args.category or None, dry_run=args.dry_run, max_users=args.max_users,
+                   per_user=args.workers_per_user)
+    if args.when_idle:
+        from simcleaner import idle
+        print("Waiting for the system to go idle...", file=sys.stderr)
+        results, stats = idle.run_when_idle(homes.sweep, found, **options)
+        print(f"waited {stats['waited']:.0f} s, ran {stats['ran']:.0f} s, "
+              f"paused {stats['pauses']} time(s) for {stats['paused']:.0f} s", file=sys.stderr)
+    else:
+        results = homes.sweep(found, **options)
+
+    if args.json:
+        _print_json([result._asdict() for result in results])
+    else:
+        verb = "would free" if args.dry_run else "freed"
+        for result in results:
+            for entry in result.caches:
+                status = f"ERROR {entry['error']}" if entry['error'] else _human_size(entry['bytes'])
+                print(f"{result.user:<20} {entry['category']:<28} {status:>12}")
+        for result in results:
+            errors = f", {result.errors} error(s)" if result.errors else ""
+            print(f"{result.user:<20} {verb} {_human_size(result.bytes):>10}  in {result.seconds:.2f} s{errors}")
+        print(f"Total {verb} for {len(results)} user(s): {_human_size(sum(result.bytes for result in results))}")
+    return 1 if any(result.errors for result in results) else 0
+
+
+def cmd_watch(args):
+    import subprocess
+    import time
+
+    def report(event, disk, **extra):
+        stamp = time.strftime("%H:%M:%S")
+        if args.json:
+            _print_json({'event': event, 'time': stamp, **disk._asdict(), **extra})
+        else:
+            sign = "+" if event == "added" else "-"
+            note = f" -> {extra['message']}" if 'message' in extra else ""
+            print(f"[{stamp}] {sign} {disk.device} {disk.name}{note}")
+        sys.stdout.flush()
+
+    matcher = _disk_matcher(args)
+    if args.metrics_port:
+        from simcleaner import metrics
+        try:
+            metrics.serve(args.metrics_port)
+        except OSError as e:
+            print(f"Cannot serve metrics on port {args.metrics_port}: {e}", file=sys.stderr)
+            return 2
+    known = {}
+    try:
+        while True:
+            try:
+                known = _watch_pass(args, matcher, known, report)
+            except (subprocess.TimeoutExpired, OSError) as e:
+                # A slow or missing tool skips this pass; the daemon keeps watching
+                print(f"[{time.strftime('%H:%M:%S')}] scan failed: {e}", file=sys.stderr)
+                sys.stderr.flush()
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        return 0
+
+
+def _watch_pass(args, matcher, known, report):
+    """One watch scan: report disks added and removed since ``known``; returns the new ``known``."""
+    from simcleaner import core
+    from simcleaner.autoeject import mount_in_use
+
+    if args.metrics_port:
+        # Keeps the process gauge and the CoreSimulatorService respawn count current
+        core.list_processes()
+    disks = {disk.device: disk for disk in core.scan_disks(matcher=matcher)}
+    added = [disk for device, disk in disks.items() if device not in known]
+    # As with auto-eject and fleet cleans: leave runtimes a booted simulator is
+    # using alone, and eject nothing when simctl can't say which those are
+    in_use = core.runtimes_in_use() if args.eject and added else None
+    for disk in added:
+        extra = {}
+        if args.eject:
+            if in_use is None:
+                result = False, "not ejected: simctl could not say which runtimes are in use"
+            elif mount_in_use(disk.mount, in_use):
+                result = False, "not ejected: runtime in use by a booted simulator"
+            else:
+                result = core.eject_disk(disk.device, timeout=args.timeout)
+            extra['ejected'], extra['message'] = result
+        report("added", disk, **extra)
+    for device, disk in known.items():
+        if device not in disks:
+            report("removed", disk)
+    return disks
+
+
+def cmd_agent(args):
+    import time
+    from simcleaner import fleet
+
+    try:
+        token = fleet.load_token(args.token_file)
+        server = fleet.serve_agent(token, args.host, args.port, args.name)
+    except (fleet.FleetError, OSError) as e:
+        print(f"Cannot start agent: {e}", file=sys.stderr)
+        return 2
+    host, port = server.server_address[:2]
+    print(f"Agent listening on http://{host}:{port}", file=sys.stderr)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+        return 0
+
+
+def cmd_fleet(args):
+    from simcleaner import fleet
+
+    lines = list(args.agent or [])
+    try:
+        if args.agents_file:
+            with open(args.agents_file) as handle:
+                lines += handle.read().splitlines()
+        token = fleet.load_token(args.token_file)
+    except (fleet.FleetError, OSError) as e:
+        print(e, file=sys.stderr)
+        return 2
+    agents = fleet.parse_agents(lines)
+    if not agents:
+        print("No agents: pass --agent URL or --agents-file", file=sys.stderr)
+        return 2
+
+    client = fleet.FleetClient(agents, token, timeout=args.timeout, clean_timeout=args.clean_timeout)
+    try:
+        if args.fleet_command == "scan":
+            results = client.scan()
+        elif args.fleet_command == "inventory":
+            results = client.inventory()
+        else:
+            results = client.clean(args.category, args.dry_run, args.eject, max_parallel=args.max_parallel)
+    finally:
+        client.close()
+
+    if args.json:
+        _print_json([result._asdict() for result in results])
+    elif args.fleet_command == "scan":
+        for host, device, name, mount, size in fleet.merge_disks(results):
+            print(f"{host:<20} {device:<14} {_human_size(size):>9}  {name}  ({mount})")
+    else:
+        verb = "would free" if args.fleet_command == "inventory" or args.dry_run else "freed"
+        for host, category, size, removed, error in fleet.merge_caches(results):
+            status = f"ERROR {error}" if error else _human_size(size)
+            print(f"{host:<20} {category:<28} {status:>12}")
+        total = sum(row[2] for row in fleet.merge_caches(results) if not row[4])
+        print(f"Total {verb}: {_human_size(total)}")
+    if not args.json:
+        for result in results:
+            state = "ok" if result.ok else f"FAILED: {result.error}"
+            print(f"  {result.agent:<20} {result.seconds:6.2f} s  {state}", file=sys.stderr)
+    return 1 if any(not result.ok for result in results) else 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m simcleaner",
+                                     description="Find, eject and clean up Xcode simulator disks without the GUI.")
+    parser.add_argument("--trace", metavar="FILE",
+                        help="write a Chrome trace-event file of the commands and steps the run made")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    scan = sub.add_parser("scan", help="list simulator disks (and optionally processes)")
+    scan.add_argument("--json", action="store_true", help="machine-readable output")
+    scan.add_argument("--processes", action="store_true", help="also list simulator processes")
+    scan.add_argument("--pattern", metavar="PATTERN", action="append",
+                      help="disk detection pattern, repeatable; replaces the built-in keywords")
+    scan.set_defaults(func=cmd_scan)
+
+    eject = sub.add_parser("eject", help="force-detach simulator disks")
+    eject.add_argument("devices", nargs="*", help="device identifiers such as /dev/disk5")
+    eject.add_argument("--all", action="store_true", help="eject every detected simulator disk")
+    eject.add_argument("--quit-simulators", action="store_true", help="killall Simulator helpers first")
+    eject.add_argument("--timeout", type=float, help="seconds per detach attempt (default 15)")
+    eject.add_argument("--pattern", metavar="PATTERN", action="append",
+                       help="disk detection pattern, repeatable; replaces the built-in keywords")
+    eject.set_defaults(func=cmd_eject)
+
+    clean = sub.add_parser("clean", help="delete simulator and Xcode caches")
+    clean.add_argument("--dry-run", action="store_true", help="only report what would be freed")
+    clean.add_argument("--category", action="append", help="limit to a category (repeatable)")
+    clean.add_argument("--json", action="store_true", help="machine-readable output")
+    clean.add_argument("--all-users", action="store_true",
+                       help="clean every user's caches under --users-root (other users' homes need root)")
+    clean.add_argument("--user", action="append", help="clean this user's caches (repeatable; implies --all-users)")
+    clean.add_argument("--users-root", default="/Users", metavar="DIR", help="where user homes live (default /Users)")
+    clean.add_argument("--max-users", type=int, default=4, metavar="N",
+                       help="with --all-users, how many users are cleaned at once")
+    clean.add_argument("--workers-per-user", type=int, default=2, metavar="N",
+                       help="with --all-users, threads sizing and deleting each user's caches")
+    clean.add_argument("--when-idle", action="store_true",
+                       help="wait until no build runs and load and disk I/O are low; pause if a build starts")
+    clean.set_defaults(func=cmd_clean)
+
+    watch = sub.add_parser("watch", help="rescan periodically and report disks as they come and go")
+    watch.add_argument("--interval", type=float, default=30, help="seconds between scans")
+    watch.add_argument("--eject", action="store_true",
+                       help="eject new disks as soon as they appear, except runtimes a booted simulator is using")
+    watch.add_argument("--timeout", type=float, help="seconds per detach attempt (default 15)")
+    watch.add_argument("--json", action="store_true", help="one JSON object per event")
+    watch.add_argument("--metrics-port", type=int, metavar="PORT",
+                       help="serve Prometheus metrics on localhost:PORT/metrics while watching")
+    watch.add_argument("--pattern", metavar="PATTERN", action="append",
+                       help="disk detection pattern, repeatable; replaces the built-in keywords")
+    watch.set_defaults(func=cmd_watch)
+
+    agent = sub.add_parser("agent", help="serve scan, inventory and cleanup to a fleet controller over HTTP")
+    agent.add_argument("--host", default="127.0.0.1", help="address to bind (default 127.0.0.1)")
+    agent.add_argument("--port", type=int, default=8765)
+    agent.add_argument("--name", help="host name reported to the controller (default: this machine's)")
+    agent.add_argument("--token-file", help="file holding the shared token (default: $SIMCLEANER_AGENT_TOKEN)")
+    agent.set_defaults(func=cmd_agent)
+
+    fleet = sub.add_parser("fleet", help="scan or clean many agents at once")
+    fleet.add_argument("fleet_command", choices=("scan", "inventory", "clean"))
+    fleet.add_argument("--agent", action="append", metavar="URL", help="agent URL or host[:port], repeatable")
+    fleet.add_argument("--agents-file", help="file with one 'URL' or 'name URL' per line")
+    fleet.add_argument("--token-file", help="file holding the shared token (default: $SIMCLEANER_AGENT_TOKEN)")
+    fleet.add_argument("--timeout", type=float, default=30, help="per-host timeout in seconds")
+    fleet.add_argument("--clean-timeout", type=float, default=1800,
+                       help="clean: seconds to wait for a host to finish cleaning")
+    fleet.add_argument("--max-parallel", type=int, default=4, help="clean: how many hosts clean at once")
+    fleet.add_argument("--category", action="append", help="clean: limit to a category (repeatable)")
+    fleet.add_argument("--dry-run", action="store_true", help="clean: only report what would be freed")
+    fleet.add_argument("--eject", action="store_true", help="clean: also quit simulators and eject their disks")
+    fleet.add_argument("--json", action="store_true", help="machine-readable output, one entry per host")
+    fleet.set_defaults(func=cmd_fleet)
+
+    # Parsed by logtool itself; see main()
+    sub.add_parser("log", help="read the activity log (same options as python -m simcleaner.logtool)")
+    return parser
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if argv and argv[0] == "log":
+        from simcleaner import logtool
+        return logtool.main(argv[1:])
+
+    args = build_parser().parse_args(argv)
+    if args.trace:
+        from simcleaner.trace import tracer
+        tracer.enabled = True
+    try:
+        return args.func(args)
+    except BrokenPipeError:
+        # Output piped into head and friends; stop quietly
+        sys.stderr.close()
+        return 0
+    finally:
+        if args.trace:
+            count = tracer.export_chrome(args.trace)
+            print(f"Wrote {count} spans to {args.trace}", file=sys.stderr)
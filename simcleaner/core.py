@@ -0,0 +1,475 @@
+"""Scan, eject, kill and clean operations with no Qt dependency.
+
+Both the GUI and ``python -m simcleaner`` call into this module. Functions
+return plain data (records from simcleaner.records, ``(ok, message)`` tuples,
+report dicts) and never touch widgets, so they can run from worker threads,
+cron jobs or CI hooks. Every external command goes through the shared
+``runner`` (see simcleaner.runner), which owns timeouts, per-tool
+concurrency and cancellation. Scans, parsing, commands, ejects and
+deletes are timed as simcleaner.trace spans, and their results feed the
+simcleaner.metrics aggregates.
+"""
+import glob
+import os
+import shutil
+import subprocess
+import sys
+import time
+
+from simcleaner import metrics
+from simcleaner.patterns import compile_patterns
+from simcleaner.records import DiskRecord, ProcessRecord
+from simcleaner.runner import CommandCancelled, CommandRunner
+from simcleaner.trace import traced, tracer
+
+# Default detection patterns (see simcleaner.patterns for the syntax)
+DISK_KEYWORDS = ("Simulator", "Xcode", "iOS", "watchOS", "tvOS")
+PROCESS_KEYWORDS = ("Simulator", "CoreSimulator", "SimulatorTrampoline", "launchd_sim")
+
+# Reclaimable cache locations, keyed by the category name shown to users
+CACHE_PATHS = {
+    "CoreSimulator Caches": "~/Library/Developer/CoreSimulator/Caches",
+    "CoreSimulator Temp": "~/Library/Developer/CoreSimulator/Temp",
+    "CoreSimulator User Caches": "~/Library/Caches/com.apple.CoreSimulator",
+    "DerivedData": "~/Library/Developer/Xcode/DerivedData",
+}
+DEVICE_CACHE_GLOB = "~/Library/Developer/CoreSimulator/Devices/*/data/Library/Caches"
+DEVICE_DATA_PATHS = (
+    "~/Library/Developer/CoreSimulator/Devices",
+    "~/Library/Developer/CoreSimulator/Profiles",
+)
+VOLUME_DIRS = ("/Volumes", "/Library/Developer/CoreSimulator/Volumes")
+KILL_ALL_COMMANDS = (
+    "pkill -9 -f Simulator",
+    "pkill -9 -f CoreSimulator",
+    "pkill -9 -f SimulatorTrampoline",
+    "killall -9 com.apple.CoreSimulator.CoreSimulatorService",
+)
+KEYCHAIN_SERVICE = "SimulatorEjector"
+
+runner = CommandRunner()
+
+
+def _run(args, timeout=None, **kwargs):
+    # Only the subcommand goes into the span: later arguments can hold a password
+    with tracer.span(os.path.basename(args[0]), "subprocess", args[1] if len(args) > 1 else None):
+        return runner.run(args, timeout=timeout, **kwargs)
+
+
+def _busy(result):
+    # hdiutil/diskutil exit 16 (EBUSY) while a volume is still being released
+    return result.returncode == 16 or "busy" in result.stderr.lower()
+
+
+def _admin_shell(command, password):
+    script = f'do shell script "{command}" with administrator privileges password "{password}"'
+    return _run(["osascript", "-e", script])
+
+
+def sip_enabled():
+    try:
+        return "enabled" in _run(["csrutil", "status"]).stdout.lower()
+    except Exception:
+        return False
+
+
+SIZE_UNITS = {"B": 1, "KB": 10 ** 3, "MB": 10 ** 6, "GB": 10 ** 9, "TB": 10 ** 12}
+
+
+def parse_disk_size(text):
+    """Bytes from a diskutil size such as ``5.5 GB (5500000000 Bytes) (exactly ...)``; 0 if unknown."""
+    if "(" in text and "Bytes)" in text:
+        try:
+            return int(text.split("(", 1)[1].split()[0])
+        except (IndexError, ValueError):
+            pass
+    parts = text.split()
+    try:
+        return int(float(parts[0]) * SIZE_UNITS.get(parts[1] if len(parts) > 1 else "GB", 10 ** 9))
+    except (IndexError, ValueError):
+        return 0
+
+
+@traced("parse_disk_info", "parse")
+def parse_disk_info(output):
+    volume_name = ""
+    mount_point = ""
+    size = 0
+    for info_line in output.split('\n'):
+        if 'Volume Name:' in info_line:
+            volume_name = info_line.split('Volume Name:')[1].strip()
+        elif 'Mount Point:' in info_line:
+            mount_point = info_line.split('Mount Point:')[1].strip()
+        elif 'Disk Size:' in info_line:
+            size = parse_disk_size(info_line.split('Disk Size:')[1].strip())
+    return volume_name, mount_point, size
+
+
+@traced("scan_disks", "scan")
+def scan_disks(progress=None, matcher=None):
+    """Simulator-related disks from ``diskutil list``, one DiskRecord per device.
+
+    ``progress`` is called with 0-100 while ``diskutil list`` output is parsed.
+    ``matcher`` decides which lines are simulator volumes; it defaults to
+    DISK_KEYWORDS compiled with simcleaner.patterns.compile_patterns.
+    """
+    if matcher is None:
+        matcher = compile_patterns(DISK_KEYWORDS)
+    started = time.perf_counter()
+    result = _run(['diskutil', 'list'], retries=1, retry_timeouts=True)
+    disk_info = []
+
+    lines = result.stdout.split('\n')
+    current_disk = None
+
+    for i, line in enumerate(lines):
+        if progress:
+            progress(int((i / len(lines)) * 100))
+
+        if line.startswith('/dev/disk'):
+            current_disk = line.split()[0]
+
+        # Look for simulator-related volumes
+        if current_disk and matcher(line):
+            info_result = _run(['diskutil', 'info', current_disk], retries=1, retry_timeouts=True)
+            volume_name, mount_point, size = parse_disk_info(info_result.stdout)
+
+            if volume_name or mount_point:
+                disk_info.append(DiskRecord(current_disk, volume_name or 'Unknown', mount_point or 'Not Mounted', size))
+
+    metrics.observe_disk_scan(disk_info, time.perf_counter() - started)
+    return disk_info
+
+
+@traced("list_processes", "scan")
+def list_processes(matcher=None):
+    """Simulator-related ProcessRecords from ``ps aux``, matched like scan_disks against PROCESS_KEYWORDS."""
+    if matcher is None:
+        matcher = compile_patterns(PROCESS_KEYWORDS)
+    started = time.perf_counter()
+    ps_result = _run(['ps', 'aux'])
+    with tracer.span("parse_ps", "parse"):
+        processes, service_pid = _parse_ps(ps_result.stdout, matcher)
+    metrics.observe_process_scan(processes, time.perf_counter() - started, service_pid)
+    return processes
+
+
+def _parse_ps(output, matcher):
+    """``(records, CoreSimulatorService PID or None)`` from ``ps aux`` output."""
+    processes = []
+    service_pid = None
+
+    for line in output.split('\n')[1:]:  # Skip header
+        parts = line.split()
+        if len(parts) >= 11:
+            process_name = ' '.join(parts[10:])
+            # Looked for whatever the patterns say; the record's name is truncated
+            if service_pid is None and "CoreSimulatorService" in process_name and parts[1].isdigit():
+                service_pid = int(parts[1])
+            if matcher(process_name):
+                try:
+                    pid, cpu, mem = int(parts[1]), float(parts[2]), float(parts[3])
+                except ValueError:
+                    continue
+                name = process_name[:50] + '...' if len(process_name) > 50 else process_name
+                # Start times repeat across processes; share one string per value
+                processes.append(ProcessRecord(pid, sys.intern(parts[8]), cpu, mem, name))
+
+    return processes, service_pid
+
+
+def on_battery():
+    try:
+        return "Battery Power" in _run(["pmset", "-g", "batt"], timeout=5).stdout
+    except Exception:
+        return False
+
+
+def load_per_cpu():
+    try:
+        return os.getloadavg()[0] / (os.cpu_count() or 1)
+    except OSError:
+        return 0.0
+
+
+def running_apps(names=("Xcode", "Simulator")):
+    """The subset of ``names`` that currently have a process with exactly that name."""
+    try:
+        result = _run(["pgrep", "-lx", "|".join(names)], timeout=5)
+    except Exception:
+        return set()
+    found = {line.split(None, 1)[1].strip() for line in result.stdout.splitlines() if " " in line}
+    return found & set(names)
+
+
+def mount_signature():
+    """Modification times of the directories simulator volumes mount under.
+
+    Costs two stat calls; a different value means something was mounted or
+    unmounted since the last call.
+    """
+    signature = []
+    for path in VOLUME_DIRS:
+        try:
+            signature.append(os.stat(path).st_mtime_ns)
+        except OSError:
+            signature.append(None)
+    return tuple(signature)
+
+
+def activity_probe(apps=("Xcode", "Simulator")):
+    """Cheap signals the adaptive auto-scan checks between full scans."""
+    return {
+        'on_battery': on_battery(),
+        'load_per_cpu': load_per_cpu(),
+        'apps': running_apps(apps),
+        'mounts': mount_signature(),
+    }
+
+
+def runtimes_in_use():
+    """Mount paths of the simulator runtimes that booted devices are running.
+
+    Returns None when simctl can't tell, so callers can play safe.
+    """
+    import json
+
+    try:
+        booted = json.loads(_run(["xcrun", "simctl", "list", "devices", "booted", "-j"]).stdout)
+        runtimes = json.loads(_run(["xcrun", "simctl", "runtime", "list", "-j"]).stdout)
+    except Exception:
+        return None
+    in_use = {identifier for identifier, devices in booted.get('devices', {}).items() if devices}
+    return {runtime['mountPath'] for runtime in runtimes.values()
+            if runtime.get('runtimeIdentifier') in in_use and runtime.get('mountPath')}
+
+
+@traced("eject_disk", "eject")
+def eject_disk(device, timeout=None):
+    """Force-detach ``device``, retrying while it is busy. Returns ``(ok, message)``."""
+    started = time.perf_counter()
+    ok, message = _eject_disk(device, timeout)
+    metrics.ejects.inc(result="ok" if ok else "failed")
+    metrics.eject_seconds.observe(time.perf_counter() - started)
+    if not ok:
+        metrics.failures.inc(operation="eject")
+    return ok, message
+
+
+def _eject_disk(device, timeout):
+    try:
+        result = _run(["hdiutil", "detach", "-force", device], timeout=timeout, retries=2, retry_if=_busy)
+        if result.returncode == 0:
+            return True, f"Detached {device}"
+        return False, result.stderr.strip() or result.stdout.strip()
+    except subprocess.TimeoutExpired:
+        return False, f"Timeout detaching {device}"
+    except CommandCancelled:
+        return False, f"Cancelled detaching {device}"
+    except Exception as e:
+        return False, f"Exception detaching {device}: {e}"
+
+
+def quit_simulators():
+    """Ask the Simulator app and its helpers to exit before unmounting."""
+    try:
+        _run(["killall", "Simulator", "launchd_sim", "CoreSimulator"])
+        return True, "Simulator processes signalled"
+    except Exception as e:
+        return False, f"Exception killing simulators: {e}"
+
+
+def process_start(pid):
+    """``ps``'s START for ``pid`` (the same text as ProcessRecord.start), or None if it is not running."""
+    try:
+        result = _run(["ps", "-o", "start=", "-p", str(int(pid))])
+    except Exception:
+        return None
+    if result.returncode != 0:
+        return None
+    return result.stdout.strip() or None
+
+
+@traced("kill_process", "kill")
+def kill_process(pid, password=None, start=None):
+    """SIGKILL ``pid``, through an admin shell when a password is given.
+
+    With ``start`` (a ProcessRecord's start time) the process is only killed
+    if ``pid`` still started then, so a PID reused since the scan is left alone.
+    """
+    if start is not None and process_start(pid) != start:
+        return False, f"Process {pid} is no longer the one that was listed; not killed"
+    ok, message = _kill_process(pid, password)
+    _count_kill(ok)
+    return ok, message
+
+
+def _count_kill(ok):
+    metrics.kills.inc(result="ok" if ok else "failed")
+    if not ok:
+        metrics.failures.inc(operation="kill")
+
+
+def _kill_process(pid, password):
+    try:
+        if password:
+            result = _admin_shell(f"kill -9 {int(pid)}", password)
+            if result.returncode != 0:
+                return False, result.stderr.strip() or f"kill -9 {pid} failed"
+        else:
+            os.kill(int(pid), 9)
+        return True, f"Killed process {pid}"
+    except Exception as e:
+        return False, f"Failed to kill process {pid}: {e}"
+
+
+@traced("kill_all_simulators", "kill")
+def kill_all_simulators(password=None):
+    """Run every KILL_ALL_COMMANDS entry; returns ``[(command, ok), ...]``."""
+    results = []
+    for cmd in KILL_ALL_COMMANDS:
+        try:
+            if password:
+                result = _admin_shell(cmd, password)
+            else:
+                result = _run(cmd.split())
+            # pkill exits 1 when nothing matched, which is fine here
+            results.append((cmd, result.returncode in (0, 1)))
+        except Exception:
+            results.append((cmd, False))
+        _count_kill(results[-1][1])
+    return results
+
+
+def delete_simulator_devices():
+    try:
+        _run(["xcrun", "simctl", "shutdown", "all"])
+        result = _run(["xcrun", "simctl", "delete", "all"])
+        if result.returncode != 0:
+            return False, result.stderr.strip() or "simctl delete failed"
+        return True, "All simulator devices deleted"
+    except Exception as e:
+        return False, f"Failed to delete simulator devices: {e}"
+
+
+def remove_device_data(gate=None):
+    try:
+        for path in DEVICE_DATA_PATHS:
+            expanded = os.path.expanduser(path)
+            if os.path.isdir(expanded):
+                remove_tree(expanded, gate)
+        return True, "Device directories and profiles removed"
+    except Exception as e:
+        return False, f"Failed to remove directories: {e}"
+
+
+def disable_core_simulator_service():
+    try:
+        result = _run(["sudo", "-n", "launchctl", "disable", "system/com.apple.CoreSimulator.CoreSimulatorService"])
+        if result.returncode != 0:
+            return False, result.stderr.strip() or "launchctl disable failed"
+        return True, "CoreSimulator service disabled"
+    except Exception as e:
+        return False, f"Failed to disable CoreSimulator service: {e}"
+
+
+@traced("directory_size", "delete")
+def directory_size(path):
+    total = 0
+    for root, dirs, files in os.walk(path, onerror=lambda error: None):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                pass
+    return total
+
+
+def remove_tree(path, gate=None, batch=200):
+    """shutil.rmtree, but calling ``gate.checkpoint()`` every ``batch`` entries.
+
+    The checkpoint lets an idle gate (see simcleaner.idle) pause a large
+    delete while a build is running.
+    """
+    with tracer.span("remove_tree", "delete", path):
+        _remove_tree(path, gate, batch)
+
+
+def _remove_tree(path, gate, batch):
+    if gate is None:
+        shutil.rmtree(path)
+        return
+    count = 0
+    for root, dirs, files in os.walk(path, topdown=False):
+        for name in files:
+            os.unlink(os.path.join(root, name))
+        for name in dirs:
+            entry = os.path.join(root, name)
+            if os.path.islink(entry):
+                os.unlink(entry)
+            else:
+                os.rmdir(entry)
+        count += len(files) + len(dirs)
+        if count >= batch:
+            gate.checkpoint()
+            count = 0
+    os.rmdir(path)
+
+
+@traced("clean_caches", "delete")
+def clean_caches(categories=None, dry_run=False, gate=None):
+    """Measure and (unless ``dry_run``) delete the CACHE_PATHS categories.
+
+    Returns one dict per category with its path, size in bytes and whether
+    it was removed. ``gate`` is passed to remove_tree.
+    """
+    report = []
+    for category, path in CACHE_PATHS.items():
+        if categories and category not in categories:
+            continue
+        expanded = os.path.expanduser(path)
+        entry = {'category': category, 'path': expanded, 'bytes': 0, 'removed': False, 'error': None}
+        if os.path.isdir(expanded):
+            entry['bytes'] = directory_size(expanded)
+            if not dry_run:
+                started = time.perf_counter()
+                try:
+                    remove_tree(expanded, gate)
+                    entry['removed'] = True
+                except OSError as e:
+                    entry['error'] = str(e)
+                    metrics.failures.inc(operation="delete")
+                else:
+                    metrics.freed_bytes.inc(entry['bytes'], category=category)
+                    metrics.delete_seconds.observe(time.perf_counter() - started, category=category)
+        metrics.reclaimable_bytes.set(0 if entry['removed'] else entry['bytes'], category=category)
+        report.append(entry)
+    return report
+
+
+@traced("clear_device_caches", "delete")
+def clear_device_caches():
+    """Remove the per-device Library/Caches folders; returns the paths removed."""
+    removed = []
+    for path in glob.glob(os.path.expanduser(DEVICE_CACHE_GLOB)):
+        shutil.rmtree(path, ignore_errors=True)
+        removed.append(path)
+    return removed
+
+
+def keychain_password():
+    try:
+        result = _run(["security", "find-generic-password", "-s", KEYCHAIN_SERVICE, "-w"])
+        if result.returncode == 0:
+            return result.stdout.strip()
+    except Exception:
+        pass
+    return None
+
+
+def save_keychain_password(password):
+    try:
+        _run(["security", "add-generic-password", "-U", "-a", KEYCHAIN_SERVICE, "-s", KEYCHAIN_SERVICE,
+              "-w", password])
+    except Exception:
+        pass
@@ -0,0 +1,91 @@
+"""Hand-off from worker threads to the UI thread, batched per frame.
+
+Workers never touch the UI; they post to an EventBus from any thread:
+
+* ``call(callback, *args)`` queues a call; every one is delivered, in order;
+* ``latest(key, callback, *args)`` keeps only the newest call per ``key``
+  and delivers it at most ``rate`` times a second. Progress reports use it,
+  so a scan that reports every line of ``diskutil list`` repaints the
+  progress bar a handful of times instead of hundreds.
+
+Only the first post after a dispatch calls ``wake()`` (on the posting
+thread); later ones just append, so however many results pile up the UI
+needs one queued call to pick them up. The UI thread then calls
+``dispatch()``, which runs everything that is due and returns how long
+until held-back ``latest`` calls are. TaskBridge in the GUI turns ``wake``
+into a queued signal and runs ``dispatch`` from a timer at most once a frame.
+"""
+import threading
+import time
+
+
+class EventBus:
+    def __init__(self, wake, rate=10.0, clock=time.monotonic):
+        self.wake = wake
+        self.rate = rate
+        self.clock = clock
+        self.stats = {'posted': 0, 'coalesced': 0, 'wakes': 0, 'dispatches': 0, 'delivered': 0}
+        self._lock = threading.Lock()
+        self._calls = []
+        # key -> (callback, args) of the newest undelivered call, and when that key last went out
+        self._latest = {}
+        self._sent = {}
+        self._awake = False
+        self._retry_at = None
+
+    def _wake_needed(self, held):
+        # Called with the lock held
+        self.stats['posted'] += 1
+        if self._awake or (held and self._retry_at is not None):
+            return False
+        self._awake = True
+        self.stats['wakes'] += 1
+        return True
+
+    def call(self, callback, *args):
+        with self._lock:
+            self._calls.append((callback, args))
+            wake = self._wake_needed(False)
+        if wake:
+            self.wake()
+
+    def latest(self, key, callback, *args):
+        with self._lock:
+            if key in self._latest:
+                self.stats['coalesced'] += 1
+            self._latest[key] = (callback, args)
+            # A retry is already scheduled for held-back calls; this one rides along
+            wake = self._wake_needed(True)
+        if wake:
+            self.wake()
+
+    def dispatch(self):
+        """Run the queued calls and the ``latest`` calls that are due (on the UI thread).
+
+        Returns the seconds until the next held-back ``latest`` call is due, or None.
+        """
+        now = self.clock()
+        interval = 1.0 / self.rate
+        wait = None
+        due = []
+        with self._lock:
+            calls, self._calls = self._calls, []
+            for key, entry in list(self._latest.items()):
+                sent = self._sent.get(key)
+                remaining = 0 if sent is None else sent + interval - now
+                if remaining <= 0:
+                    due.append(entry)
+                    del self._latest[key]
+                    self._sent[key] = now
+                elif wait is None or remaining < wait:
+                    wait = remaining
+            self._awake = False
+            self._retry_at = None if wait is None else now + wait
+            self.stats['dispatches'] += 1
+            self.stats['delivered'] += len(calls) + len(due)
+        # Progress first, so a result that hides the progress bar comes after its last update
+        for callback, args in due:
+            callback(*args)
+        for callback, args in calls:
+            callback(*args)
+        return wait
@@ -0,0 +1,333 @@
+"""Run scans and cleanups on many build hosts from one place.
+
+Each host runs an agent, ``python -m simcleaner agent``, which serves a small
+JSON API over HTTP (127.0.0.1:8765 unless told otherwise; reach it through an
+SSH tunnel or bind it with ``--host``). Every request must carry the shared
+token as ``Authorization: Bearer <token>``.
+
+    GET  /v1/health      {"host", "version"}
+    GET  /v1/scan        {"host", "disks": [...], "processes": [...]}
+    GET  /v1/inventory   {"host", "caches": [clean_caches(dry_run=True) entries]}
+    POST /v1/clean       {"categories": [...], "dry_run": false, "eject": false}
+                         -> {"host", "caches": [...], "ejected": [[device, ok, message], ...]}
+
+An ``eject`` clean skips disks of runtimes a booted simulator is using, as
+auto-eject does, and ejects nothing when simctl can't say which those are.
+
+FleetClient is the controller side. It fans a request out to every agent on
+a thread pool, keeps one pool of persistent HTTP/1.1 connections per host,
+and applies a per-host socket timeout, so one dead host costs one timeout
+rather than stalling the rest; a clean gets a longer one for its reply, and
+is never resent, because the agent may already be running it. Cleanups go
+out in parallel with at most ``max_parallel`` hosts cleaning at once.
+Results come back as HostResult tuples; merge_disks and merge_caches
+flatten them into one table.
+"""
+import hmac
+import http.client
+import json
+import os
+import queue
+import socket
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from simcleaner.autoeject import mount_in_use
+
+DEFAULT_PORT = 8765
+TOKEN_ENV = "SIMCLEANER_AGENT_TOKEN"
+MAX_BODY = 1 << 20
+
+HostResult = namedtuple("HostResult", "agent ok data error seconds")
+
+
+class FleetError(Exception):
+    pass
+
+
+# --- agent ----------------------------------------------------------------------
+
+def _scan():
+    from simcleaner import core
+    return {'disks': [disk._asdict() for disk in core.scan_disks()],
+            'processes': [proc._asdict() for proc in core.list_processes()]}
+
+
+def _inventory():
+    from simcleaner import core
+    return {'caches': core.clean_caches(dry_run=True)}
+
+
+def _clean(request):
+    from simcleaner import core
+    categories = request.get('categories') or None
+    if categories is not None and not (isinstance(categories, list) and all(isinstance(c, str) for c in categories)):
+        raise ValueError("categories must be a list of names")
+    dry_run = bool(request.get('dry_run', False))
+    ejected = []
+    if request.get('eject') and not dry_run:
+        # As with auto-eject: never detach a runtime a booted simulator is using,
+        # and touch nothing when simctl can't say which those are
+        in_use = core.runtimes_in_use()
+        disks = core.scan_disks()
+        if in_use is None:
+            ejected = [[disk.device, False, "not ejected: simctl could not say which runtimes are in use"]
+                       for disk in disks]
+        else:
+            core.quit_simulators()
+            for disk in disks:
+                if mount_in_use(disk.mount, in_use):
+                    ejected.append([disk.device, False, "not ejected: runtime in use by a booted simulator"])
+                    continue
+                ok, message = core.eject_disk(disk.device)
+                ejected.append([disk.device, ok, message])
+    return {'caches': core.clean_caches(categories, dry_run=dry_run), 'ejected': ejected}
+
+
+def serve_agent(token, host="127.0.0.1", port=DEFAULT_PORT, name=None):
+    """Serve the agent API from a daemon thread; returns the server.
+
+    Raises OSError if the address is taken. Cleanups run one at a time; scans
+    and inventories may overlap them (the core runner caps tool concurrency).
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    from simcleaner import __version__
+
+    name = name or socket.gethostname()
+    clean_lock = threading.Lock()
+    expected = f"Bearer {token}".encode()
+    routes = {
+        ("GET", "/v1/health"): lambda _request: {'version': __version__},
+        ("GET", "/v1/scan"): lambda _request: _scan(),
+        ("GET", "/v1/inventory"): lambda _request: _inventory(),
+    }
+
+    def clean(request):
+        with clean_lock:
+            return _clean(request)
+
+    routes[("POST", "/v1/clean")] = clean
+
+    class Handler(BaseHTTPRequestHandler):
+        # Keep-alive, so controllers can reuse their connections
+        protocol_version = "HTTP/1.1"
+
+        def _reply(self, status, data):
+            body = json.dumps(data).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _handle(self, method):
+            try:
+                length = int(self.headers.get("Content-Length") or 0)
+                if length < 0:
+                    raise ValueError(length)
+            except ValueError:
+                # Without a length the body can't be skipped, so the connection can't be reused
+                self.close_connection = True
+                self._reply(400, {'error': "bad Content-Length"})
+                return
+            if length > MAX_BODY:
+                self.close_connection = True
+                self._reply(413, {'error': "request too large"})
+                return
+            raw = self.rfile.read(length) if length else b""
+            if not hmac.compare_digest(self.headers.get("Authorization", "").encode(), expected):
+                self._reply(401, {'error': "bad or missing token"})
+                return
+            route = routes.get((method, self.path.split("?", 1)[0]))
+            if route is None:
+                self._reply(404, {'error': f"no such endpoint {method} {self.path}"})
+                return
+            try:
+                request = json.loads(raw) if raw else {}
+                if not isinstance(request, dict):
+                    raise ValueError("request body must be a JSON object")
+                result = route(request)
+            except ValueError as e:
+                self._reply(400, {'error': str(e)})
+                return
+            except Exception as e:
+                self._reply(500, {'error': f"{type(e).__name__}: {e}"})
+                return
+            self._reply(200, {'host': name, **result})
+
+        def do_GET(self):
+            self._handle("GET")
+
+        def do_POST(self):
+            self._handle("POST")
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="FleetAgent", daemon=True).start()
+    return server
+
+
+def load_token(path=None):
+    """The shared token from ``path`` or $SIMCLEANER_AGENT_TOKEN; raises FleetError if neither is set."""
+    if path:
+        with open(path) as handle:
+            token = handle.read().strip()
+    else:
+        token = os.environ.get(TOKEN_ENV, "").strip()
+    if not token:
+        raise FleetError(f"no agent token: pass --token-file or set {TOKEN_ENV}")
+    return token
+
+
+# --- controller -----------------------------------------------------------------
+
+def parse_agents(lines):
+    """``[(name, url), ...]`` from ``url`` or ``name url`` lines; ``#`` starts a comment."""
+    agents = []
+    for line in lines:
+        line = line.split("#", 1)[0].strip()
+        if not line:
+            continue
+        parts = line.split()
+        url = parts[-1] if "://" in parts[-1] else f"http://{parts[-1]}"
+        if not urlsplit(url).port:
+            url = f"{url.rstrip('/')}:{DEFAULT_PORT}"
+        agents.append((parts[0] if len(parts) > 1 else urlsplit(url).netloc, url))
+    return agents
+
+
+class FleetClient:
+    """Controller side of the agent API.
+
+    ``timeout`` bounds connecting, sending and waiting for most replies; a
+    clean's reply may take up to ``clean_timeout``, since the agent quits
+    simulators, ejects and deletes before it answers.
+    """
+
+    def __init__(self, agents, token, timeout=30.0, clean_timeout=1800.0, max_workers=32):
+        self.agents = list(agents)
+        self.token = token
+        self.timeout = timeout
+        self.clean_timeout = clean_timeout
+        self.max_workers = max_workers
+        self.stats = {'requests': 0, 'connections': 0}
+        self._pools = {url: queue.LifoQueue() for _name, url in self.agents}
+        self._lock = threading.Lock()
+
+    def _connect(self, url):
+        parts = urlsplit(url)
+        cls = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+        with self._lock:
+            self.stats['connections'] += 1
+        return cls(parts.hostname, parts.port, timeout=self.timeout)
+
+    def request(self, agent, method, path, body=None, read_timeout=None):
+        """One API call to ``agent`` (a ``(name, url)`` pair); returns the decoded reply.
+
+        ``read_timeout`` (default ``timeout``) bounds the wait for the reply.
+        A GET that finds its pooled connection closed by the agent is retried
+        once on a fresh one. Other methods are never resent, since the agent
+        may already be acting on them; they always get a fresh connection so
+        a stale keep-alive one can't fail them.
+
+        Raises FleetError for HTTP errors, OSError and http.client errors
+        (timeouts included) for transport failures.
+        """
+        name, url = agent
+        pool = self._pools.setdefault(url, queue.LifoQueue())
+        payload = json.dumps(body).encode() if body is not None else None
+        headers = {'Authorization': f"Bearer {self.token}", 'Content-Type': "application/json"}
+        idempotent = method == "GET"
+        for attempt in range(2):
+            conn = None
+            if attempt == 0 and idempotent:
+                try:
+                    conn = pool.get_nowait()
+                except queue.Empty:
+                    pass
+            reused = conn is not None
+            if conn is None:
+                conn = self._connect(url)
+            try:
+                conn.timeout = self.timeout
+                if conn.sock is not None:
+                    conn.sock.settimeout(self.timeout)
+                conn.request(method, path, body=payload, headers=headers)
+                conn.sock.settimeout(read_timeout or self.timeout)
+                response = conn.getresponse()
+                raw = response.read()
+            except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError):
+                conn.close()
+                # The agent closed an idle keep-alive connection; try once on a fresh one
+                if reused and attempt == 0:
+                    continue
+                raise
+            except BaseException:
+                conn.close()
+                raise
+            with self._lock:
+                self.stats['requests'] += 1
+            if response.will_close:
+                conn.close()
+            else:
+                pool.put(conn)
+            try:
+                data = json.loads(raw)
+            except ValueError:
+                raise FleetError(f"{name}: HTTP {response.status}, not JSON") from None
+            if response.status != 200:
+                raise FleetError(f"{name}: HTTP {response.status}: {data.get('error', '')}")
+            return data
+        raise FleetError(f"{name}: connection kept closing")
+
+    def _call(self, agent, method, path, body, read_timeout=None):
+        started = time.monotonic()
+        try:
+            data = self.request(agent, method, path, body, read_timeout)
+            return HostResult(agent[0], True, data, None, time.monotonic() - started)
+        except (FleetError, OSError, http.client.HTTPException) as e:
+            error = "timed out" if isinstance(e, socket.timeout) else str(e) or type(e).__name__
+            return HostResult(agent[0], False, None, error, time.monotonic() - started)
+
+    def fan_out(self, method, path, body=None, agents=None, max_parallel=None, read_timeout=None):
+        """Send one request to each agent concurrently; HostResults in agent order."""
+        agents = self.agents if agents is None else agents
+        workers = max(1, min(max_parallel or self.max_workers, len(agents) or 1))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="Fleet") as pool:
+            return list(pool.map(lambda agent: self._call(agent, method, path, body, read_timeout), agents))
+
+    def scan(self):
+        return self.fan_out("GET", "/v1/scan")
+
+    def inventory(self):
+        return self.fan_out("GET", "/v1/inventory")
+
+    def clean(self, categories=None, dry_run=False, eject=False, max_parallel=4, agents=None):
+        """Clean every agent (or ``agents``), at most ``max_parallel`` hosts at a time."""
+        body = {'categories': categories or [], 'dry_run': dry_run, 'eject': eject}
+        return self.fan_out("POST", "/v1/clean", body, agents=agents, max_parallel=max_parallel,
+                            read_timeout=self.clean_timeout)
+
+    def close(self):
+        for pool in self._pools.values():
+            while not pool.empty():
+                pool.get_nowait().close()
+
+
+def merge_disks(results):
+    """One row per disk across hosts: ``(host, device, name, mount, size_bytes)``, largest first."""
+    rows = [(result.agent, disk['device'], disk['name'], disk['mount'], disk['size_bytes'])
+            for result in results if result.ok for disk in result.data['disks']]
+    return sorted(rows, key=lambda row: (-row[4], row[0], row[1]))
+
+
+def merge_caches(results):
+    """One row per host and cache category: ``(host, category, bytes, removed, error)``."""
+    return [(result.agent, entry['category'], entry['bytes'], entry['removed'], entry['error'])
+            for result in results if result.ok for entry in result.data['caches']]
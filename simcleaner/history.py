@@ -0,0 +1,209 @@
+"""Disk-usage history: the numbers from every scan, kept as a small time series.
+
+Each sample is a value for a named series at a point in time: ``disks.mounted``,
+``disks.bytes``, ``processes``, ``caches.bytes`` and one ``cache.<category>``
+per CACHE_PATHS entry. Samples are buffered in memory and written to SQLite at
+most once per ``flush_interval``. On the way in every sample is folded into
+minute, hour and day buckets, each holding the count, sum, minimum, maximum and
+last value. Minute buckets are kept for two days and hourly ones for 90 days;
+daily buckets are never dropped, which is about 365 short rows per series a
+year. A chart therefore reads at most a few hundred pre-aggregated rows over
+any range, and the file levels off at around a megabyte.
+
+Use a TrendHistory from one thread; the database is opened on first use.
+"""
+import os
+import sqlite3
+import time
+from collections import namedtuple
+
+MINUTE, HOUR, DAY = 60, 3600, 86400
+RESOLUTIONS = (MINUTE, HOUR, DAY)
+# Seconds each resolution is kept for; None keeps it for good
+RETENTION = {MINUTE: 2 * DAY, HOUR: 90 * DAY, DAY: None}
+
+Point = namedtuple("Point", "time count mean low high last")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS series (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE);
+CREATE TABLE IF NOT EXISTS buckets (
+    series INTEGER NOT NULL,
+    resolution INTEGER NOT NULL,
+    start INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    total REAL NOT NULL,
+    low REAL NOT NULL,
+    high REAL NOT NULL,
+    last REAL NOT NULL,
+    PRIMARY KEY (series, resolution, start)
+) WITHOUT ROWID;
+"""
+
+# Samples arrive in time order, so the newest one is always the bucket's last value
+UPSERT = """
+INSERT INTO buckets VALUES (?, ?, ?, 1, ?, ?, ?, ?)
+ON CONFLICT (series, resolution, start) DO UPDATE SET
+    count = count + 1, total = total + excluded.total,
+    low = min(low, excluded.low), high = max(high, excluded.high), last = excluded.last
+"""
+
+
+def default_path():
+    return os.path.expanduser("~/Library/Application Support/SimulatorEjector/history.sqlite3")
+
+
+def cache_series(category):
+    return f"cache.{category}"
+
+
+def scan_values(disks=None, processes=None, caches=None):
+    """Series values from scan results: DiskRecords, ProcessRecords and/or a clean_caches report."""
+    values = {}
+    if disks is not None:
+        values['disks.mounted'] = sum(1 for disk in disks if disk.mounted)
+        values['disks.bytes'] = sum(disk.size_bytes for disk in disks)
+    if processes is not None:
+        values['processes'] = len(processes)
+    if caches:
+        # What is left after a cleanup, so the chart shows whether it held
+        sizes = {entry['category']: 0 if entry['removed'] else entry['bytes'] for entry in caches
+                 if not entry['error']}
+        values.update((cache_series(category), size) for category, size in sizes.items())
+        if len(sizes) == len(caches):
+            values['caches.bytes'] = sum(sizes.values())
+    return values
+
+
+def resolution_for(span):
+    """The coarsest resolution that still gives a chart over ``span`` seconds enough points."""
+    if span <= 12 * HOUR:
+        return MINUTE
+    if span <= 30 * DAY:
+        return HOUR
+    return DAY
+
+
+def growth_per_day(points):
+    """Change per day from the first to the last point, or None with fewer than two points."""
+    if len(points) < 2 or points[-1].time == points[0].time:
+        return None
+    return (points[-1].last - points[0].mean) * DAY / (points[-1].time - points[0].time)
+
+
+class TrendHistory:
+    def __init__(self, path=None, flush_interval=60.0, clock=time.time):
+        self.path = path or default_path()
+        self.flush_interval = flush_interval
+        self.clock = clock
+        self.error = None
+        self._db = None
+        self._ids = {}
+        self._pending = []
+        self._flushed_at = None
+        self._compacted_at = 0.0
+
+    def _connect(self):
+        if self._db is None:
+            if self.path != ":memory:":
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            db = sqlite3.connect(self.path)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.executescript(SCHEMA)
+            self._ids = {name: series for series, name in db.execute("SELECT id, name FROM series")}
+            self._db = db
+        return self._db
+
+    def _series_id(self, db, name):
+        series = self._ids.get(name)
+        if series is None:
+            series = self._ids[name] = db.execute("INSERT INTO series (name) VALUES (?)", (name,)).lastrowid
+        return series
+
+    def record(self, values, at=None):
+        """Buffer ``{series: value}`` taken at ``at`` (default now); True if this wrote to disk."""
+        at = self.clock() if at is None else at
+        self._pending.extend((at, name, float(value)) for name, value in values.items())
+        if self._flushed_at is None:
+            # The first samples of a session are written straight away
+            self._flushed_at = at - self.flush_interval
+        if at - self._flushed_at >= self.flush_interval:
+            return self.flush(at)
+        return False
+
+    def flush(self, now=None):
+        """Write buffered samples; False (with ``error`` set) if the database is unusable."""
+        now = self.clock() if now is None else now
+        if not self._pending:
+            return True
+        try:
+            db = self._connect()
+            with db:
+                rows = []
+                for at, name, value in self._pending:
+                    series = self._series_id(db, name)
+                    second = int(at)
+                    rows.extend((series, resolution, second - second % resolution, value, value, value, value)
+                                for resolution in RESOLUTIONS)
+                db.executemany(UPSERT, rows)
+            if now - self._compacted_at >= HOUR:
+                self.compact(now)
+        except (sqlite3.Error, OSError) as e:
+            # Keep going without history rather than buffering forever
+            self.error = str(e)
+            self._pending = []
+            return False
+        self._pending = []
+        self._flushed_at = now
+        return True
+
+    def compact(self, now=None):
+        """Drop buckets older than their resolution's retention."""
+        now = self.clock() if now is None else now
+        db = self._connect()
+        with db:
+            for resolution, keep in RETENTION.items():
+                if keep is not None:
+                    db.execute("DELETE FROM buckets WHERE resolution = ? AND start < ?", (resolution, now - keep))
+        self._compacted_at = now
+
+    def _read(self):
+        """The database with buffered samples written, or None if it is unusable."""
+        if not self.flush():
+            return None
+        try:
+            return self._connect()
+        except (sqlite3.Error, OSError) as e:
+            self.error = str(e)
+            return None
+
+    def names(self):
+        return [] if self._read() is None else sorted(self._ids)
+
+    def points(self, name, since, until=None, resolution=None):
+        """Buckets of ``name`` from ``since`` to ``until`` (default now), oldest first.
+
+        ``resolution`` defaults to resolution_for the span.
+        """
+        until = self.clock() if until is None else until
+        resolution = resolution or resolution_for(until - since)
+        db = self._read()
+        series = self._ids.get(name)
+        if db is None or series is None:
+            return []
+        start = int(since) - int(since) % resolution
+        rows = db.execute("SELECT start, count, total, low, high, last FROM buckets "
+                          "WHERE series = ? AND resolution = ? AND start BETWEEN ? AND ? ORDER BY start",
+                          (series, resolution, start, int(until)))
+        return [Point(start, count, total / count, low, high, last) for start, count, total, low, high, last in rows]
+
+    def row_counts(self):
+        """``{resolution: rows}`` across all series."""
+        db = self._read()
+        return {} if db is None else dict(db.execute("SELECT resolution, count(*) FROM buckets GROUP BY resolution"))
+
+    def close(self):
+        self.flush()
+        if self._db is not None:
+            self._db.close()
+            self._db = None
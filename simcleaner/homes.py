@@ -0,0 +1,188 @@
+"""Clean simulator and Xcode caches for every user on a shared machine.
+
+core.CACHE_PATHS are relative to ``~``, so clean_caches only reaches the user
+running it. A sweep discovers the homes under a root (``/Users`` on macOS;
+any directory laid out the same way works, which is how the benchmark runs
+on Linux) and sizes, and unless it is a dry run deletes, each user's cache
+folders:
+
+* up to ``max_users`` users are swept at once, each with at most
+  ``per_user`` worker threads, so one user with a huge DerivedData cannot
+  take every worker and fifty service accounts do not start hundreds of
+  tree walks at once;
+* a user's work is split into the top-level entries of each cache folder
+  (one DerivedData project, one CoreSimulator cache bucket), so those
+  workers have something to share. The folders themselves are left in
+  place, empty;
+* nothing below the home is reached through a symlink: each cache folder
+  is opened level by level with O_NOFOLLOW and must resolve inside the
+  home, and entries are sized and deleted relative to its descriptor
+  (os.fwalk, shutil.rmtree with ``dir_fd``), so an account cannot point
+  its DerivedData elsewhere and have root delete that;
+* an idle gate (see simcleaner.idle) is checked before each entry is
+  deleted, so the sweep pauses while a build runs.
+
+sweep() returns one UserSweep per home, in user order, with the same
+per-category entries as clean_caches and the user's totals. Sweeping other
+users' homes needs permission to delete in them, which in practice means
+running as root.
+"""
+import errno
+import os
+import shutil
+import stat
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from simcleaner import core, metrics
+from simcleaner.trace import tracer
+
+DEFAULT_ROOT = "/Users"
+# Folders under /Users that are not anyone's home
+NOT_HOMES = ("Shared", "Guest")
+
+Home = namedtuple("Home", "user path")
+# ``caches`` holds clean_caches-style entries; ``bytes`` is what was (or would be) freed
+UserSweep = namedtuple("UserSweep", "user home caches bytes errors seconds")
+
+
+def discover_homes(root=DEFAULT_ROOT, users=None):
+    """Homes under ``root`` with a Library folder, sorted by user; ``users`` limits the names."""
+    homes = []
+    try:
+        entries = list(os.scandir(root))
+    except OSError:
+        return homes
+    for entry in entries:
+        if entry.name.startswith(".") or entry.name in NOT_HOMES or (users and entry.name not in users):
+            continue
+        try:
+            if entry.is_dir(follow_symlinks=False) and os.path.isdir(os.path.join(entry.path, "Library")):
+                homes.append(Home(entry.name, entry.path))
+        except OSError:
+            continue
+    return sorted(homes)
+
+
+def cache_folder(home, path):
+    """A CACHE_PATHS path (``~/...``) inside ``home``."""
+    return os.path.join(home, path[2:]) if path.startswith("~/") else path
+
+
+def _open_folder(home, path):
+    """Open the cache folder ``path`` of ``home`` without following symlinks; None if it does not exist.
+
+    Any account can point ``Library/...`` at somewhere else, and the sweep
+    runs as root, so every level below the home is opened with O_NOFOLLOW
+    and the result must resolve to a place inside the home.
+    """
+    flags = os.O_RDONLY | os.O_DIRECTORY | os.O_NOFOLLOW
+    fd = os.open(home, flags)
+    try:
+        for part in os.path.relpath(cache_folder(home, path), home).split(os.sep):
+            try:
+                child = os.open(part, flags, dir_fd=fd)
+            except FileNotFoundError:
+                return None
+            except OSError as e:
+                # O_NOFOLLOW fails with ELOOP on a symlink, O_DIRECTORY with ENOTDIR on anything else
+                if e.errno in (errno.ELOOP, errno.ENOTDIR):
+                    raise OSError(e.errno, f"{part} is a symlink or not a directory; not following it") from e
+                raise
+            os.close(fd)
+            fd = child
+        real_home = os.path.realpath(home)
+        if os.path.commonpath([os.path.realpath(cache_folder(home, path)), real_home]) != real_home:
+            raise OSError(errno.EXDEV, "resolves outside the home folder")
+        folder_fd, fd = fd, None
+        return folder_fd
+    finally:
+        if fd is not None:
+            os.close(fd)
+
+
+def _tree_size(name, dir_fd):
+    total = 0
+    for _root, _dirs, files, root_fd in os.fwalk(name, dir_fd=dir_fd):
+        for file_name in files:
+            try:
+                total += os.lstat(file_name, dir_fd=root_fd).st_size
+            except OSError:
+                pass
+    return total
+
+
+def _sweep_entry(folder_fd, name, dry_run, gate):
+    """Size one top-level cache entry and delete it unless ``dry_run``; returns ``(bytes, error)``.
+
+    Everything goes through the folder's descriptor and never follows a
+    symlink; a symlink entry is sized and removed as the link itself.
+    """
+    size = 0
+    try:
+        info = os.lstat(name, dir_fd=folder_fd)
+        if stat.S_ISDIR(info.st_mode):
+            size = _tree_size(name, folder_fd)
+            if not dry_run:
+                if gate is not None:
+                    gate.checkpoint()
+                with tracer.span("remove_tree", "delete", name):
+                    shutil.rmtree(name, dir_fd=folder_fd)
+        else:
+            size = info.st_size
+            if not dry_run:
+                os.unlink(name, dir_fd=folder_fd)
+    except OSError as e:
+        return size, str(e)
+    return size, None
+
+
+def sweep_home(home, categories=None, dry_run=False, per_user=2, gate=None):
+    started = time.monotonic()
+    caches = []
+    units = []
+    folders = []
+    for category, path in core.CACHE_PATHS.items():
+        if categories and category not in categories:
+            continue
+        entry = {'category': category, 'path': cache_folder(home.path, path), 'bytes': 0, 'removed': False,
+                 'error': None}
+        caches.append(entry)
+        try:
+            folder_fd = _open_folder(home.path, path)
+            if folder_fd is None:
+                continue
+            folders.append(folder_fd)
+            entry['removed'] = not dry_run
+            units += [(entry, folder_fd, name) for name in os.listdir(folder_fd)]
+        except OSError as e:
+            entry['error'] = e.strerror or str(e)
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, per_user), thread_name_prefix=f"Sweep-{home.user}") as pool:
+            results = pool.map(lambda unit: _sweep_entry(unit[1], unit[2], dry_run, gate), units)
+            for (entry, _fd, _name), (size, error) in zip(units, results):
+                entry['bytes'] += size
+                entry['error'] = entry['error'] or error
+    finally:
+        for folder_fd in folders:
+            os.close(folder_fd)
+
+    for entry in caches:
+        if entry['error']:
+            entry['removed'] = False
+            metrics.failures.inc(operation="delete")
+        elif entry['removed']:
+            metrics.freed_bytes.inc(entry['bytes'], category=entry['category'])
+    # Entries that failed to delete freed nothing (or an unknown part), so only clean ones count
+    return UserSweep(home.user, home.path, caches, sum(entry['bytes'] for entry in caches if not entry['error']),
+                     sum(1 for entry in caches if entry['error']), time.monotonic() - started)
+
+
+def sweep(homes, categories=None, dry_run=False, max_users=4, per_user=2, gate=None):
+    """Sweep ``homes`` (see discover_homes), ``max_users`` at a time; one UserSweep per home, in order."""
+    if not homes:
+        return []
+    with ThreadPoolExecutor(max_workers=max(1, min(max_users, len(homes))), thread_name_prefix="Sweep") as pool:
+        return list(pool.map(lambda home: sweep_home(home, categories, dry_run, per_user, gate), homes))
@@ -0,0 +1,208 @@
+"""Hold heavy cleanup back until the machine is idle, and pause it when a build starts.
+
+Deleting DerivedData or every simulator device competes with xcodebuild for
+disk bandwidth, which hurts on shared build hosts. IdleMonitor calls the
+machine busy while any build process runs, while the load average per CPU
+is over ``load_limit`` or while disks move more than ``io_limit_mb`` MB/s.
+IdleGate blocks a job until the monitor has reported idle ``settle_checks``
+times in a row; once the job runs, every ``gate.checkpoint()`` call (the
+cache deleter makes one every few hundred files) re-checks at most once per
+``poll_interval`` and parks the job while the machine is busy again. Those
+mid-run checks leave disk I/O out, since most of it is the cleanup's own;
+builds and load still pause it. A gate may be shared by a job's worker
+threads: checks are serialized, and while one worker has the job parked
+the others wait at their next checkpoint.
+
+``gate.poll()`` is the non-blocking form of ``wait_idle()``: one check per
+call, for a caller (the GUI) that waits between checks on its own timer
+instead of parking a worker thread.
+
+All three signals are plain callables, so the behaviour can be exercised on
+any machine with fake sources (see benchmarks/bench_idle_cleanup.py).
+"""
+import os
+import sys
+import threading
+import time
+
+from simcleaner import core
+
+BUILD_PROCESSES = ("xcodebuild", "swift-frontend", "swift-build", "XCBBuildService")
+
+
+class DiskIOSampler:
+    """Disk throughput in MB/s since the previous call (0.0 on the first call)."""
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self._last = None
+
+    def _total_mb(self):
+        if sys.platform.startswith("linux"):
+            # Whole devices only; partitions would count the same I/O twice
+            devices = {name for name in os.listdir("/sys/block") if not name.startswith(("loop", "ram"))}
+            sectors = 0
+            with open("/proc/diskstats") as handle:
+                for line in handle:
+                    fields = line.split()
+                    if len(fields) >= 10 and fields[2] in devices:
+                        sectors += int(fields[5]) + int(fields[9])
+            return sectors * 512 / 2 ** 20
+        # macOS: cumulative MB per disk since boot, every third column
+        output = core._run(["iostat", "-d", "-I", "-c", "1"], timeout=5).stdout.splitlines()
+        values = output[-1].split() if output else []
+        return sum(float(value) for value in values[2::3])
+
+    def __call__(self):
+        try:
+            total = self._total_mb()
+        except (OSError, ValueError, IndexError):
+            return 0.0
+        now = self.clock()
+        last, self._last = self._last, (now, total)
+        if last is None or now <= last[0]:
+            return 0.0
+        return max(total - last[1], 0.0) / (now - last[0])
+
+
+class IdleMonitor:
+    def __init__(self, load=None, builds=None, disk_io=None, load_limit=0.5, io_limit_mb=20.0):
+        self.load = load or core.load_per_cpu
+        self.builds = builds or (lambda: core.running_apps(BUILD_PROCESSES))
+        self.disk_io = disk_io or DiskIOSampler()
+        self.load_limit = load_limit
+        self.io_limit_mb = io_limit_mb
+
+    def busy_reason(self, disk_io=True):
+        """Why the machine is busy, or None if it is idle; ``disk_io=False`` ignores disk traffic."""
+        builds = self.builds()
+        if builds:
+            return "build running (" + ", ".join(sorted(builds)) + ")"
+        load = self.load()
+        if load > self.load_limit:
+            return f"load {load:.2f} per CPU"
+        # Sampled either way so the next rate covers only the time since this check
+        io_rate = self.disk_io()
+        if disk_io and io_rate > self.io_limit_mb:
+            return f"disk I/O {io_rate:.0f} MB/s"
+        return None
+
+
+class IdleGate:
+    """Per-job gate: ``wait_idle()`` before starting, ``checkpoint()`` while running.
+
+    ``finish()`` returns ``stats``: seconds spent waiting to start, running,
+    and paused mid-run, how many times the job was paused and why.
+    ``stop_check`` is called while waiting and should raise to abandon the
+    job (e.g. on cancel).
+    """
+
+    def __init__(self, monitor, poll_interval=5.0, settle_checks=3, stop_check=None,
+                 clock=time.monotonic, sleep=time.sleep):
+        self.monitor = monitor
+        self.poll_interval = poll_interval
+        self.settle_checks = settle_checks
+        self.stop_check = stop_check
+        self.clock = clock
+        self.sleep = sleep
+        self.stats = {'waited': 0.0, 'ran': 0.0, 'paused': 0.0, 'pauses': 0, 'reasons': []}
+        self._last_check = None
+        self._started = None
+        self._waiting_since = None
+        self._idle_checks = 0
+        self._lock = threading.Lock()
+
+    def _block_until_idle(self, settle_checks):
+        start = self.clock()
+        idle_checks = 0
+        while True:
+            if self.stop_check:
+                self.stop_check()
+            reason = self.monitor.busy_reason()
+            if reason is None:
+                idle_checks += 1
+                if idle_checks >= settle_checks:
+                    break
+            else:
+                idle_checks = 0
+                if reason not in self.stats['reasons']:
+                    self.stats['reasons'].append(reason)
+            self._sleep()
+        self._last_check = self.clock()
+        return self._last_check - start
+
+    def _sleep(self):
+        # In short slices so a cancel doesn't wait out the whole interval
+        remaining = self.poll_interval
+        while remaining > 0:
+            self.sleep(min(remaining, 1.0))
+            remaining -= 1.0
+            if self.stop_check:
+                self.stop_check()
+
+    def wait_idle(self):
+        self.stats['waited'] += self._block_until_idle(self.settle_checks)
+        self._started = self.clock()
+
+    def poll(self):
+        """One non-blocking step of ``wait_idle``, for callers that wait between steps on their own timer.
+
+        Call it every ``poll_interval``; it returns True, and the job counts
+        as started, once the monitor has reported idle ``settle_checks``
+        times in a row.
+        """
+        now = self.clock()
+        if self._waiting_since is None:
+            self._waiting_since = now
+        reason = self.monitor.busy_reason()
+        if reason is not None:
+            self._idle_checks = 0
+            if reason not in self.stats['reasons']:
+                self.stats['reasons'].append(reason)
+            return False
+        self._idle_checks += 1
+        if self._idle_checks < self.settle_checks:
+            return False
+        self.stats['waited'] += now - self._waiting_since
+        self._waiting_since = None
+        self._last_check = self._started = now
+        return True
+
+    def finish(self):
+        if self._started is not None:
+            self.stats['ran'] = self.clock() - self._started - self.stats['paused']
+        return self.stats
+
+    def checkpoint(self):
+        if self.stop_check:
+            self.stop_check()
+        with self._lock:
+            now = self.clock()
+            if self._last_check is not None and now - self._last_check < self.poll_interval:
+                return
+            self._last_check = now
+            # The job's own deletes are most of the disk I/O right now
+            reason = self.monitor.busy_reason(disk_io=False)
+            if reason is None:
+                return
+            self.stats['pauses'] += 1
+            if reason not in self.stats['reasons']:
+                self.stats['reasons'].append(reason)
+            # Resume after a single idle check; the build we yielded to is over.
+            # Other workers sharing the gate queue on the lock meanwhile.
+            self.stats['paused'] += self._block_until_idle(1)
+
+    def run(self, fn, *args, **kwargs):
+        """Wait for idle, then call ``fn(*args, gate=self, **kwargs)``."""
+        self.wait_idle()
+        try:
+            return fn(*args, gate=self, **kwargs)
+        finally:
+            self.finish()
+
+
+def run_when_idle(fn, *args, monitor=None, stop_check=None, **kwargs):
+    """``fn(*args, gate=gate, **kwargs)`` once the machine is idle; returns ``(result, stats)``."""
+    gate = IdleGate(monitor or IdleMonitor(), stop_check=stop_check)
+    result = gate.run(fn, *args, **kwargs)
+    return result, gate.stats
@@ -0,0 +1,196 @@
+"""Bounded in-memory store of structured log records."""
+import threading
+import time
+from array import array
+from bisect import bisect_right
+from collections import deque, namedtuple
+from itertools import islice
+
+LEVELS = ("info", "success", "warning", "error")
+
+LogRecord = namedtuple("LogRecord", "seq timestamp level message")
+
+
+def format_record(record):
+    """Plain-text rendering used for exports and terminals."""
+    clock = time.strftime("%H:%M:%S", time.localtime(record.timestamp))
+    return f"[{clock}] {record.level.upper():<7} {record.message}"
+
+
+class _TextChunk:
+    """Lowercased messages of a run of records joined into one searchable string."""
+    __slots__ = ("records", "text", "starts")
+
+    def __init__(self, records):
+        self.records = records
+        self.starts = array("L")
+        offset = 0
+        lines = []
+        for record in records:
+            line = record.message.lower().replace("\n", " ")
+            self.starts.append(offset)
+            offset += len(line) + 1
+            lines.append(line)
+        self.text = "\n".join(lines)
+
+
+class LogBuffer:
+    """Ring buffer of the most recent ``capacity`` log records.
+
+    Once full, each append evicts the oldest record, so memory stays flat no
+    matter how long the app runs. Every record gets a monotonically increasing
+    sequence number. Safe to append from worker threads.
+
+    Two indexes make filtering cheap: a deque of records per level, and
+    lowercased message text sealed into chunks of CHUNK_SIZE records, which
+    substring searches scan with str.rfind instead of a Python-level loop.
+    """
+    CHUNK_SIZE = 4096
+
+    def __init__(self, capacity=100_000):
+        self.capacity = capacity
+        self._records = deque(maxlen=capacity)
+        self._by_level = {}
+        self._chunks = deque()
+        self._tail = []
+        self._next_seq = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._records)
+
+    def __iter__(self):
+        with self._lock:
+            return iter(list(self._records))
+
+    @property
+    def first_seq(self):
+        """Sequence number of the oldest record still buffered."""
+        with self._lock:
+            return self._records[0].seq if self._records else self._next_seq
+
+    def append(self, level, message, timestamp=None):
+        with self._lock:
+            record = LogRecord(self._next_seq, time.time() if timestamp is None else timestamp, level, message)
+            self._next_seq += 1
+
+            if len(self._records) == self.capacity:
+                evicted = self._records[0]
+                self._by_level[evicted.level].popleft()
+                if self._chunks and self._chunks[0].records[-1].seq <= evicted.seq:
+                    self._chunks.popleft()
+            self._records.append(record)
+            self._by_level.setdefault(level, deque()).append(record)
+
+            self._tail.append(record)
+            if len(self._tail) >= self.CHUNK_SIZE:
+                self._chunks.append(_TextChunk(self._tail))
+                self._tail = []
+        return record
+
+    def clear(self):
+        with self._lock:
+            self._records.clear()
+            self._by_level.clear()
+            self._chunks.clear()
+            self._tail = []
+
+    def search(self, level=None, needle="", limit=None):
+        """Newest ``limit`` records matching ``level`` and ``needle``, oldest first.
+
+        ``needle`` is matched case-insensitively. Returns ``(records, complete)``
+        where ``complete`` is False if older matches were left out because of
+        ``limit``.
+        """
+        needle = needle.lower()
+        limit = limit or self.capacity
+        with self._lock:
+            if not needle:
+                source = self._records if level is None else self._by_level.get(level, ())
+                matches = list(islice(reversed(source), limit))
+                matches.reverse()
+                return matches, len(source) <= limit
+
+            first_seq = self._records[0].seq if self._records else self._next_seq
+            matches = []
+            for record in reversed(self._tail):
+                if record.seq < first_seq:
+                    break
+                if (level is None or record.level == level) and needle in record.message.lower():
+                    matches.append(record)
+                    if len(matches) == limit:
+                        matches.reverse()
+                        return matches, False
+
+            for chunk in reversed(self._chunks):
+                text, starts, records = chunk.text, chunk.starts, chunk.records
+                end = len(text)
+                while True:
+                    pos = text.rfind(needle, 0, end)
+                    if pos < 0:
+                        break
+                    line = bisect_right(starts, pos) - 1
+                    end = starts[line]
+                    record = records[line]
+                    if record.seq < first_seq:
+                        break
+                    if level is None or record.level == level:
+                        matches.append(record)
+                        if len(matches) == limit:
+                            matches.reverse()
+                            return matches, False
+
+            matches.reverse()
+            return matches, True
+
+
+class LogQuery:
+    """Level and substring filter over a LogBuffer, refined incrementally.
+
+    When a new query only narrows the previous one (same level, needle that
+    extends the old needle) and the previous result held every match, the new
+    result is computed from those matches instead of the whole buffer. Records
+    appended later are fed through ``offer`` so the result stays current.
+    """
+
+    def __init__(self, buffer, limit):
+        self.buffer = buffer
+        self.limit = limit
+        self.level = None
+        self.needle = ""
+        self._matches = deque(maxlen=limit)
+        self._complete = False
+
+    @property
+    def active(self):
+        return self.level is not None or bool(self.needle)
+
+    def accepts(self, record):
+        if self.level is not None and record.level != self.level:
+            return False
+        return not self.needle or self.needle in record.message.lower()
+
+    def offer(self, record):
+        if not self.accepts(record):
+            return False
+        if len(self._matches) == self.limit:
+            self._complete = False
+        self._matches.append(record)
+        return True
+
+    def update(self, level=None, needle=""):
+        needle = needle.strip().lower()
+        narrowing = self._complete and level == self.level and needle.startswith(self.needle)
+        self.level, self.needle = level, needle
+
+        if narrowing:
+            first_seq = self.buffer.first_seq
+            matches = [record for record in self._matches
+                       if record.seq >= first_seq and needle in record.message.lower()]
+            complete = True
+        else:
+            matches, complete = self.buffer.search(level, needle, self.limit)
+
+        self._matches = deque(matches, maxlen=self.limit)
+        self._complete = complete
+        return matches
@@ -0,0 +1,219 @@
+"""Persistent JSON-lines activity log with size-based rotation.
+
+The GUI hands every log record to a JsonlLogSink, which writes them from a
+background thread to ``activity.jsonl`` in the log directory. When that file
+grows past ``max_bytes`` it is renamed to a timestamped segment, optionally
+gzipped, and the oldest segments beyond ``backups`` are deleted. Readers
+(export, ``python -m simcleaner.logtool``, fleet tooling) stream segments in
+chronological order without loading them into memory.
+"""
+import gzip
+import json
+import os
+import queue
+import shutil
+import socket
+import threading
+import time
+
+CURRENT_NAME = "activity.jsonl"
+SEGMENT_PREFIX = "activity-"
+
+
+def default_log_dir():
+    return os.path.expanduser("~/Library/Logs/SimulatorEjector")
+
+
+def record_to_json(record, host):
+    return json.dumps({
+        "ts": round(record.timestamp, 3),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S%z", time.localtime(record.timestamp)),
+        "host": host,
+        "seq": record.seq,
+        "level": record.level,
+        "msg": record.message,
+    }, ensure_ascii=False)
+
+
+class JsonlLogSink:
+    """Queue-fed writer thread that appends log records as JSON lines.
+
+    ``write`` never blocks the caller: records go onto a bounded queue and are
+    dropped (and counted) if the writer falls that far behind.
+    """
+
+    def __init__(self, directory=None, max_bytes=5 * 2 ** 20, backups=20, compress=True, queue_size=50_000):
+        self.directory = directory or default_log_dir()
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.compress = compress
+        self.dropped = 0
+        self._host = socket.gethostname()
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._file = None
+        self._size = 0
+        self._thread = threading.Thread(target=self._run, name="JsonlLogSink", daemon=True)
+        self._thread.start()
+
+    def write(self, record):
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def flush(self):
+        """Block until everything written so far has reached the file."""
+        self._queue.join()
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join(timeout=5)
+
+    def _open(self):
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, CURRENT_NAME)
+        self._file = open(path, "a", encoding="utf-8")
+        self._size = self._file.tell()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            # Drain whatever else is waiting so a burst costs one write + flush
+            while len(batch) < 1000:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = batch[-1] is None
+            records = [record for record in batch if record is not None]
+            try:
+                if records:
+                    self._write_batch(records)
+            except OSError:
+                self.dropped += len(records)
+                self._file = None
+            except Exception:
+                # Anything else (a record that won't serialize) loses the batch, never the thread:
+                # flush() waits on every queued record being consumed
+                self.dropped += len(records)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if stop:
+                if self._file:
+                    self._file.close()
+                return
+
+    def _write_batch(self, records):
+        if self._file is None:
+            self._open()
+        lines = []
+        for record in records:
+            try:
+                lines.append(record_to_json(record, self._host) + "\n")
+            except (TypeError, ValueError, AttributeError):
+                self.dropped += 1
+        data = "".join(lines)
+        self._file.write(data)
+        self._file.flush()
+        self._size += len(data.encode("utf-8"))
+        if self._size >= self.max_bytes:
+            self._rotate()
+
+    def _rotate(self):
+        self._file.close()
+        self._file = None
+        current = os.path.join(self.directory, CURRENT_NAME)
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        segment = os.path.join(self.directory, f"{SEGMENT_PREFIX}{stamp}-{time.time_ns() % 10 ** 9:09d}.jsonl")
+        os.replace(current, segment)
+        if self.compress:
+            with open(segment, "rb") as src, gzip.open(segment + ".gz", "wb") as dst:
+                shutil.copyfileobj(src, dst)
+            os.remove(segment)
+
+        for stale in segments(self.directory)[:-self.backups or None]:
+            try:
+                os.remove(stale)
+            except OSError:
+                pass
+
+
+def segments(directory=None):
+    """Rotated segment paths, oldest first (the live file is not included)."""
+    directory = directory or default_log_dir()
+    try:
+        names = os.listdir(directory)
+    except OSError:
+        return []
+    return [os.path.join(directory, name) for name in sorted(names)
+            if name.startswith(SEGMENT_PREFIX) and name.endswith((".jsonl", ".jsonl.gz"))]
+
+
+def log_files(directory=None):
+    """Every log file, oldest first, ending with the live file if it exists."""
+    directory = directory or default_log_dir()
+    files = segments(directory)
+    current = os.path.join(directory, CURRENT_NAME)
+    if os.path.exists(current):
+        files.append(current)
+    return files
+
+
+def _open_text(path):
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8")
+    return open(path, encoding="utf-8")
+
+
+def iter_lines(directory=None):
+    """Raw JSON lines across all segments, oldest first."""
+    for path in log_files(directory):
+        try:
+            with _open_text(path) as handle:
+                for line in handle:
+                    if line.strip():
+                        yield line
+        except (OSError, EOFError):
+            # Segment pruned or truncated while we were reading it
+            continue
+
+
+def iter_entries(directory=None, level=None, needle=None, since=None):
+    """Parsed log entries across all segments, optionally filtered."""
+    needle = needle.lower() if needle else None
+    for line in iter_lines(directory):
+        if needle and needle not in line.lower():
+            continue
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            continue
+        if level and entry.get("level") != level:
+            continue
+        if since and entry.get("ts", 0) < since:
+            continue
+        if needle and needle not in entry.get("msg", "").lower():
+            continue
+        yield entry
+
+
+def format_entry(entry):
+    clock = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(entry.get("ts", 0)))
+    return f"[{clock}] {entry.get('level', '').upper():<7} {entry.get('msg', '')}"
+
+
+def export(dest, directory=None, as_json=False, level=None, needle=None):
+    """Stream every stored entry into ``dest``; returns the number written."""
+    count = 0
+    with open(dest, "w", encoding="utf-8") as out:
+        if as_json and not level and not needle:
+            for line in iter_lines(directory):
+                out.write(line if line.endswith("\n") else line + "\n")
+                count += 1
+            return count
+        for entry in iter_entries(directory, level=level, needle=needle):
+            out.write((json.dumps(entry, ensure_ascii=False) if as_json else format_entry(entry)) + "\n")
+            count += 1
+    return count
@@ -0,0 +1,102 @@
+"""Read, filter and follow the persistent activity log without starting the GUI.
+
+    python -m simcleaner.logtool -n 50               # last 50 entries
+    python -m simcleaner.logtool -l error --json     # every error as JSON lines
+    python -m simcleaner.logtool -g disk4 -f         # follow, only lines mentioning disk4
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+
+from simcleaner import logsink
+
+
+def _emit(entry, as_json):
+    print(json.dumps(entry, ensure_ascii=False) if as_json else logsink.format_entry(entry), flush=True)
+
+
+def _matches(entry, args):
+    if args.level and entry.get("level") != args.level:
+        return False
+    return not args.grep or args.grep.lower() in entry.get("msg", "").lower()
+
+
+def follow(args, poll_interval=0.5):
+    """Print entries appended to the live file, reopening it after rotation."""
+    path = os.path.join(args.dir, logsink.CURRENT_NAME)
+    handle = None
+    inode = None
+    # History was already printed, so skip what the live file holds right now
+    skip_existing = os.path.exists(path)
+    try:
+        while True:
+            if handle is None:
+                try:
+                    handle = open(path, "rb")
+                    inode = os.fstat(handle.fileno()).st_ino
+                except OSError:
+                    time.sleep(poll_interval)
+                    continue
+                if skip_existing:
+                    handle.seek(0, os.SEEK_END)
+                    skip_existing = False
+
+            line = handle.readline()
+            if line.endswith(b"\n"):
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if _matches(entry, args):
+                    _emit(entry, args.json)
+                continue
+
+            # At EOF: seek back over any partial line, then check for rotation
+            handle.seek(-len(line), os.SEEK_CUR)
+            try:
+                rotated = os.stat(path).st_ino != inode
+            except OSError:
+                rotated = True
+            if rotated:
+                handle.close()
+                handle = None
+            else:
+                time.sleep(poll_interval)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if handle:
+            handle.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m simcleaner.logtool", description=__doc__.splitlines()[0])
+    parser.add_argument("-d", "--dir", default=logsink.default_log_dir(), help="log directory")
+    parser.add_argument("-l", "--level", choices=["info", "success", "warning", "error"])
+    parser.add_argument("-g", "--grep", help="case-insensitive text to match in messages")
+    parser.add_argument("--since", type=float, metavar="MINUTES", help="only entries from the last MINUTES")
+    parser.add_argument("-n", "--lines", type=int, help="only the last N matching entries")
+    parser.add_argument("-f", "--follow", action="store_true", help="keep printing new entries")
+    parser.add_argument("--json", action="store_true", help="print JSON lines instead of text")
+    args = parser.parse_args(argv)
+
+    since = time.time() - args.since * 60 if args.since else None
+    entries = logsink.iter_entries(args.dir, level=args.level, needle=args.grep, since=since)
+    if args.lines is not None:
+        entries = deque(entries, maxlen=args.lines)
+    try:
+        for entry in entries:
+            _emit(entry, args.json)
+    except BrokenPipeError:
+        return 0
+
+    if args.follow:
+        follow(args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
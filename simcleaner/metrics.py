@@ -0,0 +1,206 @@
+"""In-process counters, gauges and histograms, served in Prometheus text format.
+
+core updates the aggregates as a side effect of the work it already does
+(scans set the disk and process gauges, ejects and deletes count and time
+themselves), so a scrape only formats numbers that are already in memory
+and never starts a scan. ``serve(port)`` exposes ``/metrics`` on localhost
+from a daemon thread; http.server is imported only then.
+
+    python -m simcleaner watch --interval 60 --metrics-port 9464
+    curl -s localhost:9464/metrics
+"""
+import threading
+
+# Seconds; scans and ejects sit between tens of ms and a minute
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+DEFAULT_PORT = 9464
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=()):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    pairs += [f'{name}="{value}"' for name, value in extra]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_number(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, registry, name, documentation, labels=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labels)
+        self._lock = registry.lock
+        self._values = {}
+        registry.metrics.append(self)
+
+    def _key(self, labels):
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} takes labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def value(self, **labels):
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def samples(self):
+        for key, value in sorted(self._values.items()):
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_number(value)}"
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, registry, name, documentation, labels=(), buckets=LATENCY_BUCKETS):
+        super().__init__(registry, name, documentation, labels)
+        self.buckets = tuple(buckets) + (float("inf"),)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            counts = entry[0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            entry[1] += value
+            entry[2] += 1
+
+    def value(self, **labels):
+        """Observation count for the label set."""
+        with self._lock:
+            entry = self._values.get(self._key(labels))
+            return entry[2] if entry else 0
+
+    def samples(self):
+        for key, (counts, total, count) in sorted(self._values.items()):
+            cumulative = 0
+            for bound, bucket in zip(self.buckets, counts):
+                cumulative += bucket
+                labels = _format_labels(self.labelnames, key, [("le", _format_number(bound))])
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _format_labels(self.labelnames, key)
+            yield f"{self.name}_sum{labels} {_format_number(total)}"
+            yield f"{self.name}_count{labels} {count}"
+
+
+class Registry:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.metrics = []
+
+    def counter(self, name, documentation, labels=()):
+        return Counter(self, name, documentation, labels)
+
+    def gauge(self, name, documentation, labels=()):
+        return Gauge(self, name, documentation, labels)
+
+    def histogram(self, name, documentation, labels=(), buckets=LATENCY_BUCKETS):
+        return Histogram(self, name, documentation, labels, buckets)
+
+    def render(self):
+        """Every metric in Prometheus text exposition format (version 0.0.4)."""
+        lines = []
+        with self.lock:
+            for metric in self.metrics:
+                lines.append(f"# HELP {metric.name} {metric.documentation}")
+                lines.append(f"# TYPE {metric.name} {metric.kind}")
+                lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+simulator_disks = registry.gauge("simcleaner_simulator_disks", "Simulator disks found by the last scan.", ["state"])
+simulator_processes = registry.gauge("simcleaner_simulator_processes",
+                                     "Simulator processes found by the last process scan.")
+reclaimable_bytes = registry.gauge("simcleaner_reclaimable_bytes",
+                                   "Bytes in each cache category when it was last measured.", ["category"])
+ejects = registry.counter("simcleaner_ejects_total", "Disk ejects attempted.", ["result"])
+kills = registry.counter("simcleaner_kills_total", "Process kills attempted.", ["result"])
+freed_bytes = registry.counter("simcleaner_freed_bytes_total", "Bytes deleted from each cache category.",
+                               ["category"])
+failures = registry.counter("simcleaner_failures_total", "Failed operations.", ["operation"])
+respawns = registry.counter("simcleaner_coresimulator_respawns_total",
+                            "Times CoreSimulatorService was seen running under a new PID.")
+scan_seconds = registry.histogram("simcleaner_scan_duration_seconds", "Duration of scans.", ["kind"])
+eject_seconds = registry.histogram("simcleaner_eject_duration_seconds", "Duration of single disk ejects.")
+delete_seconds = registry.histogram("simcleaner_delete_duration_seconds", "Duration of cache deletions.",
+                                    ["category"])
+
+_service = {'pid': None}
+
+
+def observe_disk_scan(disks, seconds):
+    mounted = sum(1 for disk in disks if disk.mounted)
+    simulator_disks.set(mounted, state="mounted")
+    simulator_disks.set(len(disks) - mounted, state="unmounted")
+    scan_seconds.observe(seconds, kind="disks")
+
+
+def observe_process_scan(processes, seconds, service_pid=None):
+    simulator_processes.set(len(processes))
+    scan_seconds.observe(seconds, kind="processes")
+    if service_pid is not None:
+        if _service['pid'] is not None and service_pid != _service['pid']:
+            respawns.inc()
+        _service['pid'] = service_pid
+
+
+def serve(port=DEFAULT_PORT, host="127.0.0.1", source=registry):
+    """Serve ``source.render()`` at /metrics from a daemon thread; returns the server.
+
+    Raises OSError if the port is taken. Stop it with ``server.shutdown()``
+    followed by ``server.server_close()``.
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+                self.send_error(404)
+                return
+            body = source.render().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="MetricsServer", daemon=True).start()
+    return server
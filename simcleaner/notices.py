@@ -0,0 +1,131 @@
+"""Notification coalescing: a burst of messages becomes one summary.
+
+The GUI posts every notification here rather than showing it at once. A
+notice is released ``window`` seconds after the last post of a burst, or
+``max_delay`` seconds after its first, whichever comes sooner, and holds
+everything posted in between:
+
+* per-item outcomes of bulk operations are counted per topic
+  ("12 disks ejected, 2 failed");
+* a repeated message is shown once with its count ("Invalid pattern (×3)");
+* past ``max_parts`` distinct messages the least severe are dropped and
+  counted as "+N more".
+
+The notice takes the most severe level in the burst. Tray messages are held
+to one per ``tray_interval`` seconds, and the next one says how many were
+held back. Posting costs the same however long the burst gets.
+"""
+import time
+from collections import namedtuple
+
+# Least to most severe
+LEVELS = ("info", "success", "warning", "error")
+
+# Per-item outcome topics: (one, many, past tense)
+TOPICS = {
+    "eject": ("disk", "disks", "ejected"),
+    "kill": ("process", "processes", "killed"),
+}
+
+# ``tray`` is the tray message text, or None when the tray is being rate limited
+Notice = namedtuple("Notice", "message level count tray")
+
+
+def _outcome_text(topic, ok, failed):
+    one, many, done = TOPICS.get(topic, ("item", "items", "done"))
+    if not ok:
+        return f"0 of {failed} {one if failed == 1 else many} {done}"
+    text = f"{ok} {one if ok == 1 else many} {done}"
+    return f"{text}, {failed} failed" if failed else text
+
+
+class NoticeQueue:
+    def __init__(self, window=0.5, max_delay=3.0, tray_interval=5.0, max_parts=3, clock=time.monotonic):
+        self.window = window
+        self.max_delay = max_delay
+        self.tray_interval = tray_interval
+        self.max_parts = max_parts
+        self.clock = clock
+        self.tray_at = None
+        self.tray_held = 0
+        self._reset()
+
+    def _reset(self):
+        self._outcomes = {}
+        # message -> [count, severity], in the order first posted
+        self._messages = {}
+        self._dropped = 0
+        self._severity = 0
+        self._count = 0
+        self._opened_at = None
+        self._posted_at = None
+
+    @property
+    def pending(self):
+        return self._count > 0
+
+    def _posted(self, severity):
+        now = self.clock()
+        if self._opened_at is None:
+            self._opened_at = now
+        self._posted_at = now
+        self._count += 1
+        self._severity = max(self._severity, severity)
+
+    def post(self, message, level="info"):
+        severity = LEVELS.index(level) if level in LEVELS else 0
+        entry = self._messages.get(message)
+        if entry is not None:
+            entry[0] += 1
+            entry[1] = max(entry[1], severity)
+        elif len(self._messages) < self.max_parts:
+            self._messages[message] = [1, severity]
+        else:
+            # Keep the most severe messages; the others only count towards "+N more"
+            weakest = min(self._messages, key=lambda text: self._messages[text][1])
+            if self._messages[weakest][1] < severity:
+                self._dropped += self._messages.pop(weakest)[0]
+                self._messages[message] = [1, severity]
+            else:
+                self._dropped += 1
+        self._posted(severity)
+
+    def post_result(self, topic, ok):
+        """Count one item of a bulk operation as succeeded or failed."""
+        counts = self._outcomes.setdefault(topic, [0, 0])
+        counts[0 if ok else 1] += 1
+        self._posted(0)
+
+    def due_in(self):
+        """Seconds until the pending notice should be shown, or None with nothing pending."""
+        if not self._count:
+            return None
+        due = min(self._posted_at + self.window, self._opened_at + self.max_delay)
+        return max(0.0, due - self.clock())
+
+    def flush(self):
+        """The pending burst as one Notice (None if empty); starts a new burst."""
+        if not self._count:
+            return None
+        parts = []
+        severity = self._severity
+        for topic, (ok, failed) in self._outcomes.items():
+            parts.append(_outcome_text(topic, ok, failed))
+            severity = max(severity, LEVELS.index("success" if not failed else "warning" if ok else "error"))
+        for message, (count, _severity) in self._messages.items():
+            parts.append(message if count == 1 else f"{message} (×{count})")
+        message = " · ".join(parts)
+        if self._dropped:
+            message += f" (+{self._dropped} more)"
+        count = self._count
+        self._reset()
+
+        now = self.clock()
+        tray = None
+        if self.tray_at is None or now - self.tray_at >= self.tray_interval:
+            tray = message if not self.tray_held else f"{message} (+{self.tray_held} earlier)"
+            self.tray_at = now
+            self.tray_held = 0
+        else:
+            self.tray_held += count
+        return Notice(message, LEVELS[severity], count, tray)
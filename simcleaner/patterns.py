@@ -0,0 +1,168 @@
+"""Compile the user's disk/process detection patterns into one matcher.
+
+One pattern per line, in the syntax of the "Detection Patterns" boxes:
+
+    Simulator          literal text, matched anywhere in the line
+    iOS*Runtime        glob when it contains * ? or [ ]
+    re:^/dev/disk\\d+s2  regular expression after a ``re:`` prefix
+    !Backup            exclude: lines matching this never match
+    # comment          ignored, as are blank lines
+
+Each side (include, exclude) compiles to one test: literals become an
+inlined chain of substring checks with redundant ones dropped, and every
+glob and plain regex is folded into one alternation, so a line usually
+costs one ``re.search`` per side however many patterns there are. A regex
+with capturing groups or global inline flags (``re:(?i)simulator``) keeps
+its own search, since joining it to the others would renumber its
+backreferences or apply its flags to the whole alternation. Compiled matchers
+are cached on the pattern tuple, so callers can ask for one on every scan
+and only pay to compile when the patterns change.
+"""
+import re
+from functools import lru_cache
+
+GLOB_CHARS = frozenset("*?[")
+DEFAULT_FLAGS = re.compile("").flags
+
+
+class PatternError(ValueError):
+    """A pattern line that does not compile; ``line`` is its 1-based position."""
+
+    def __init__(self, line, pattern, reason):
+        super().__init__(f"line {line}: {pattern!r}: {reason}")
+        self.line = line
+        self.pattern = pattern
+        self.reason = reason
+
+
+def glob_to_regex(glob):
+    """Unanchored regex for a shell-style glob (``*``, ``?`` and ``[...]``)."""
+    parts = []
+    i = 0
+    while i < len(glob):
+        char = glob[i]
+        if char == "*":
+            parts.append(".*")
+        elif char == "?":
+            parts.append(".")
+        elif char == "[" and "]" in glob[i + 2:]:
+            end = glob.index("]", i + 2)
+            body = glob[i + 1:end]
+            if body.startswith("!"):
+                body = "^" + body[1:]
+            parts.append("[" + body.replace("\\", "\\\\") + "]")
+            i = end
+        else:
+            parts.append(re.escape(char))
+        i += 1
+    return "".join(parts)
+
+
+def parse_pattern(pattern):
+    """``("literal", text)`` or ``("regex", source)`` for one pattern line."""
+    if pattern.startswith("re:"):
+        return "regex", pattern[3:]
+    # Matching is unanchored, so stars at either end add nothing
+    core = pattern.strip("*") or pattern
+    if not GLOB_CHARS & set(core):
+        return "literal", core
+    return "regex", glob_to_regex(core)
+
+
+def _drop_redundant(literals):
+    # "SimulatorTrampoline" can only match where "Simulator" already does
+    unique = sorted(set(literals), key=len)
+    kept = []
+    for literal in unique:
+        if not any(shorter in literal for shorter in kept):
+            kept.append(literal)
+    return kept
+
+
+def _foldable(regex):
+    # Safe to join into an alternation: no groups to renumber, no global flags to spread
+    return regex.groups == 0 and regex.flags == DEFAULT_FLAGS
+
+
+class Matcher:
+    """``matcher(line)`` is True when an include pattern matches and no exclude does.
+
+    Literal patterns become a chain of ``in`` tests, which CPython runs far
+    faster than a regex alternation (or an ``any()`` over a generator);
+    globs and plain regexes share one combined regex per side. The test is built
+    as a single function so a call costs one frame.
+    """
+
+    __slots__ = ("patterns", "includes", "test")
+
+    def __init__(self, patterns):
+        self.patterns = tuple(patterns)
+        sides = {"include": ([], []), "exclude": ([], [])}
+        for number, raw in enumerate(self.patterns, 1):
+            pattern = raw.strip()
+            if not pattern or pattern.startswith("#"):
+                continue
+            side = "include"
+            if pattern.startswith("!"):
+                side, pattern = "exclude", pattern[1:].strip()
+            kind, value = parse_pattern(pattern)
+            if kind == "regex":
+                try:
+                    value = re.compile(value)
+                except re.error as e:
+                    raise PatternError(number, raw, e) from None
+            sides[side][kind == "regex"].append(value)
+        self.includes = sum(map(len, sides["include"]))
+        self.test = self._build(sides)
+
+    @staticmethod
+    def _build(sides):
+        # Only generated names (k0, r1, ...) go into the source; pattern text
+        # stays in the namespace, so nothing the user types is ever evaluated
+        namespace = {}
+        clauses = {}
+        for side, (literals, regexes) in sides.items():
+            terms = []
+            for literal in _drop_redundant(literals):
+                name = f"k{len(namespace)}"
+                namespace[name] = literal
+                terms.append(f"{name} in line")
+            foldable = [regex.pattern for regex in regexes if _foldable(regex)]
+            searches = [regex.search for regex in regexes if not _foldable(regex)]
+            if foldable:
+                searches.insert(0, re.compile("|".join(f"(?:{regex})" for regex in foldable)).search)
+            for search in searches:
+                name = f"r{len(namespace)}"
+                namespace[name] = search
+                terms.append(f"{name}(line) is not None")
+            clauses[side] = " or ".join(terms)
+        if not clauses["include"]:
+            return lambda line: False
+        source = f"lambda line: ({clauses['include']})"
+        if clauses["exclude"]:
+            source += f" and not ({clauses['exclude']})"
+        return eval(source, namespace)
+
+    def __call__(self, line):
+        return self.test(line)
+
+    def __bool__(self):
+        return self.includes > 0
+
+    def __repr__(self):
+        return f"Matcher({list(self.patterns)!r})"
+
+
+@lru_cache(maxsize=16)
+def _compile(patterns):
+    return Matcher(patterns)
+
+
+def compile_patterns(patterns):
+    """A Matcher for ``patterns``, a sequence of lines or one newline-separated string.
+
+    Raises PatternError for a regex or glob that does not compile.
+    """
+    if isinstance(patterns, str):
+        patterns = patterns.splitlines()
+    return _compile(tuple(patterns))
@@ -0,0 +1,101 @@
+"""Typed scan results: one immutable record per disk or process.
+
+Scanners used to hand out dicts of strings (``{'pid': '4711', 'cpu': '0.3',
+...}``) that every consumer parsed again, and each dict carried its own
+hash table. The records here are namedtuples, like logbuffer.LogRecord: no
+per-instance ``__dict__``, numbers parsed once where the text is read, and
+cheap equality for the models' row diffs.
+
+RecordBatch stores many records of one type column by column, with numeric
+fields in ``array`` columns, for result sets that are kept around or
+written out (the launch snapshot) rather than displayed row by row.
+"""
+from array import array
+from collections import namedtuple
+
+
+class DiskRecord(namedtuple("DiskRecord", "device name mount size_bytes")):
+    __slots__ = ()
+
+    @property
+    def size_gb(self):
+        return self.size_bytes / 1e9
+
+    @property
+    def mounted(self):
+        return self.mount not in ("", "Not Mounted")
+
+    @property
+    def size_label(self):
+        if not self.size_bytes:
+            return "Unknown"
+        size = float(self.size_bytes)
+        for unit in ("B", "KB", "MB", "GB"):
+            if size < 1000 or unit == "GB":
+                break
+            size /= 1000
+        return f"{size:.0f} B" if unit == "B" else f"{size:.1f} {unit}"
+
+
+class ProcessRecord(namedtuple("ProcessRecord", "pid start cpu mem name")):
+    __slots__ = ()
+
+    @property
+    def key(self):
+        # PID plus start time, so a recycled PID counts as a different process
+        return self.pid, self.start
+
+
+# Typecodes for the numeric columns of each record type
+NUMERIC_COLUMNS = {
+    DiskRecord: {"size_bytes": "q"},
+    ProcessRecord: {"pid": "l", "cpu": "d", "mem": "d"},
+}
+RECORD_TYPES = {record_type.__name__: record_type for record_type in NUMERIC_COLUMNS}
+
+
+class RecordBatch:
+    """Records of one type stored as columns; iterating rebuilds the records."""
+
+    __slots__ = ("record_type", "columns")
+
+    def __init__(self, record_type, records=()):
+        self.record_type = record_type
+        numeric = NUMERIC_COLUMNS[record_type]
+        self.columns = [array(numeric[field]) if field in numeric else [] for field in record_type._fields]
+        self.extend(records)
+
+    def extend(self, records):
+        records = list(records)
+        for i, column in enumerate(self.columns):
+            column.extend(record[i] for record in records)
+
+    def __len__(self):
+        return len(self.columns[0])
+
+    def __getitem__(self, row):
+        return self.record_type._make(column[row] for column in self.columns)
+
+    def __iter__(self):
+        return map(self.record_type._make, zip(*self.columns))
+
+    def __eq__(self, other):
+        return (isinstance(other, RecordBatch) and self.record_type is other.record_type
+                and self.columns == other.columns)
+
+    def to_json(self):
+        return {"type": self.record_type.__name__,
+                "columns": dict(zip(self.record_type._fields, map(list, self.columns)))}
+
+    @classmethod
+    def from_json(cls, data):
+        """Inverse of to_json; raises KeyError, TypeError or ValueError on bad input."""
+        record_type = RECORD_TYPES[data["type"]]
+        batch = cls(record_type)
+        columns = data["columns"]
+        lengths = {len(columns[field]) for field in record_type._fields}
+        if len(lengths) > 1:
+            raise ValueError("columns differ in length")
+        for column, field in zip(batch.columns, record_type._fields):
+            column.extend(columns[field])
+        return batch
@@ -0,0 +1,201 @@
+"""Shared runner for external commands: timeouts, per-tool limits, retries, cancel.
+
+Every shell-out in ``simcleaner.core`` goes through one CommandRunner. It
+
+* applies a default timeout (the GUI's "Operation Timeout" setting) and kills
+  the child when it expires;
+* caps how many instances of each tool run at once, since diskutil, hdiutil
+  and simctl serialize on the same daemons and only queue up behind each other;
+* retries failures the caller marks as transient, with exponential backoff;
+* can cancel everything in flight: running children are killed, queued work
+  is dropped and waiting callers get CommandCancelled. Work run inside
+  ``scope(token)`` can also be cancelled on its own with ``cancel(token)``.
+
+``run`` blocks the calling thread; ``submit`` and ``call`` run work on the
+runner's thread pool and return concurrent.futures.Future objects.
+"""
+import os
+import signal
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+DEFAULT_LIMITS = {"diskutil": 2, "hdiutil": 2, "xcrun": 1, "osascript": 1, "security": 1}
+
+
+class CommandCancelled(Exception):
+    pass
+
+
+class CancelToken:
+    """Handle for cancelling the commands started by one unit of work."""
+    __slots__ = ("cancelled", "procs")
+
+    def __init__(self):
+        self.cancelled = False
+        self.procs = set()
+
+
+class CommandRunner:
+    def __init__(self, default_timeout=15.0, limits=None, default_limit=4, workers=8):
+        self.default_timeout = default_timeout
+        self.default_limit = default_limit
+        self._limits = dict(DEFAULT_LIMITS if limits is None else limits)
+        self._semaphores = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._generation = 0
+        self._running = set()
+        self._futures = set()
+        self._local = threading.local()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="CommandRunner")
+
+    @property
+    def busy(self):
+        with self._lock:
+            return bool(self._running or self._futures)
+
+    def _semaphore(self, tool):
+        with self._lock:
+            if tool not in self._semaphores:
+                self._semaphores[tool] = threading.BoundedSemaphore(self._limits.get(tool, self.default_limit))
+            return self._semaphores[tool]
+
+    @contextmanager
+    def scope(self, token):
+        """Attribute commands run by this thread inside the block to ``token``."""
+        previous = getattr(self._local, "token", None)
+        self._local.token = token
+        try:
+            yield token
+        finally:
+            self._local.token = previous
+
+    def _check(self, generation, token):
+        if generation != self._generation or (token is not None and token.cancelled):
+            raise CommandCancelled("cancelled")
+
+    def _wait(self, generation, token, seconds):
+        """Sleep for a retry backoff, waking early on cancellation."""
+        deadline = time.monotonic() + seconds
+        with self._lock:
+            while (generation == self._generation and not (token and token.cancelled)
+                   and time.monotonic() < deadline):
+                self._wakeup.wait(deadline - time.monotonic())
+        self._check(generation, token)
+
+    def run(self, args, timeout=None, retries=0, backoff=0.5, retry_if=None, retry_timeouts=False):
+        """Run ``args`` and return a subprocess.CompletedProcess with text output.
+
+        Raises subprocess.TimeoutExpired when the (last) attempt times out and
+        CommandCancelled if cancel_all() is called first. With ``retries``, a
+        result for which ``retry_if(result)`` is true, or a timeout when
+        ``retry_timeouts`` is set, is retried after ``backoff`` seconds,
+        doubling each time.
+        """
+        generation = self._generation
+        token = getattr(self._local, "token", None)
+        timeout = self.default_timeout if timeout is None else timeout
+        semaphore = self._semaphore(os.path.basename(args[0]))
+
+        for attempt in range(retries + 1):
+            if attempt:
+                self._wait(generation, token, backoff * 2 ** (attempt - 1))
+            while not semaphore.acquire(timeout=0.1):
+                self._check(generation, token)
+            try:
+                self._check(generation, token)
+                result = self._run_once(args, timeout, token)
+            except subprocess.TimeoutExpired:
+                if attempt == retries or not retry_timeouts:
+                    raise
+                continue
+            finally:
+                semaphore.release()
+            if attempt == retries or not (retry_if and retry_if(result)):
+                return result
+        return result
+
+    @staticmethod
+    def _kill(proc):
+        # Kill the whole process group: a wrapper script's children would
+        # otherwise hold the output pipes open until they exit on their own
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+        except OSError:
+            pass
+
+    def _run_once(self, args, timeout, token=None):
+        proc = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+                                start_new_session=True)
+        with self._lock:
+            self._running.add(proc)
+            if token is not None:
+                token.procs.add(proc)
+                if token.cancelled:
+                    proc.cancelled = True
+                    self._kill(proc)
+        try:
+            stdout, stderr = proc.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            self._kill(proc)
+            proc.communicate()
+            raise
+        finally:
+            with self._lock:
+                self._running.discard(proc)
+                if token is not None:
+                    token.procs.discard(proc)
+        if getattr(proc, "cancelled", False):
+            raise CommandCancelled(f"{args[0]} cancelled")
+        return subprocess.CompletedProcess(args, proc.returncode, stdout, stderr)
+
+    def call(self, fn, *args, **kwargs):
+        """Run ``fn`` on the pool; returns a Future."""
+        future = self._pool.submit(fn, *args, **kwargs)
+        with self._lock:
+            self._futures.add(future)
+        future.add_done_callback(self._forget)
+        return future
+
+    def submit(self, args, **kwargs):
+        """Like ``run`` but on the pool; returns a Future of the CompletedProcess."""
+        return self.call(self.run, args, **kwargs)
+
+    def _forget(self, future):
+        with self._lock:
+            self._futures.discard(future)
+
+    def check_cancelled(self):
+        """Raise CommandCancelled if the calling thread's work has been cancelled."""
+        token = getattr(self._local, "token", None)
+        if token is not None and token.cancelled:
+            raise CommandCancelled("cancelled")
+
+    def cancel(self, token):
+        """Kill the commands running under ``token`` and fail its later ones."""
+        with self._lock:
+            token.cancelled = True
+            self._wakeup.notify_all()
+            running = list(token.procs)
+        for proc in running:
+            proc.cancelled = True
+            self._kill(proc)
+
+    def cancel_all(self):
+        """Kill running commands and drop queued work. Returns how many were affected."""
+        with self._lock:
+            self._generation += 1
+            self._wakeup.notify_all()
+            running = list(self._running)
+            futures = list(self._futures)
+        for proc in running:
+            proc.cancelled = True
+            self._kill(proc)
+        return len(running) + sum(future.cancel() for future in futures)
+
+    def shutdown(self):
+        self.cancel_all()
+        self._pool.shutdown(wait=False)
@@ -0,0 +1,204 @@
+"""Central scheduler for scans, ejects, kills and cleanups.
+
+Every operation is submitted as a Job that names the resources it touches:
+
+* ``exclusive`` resources are held by at most one running job (a disk scan
+  holds ``"disks"`` exclusively because it rebuilds the whole table);
+* ``shared`` resources may be held by many jobs at once, but never while a
+  job holds them exclusively (concurrent ejects share ``"disks"`` and each
+  holds its own ``"disk:/dev/diskN"`` exclusively).
+
+Queued jobs start in priority order as soon as their resources are free. A
+lower-priority job never jumps ahead of a higher-priority one it conflicts
+with, so a stream of background scans cannot starve an eject.
+
+Jobs with ``coalesce=True`` (scans) follow "latest request wins": asking for
+a scan that is already queued merges into it, and asking while one runs
+queues exactly one follow-up. An INTERACTIVE job that needs resources held
+by a running ``preemptible`` job cancels it through the command runner; the
+preempted job goes back on the queue and runs again afterwards, so nothing
+is dropped and nothing runs twice to completion.
+
+Each run of a job is timed as a ``job`` span (see simcleaner.trace).
+Callbacks run on worker threads; the GUI forwards them to the Qt thread.
+"""
+import heapq
+import itertools
+import threading
+
+from simcleaner.runner import CancelToken, CommandCancelled
+from simcleaner.trace import tracer
+
+INTERACTIVE = 0
+BACKGROUND = 10
+
+
+class Job:
+    __slots__ = ("kind", "fn", "args", "priority", "exclusive", "shared", "coalesce", "preemptible",
+                 "callbacks", "requests", "seq", "token", "state", "result", "error", "preempted")
+
+    def __init__(self, kind, fn, args=(), priority=INTERACTIVE, exclusive=(), shared=(),
+                 coalesce=False, preemptible=False):
+        self.kind = kind
+        self.fn = fn
+        self.args = tuple(args)
+        self.priority = priority
+        self.exclusive = frozenset(exclusive)
+        self.shared = frozenset(shared)
+        self.coalesce = coalesce
+        self.preemptible = preemptible
+        self.callbacks = []
+        self.requests = 0
+        self.seq = 0
+        self.token = None
+        self.state = "new"
+        self.result = None
+        self.error = None
+        self.preempted = 0
+
+    @property
+    def cancelled(self):
+        return self.state == "cancelled"
+
+    def conflicts(self, other):
+        return bool(self.exclusive & (other.exclusive | other.shared) or self.shared & other.exclusive)
+
+    def __lt__(self, other):
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+
+class Scheduler:
+    """Runs Jobs on a CommandRunner's thread pool under resource locks.
+
+    ``on_done(job)`` is called once per job (on a worker thread, or on the
+    caller's thread for cancellations) after it finishes, fails or is
+    cancelled; ``job.callbacks`` holds the de-duplicated callbacks of every
+    request merged into it and ``job.requests`` how many there were.
+    """
+
+    def __init__(self, runner, on_done):
+        self.runner = runner
+        self.on_done = on_done
+        self.stats = {"submitted": 0, "coalesced": 0, "preempted": 0, "completed": 0, "cancelled": 0}
+        self._lock = threading.RLock()
+        self._queue = []
+        self._running = []
+        self._seq = itertools.count()
+
+    @property
+    def pending(self):
+        with self._lock:
+            return len(self._queue) + len(self._running)
+
+    def busy(self, kind):
+        with self._lock:
+            return any(job.kind == kind for job in self._queue + self._running)
+
+    def submit(self, job, callback=None):
+        with self._lock:
+            self.stats["submitted"] += 1
+            if job.coalesce:
+                # Latest request wins: fold into a queued job of the same kind
+                for queued in self._queue:
+                    if queued.kind == job.kind:
+                        queued.fn, queued.args = job.fn, job.args
+                        if job.priority < queued.priority:
+                            queued.priority = job.priority
+                            heapq.heapify(self._queue)
+                        self._attach(queued, callback)
+                        self.stats["coalesced"] += 1
+                        return queued
+            self._attach(job, callback)
+            self._enqueue(job)
+            self._preempt_for(job)
+            self._pump()
+        return job
+
+    @staticmethod
+    def _attach(job, callback):
+        job.requests += 1
+        if callback is not None and callback not in job.callbacks:
+            job.callbacks.append(callback)
+
+    def _enqueue(self, job):
+        job.seq = next(self._seq)
+        job.state = "queued"
+        heapq.heappush(self._queue, job)
+
+    def _preempt_for(self, job):
+        if job.priority != INTERACTIVE:
+            return
+        for running in self._running:
+            if (running.preemptible and not running.token.cancelled and running.priority > job.priority
+                    and running.conflicts(job)):
+                running.preempted += 1
+                self.stats["preempted"] += 1
+                self.runner.cancel(running.token)
+
+    def _pump(self):
+        blocked = []
+        started = []
+        for job in sorted(self._queue):
+            if any(job.conflicts(other) for other in self._running + started + blocked):
+                blocked.append(job)
+                continue
+            started.append(job)
+        for job in started:
+            self._queue.remove(job)
+            job.state = "running"
+            job.token = CancelToken()
+            self._running.append(job)
+        if started:
+            heapq.heapify(self._queue)
+        for job in started:
+            self.runner.call(self._execute, job)
+
+    def _execute(self, job):
+        try:
+            with self.runner.scope(job.token), tracer.span(job.kind, "job"):
+                result = job.fn(*job.args)
+            error = None
+        except CommandCancelled as e:
+            result, error = None, e
+        except Exception as e:
+            result, error = None, e
+
+        with self._lock:
+            self._running.remove(job)
+            cancelled = isinstance(error, CommandCancelled) or job.state == "cancelling"
+            if cancelled and job.state == "running":
+                # Preempted: run again once the interactive work is through,
+                # or fold into an identical request that is already waiting
+                follow_up = next((queued for queued in self._queue
+                                  if job.coalesce and queued.kind == job.kind), None)
+                if follow_up:
+                    follow_up.requests += job.requests
+                    follow_up.callbacks += [cb for cb in job.callbacks if cb not in follow_up.callbacks]
+                else:
+                    self._enqueue(job)
+                self._pump()
+                return
+            if cancelled:
+                job.state = "cancelled"
+                self.stats["cancelled"] += 1
+            else:
+                job.state = "done"
+                job.result, job.error = result, error
+                self.stats["completed"] += 1
+            self._pump()
+        self.on_done(job)
+
+    def cancel_all(self):
+        """Drop queued jobs and cancel running ones. Returns how many were affected."""
+        with self._lock:
+            queued, self._queue = self._queue, []
+            running = list(self._running)
+            for job in queued:
+                job.state = "cancelled"
+                self.stats["cancelled"] += 1
+            for job in running:
+                job.state = "cancelling"
+                self.runner.cancel(job.token)
+        for job in queued:
+            self.on_done(job)
+        return len(queued) + len(running)
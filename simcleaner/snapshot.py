@@ -0,0 +1,74 @@
+"""Last scan results, kept on disk so the next launch can show them at once.
+
+The file holds one section per scan type (``disks``, ``processes``), each with
+the time it was taken and the scanners' records stored column by column (see
+simcleaner.records.RecordBatch), which is also how they are kept in memory.
+It is written as compact JSON via a temp file and ``os.replace``, so a crash
+never leaves a half-written snapshot. Unchanged sections are not rewritten, and
+frequent saves (live process refresh) are coalesced to one write per
+``min_interval`` seconds.
+"""
+import json
+import os
+import time
+
+from simcleaner.records import RecordBatch
+
+VERSION = 2
+
+
+def default_path():
+    return os.path.expanduser("~/Library/Caches/SimulatorEjector/last_scan.json")
+
+
+class ScanSnapshot:
+    def __init__(self, path=None, min_interval=10.0):
+        self.path = path or default_path()
+        self.min_interval = min_interval
+        self._sections = {}
+        self._dirty = False
+        self._written_at = 0.0
+
+    def load(self):
+        """Sections from the last run, ``{name: (saved_at, records)}``; empty if unreadable."""
+        try:
+            with open(self.path, encoding="utf-8") as handle:
+                data = json.load(handle)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get("version") != VERSION:
+            return {}
+        self._sections = {}
+        for name, section in data.get("sections", {}).items():
+            try:
+                self._sections[name] = {"saved_at": float(section["saved_at"]),
+                                        "rows": RecordBatch.from_json(section["rows"])}
+            except (KeyError, TypeError, ValueError):
+                continue
+        return {name: (section["saved_at"], list(section["rows"])) for name, section in self._sections.items()}
+
+    def save(self, name, records, record_type, force=False):
+        batch = RecordBatch(record_type, records)
+        section = self._sections.get(name)
+        if section is None or section["rows"] != batch:
+            self._sections[name] = {"saved_at": time.time(), "rows": batch}
+            self._dirty = True
+        if self._dirty and (force or time.monotonic() - self._written_at >= self.min_interval):
+            self.flush()
+
+    def flush(self):
+        if not self._dirty:
+            return
+        sections = {name: {"saved_at": section["saved_at"], "rows": section["rows"].to_json()}
+                    for name, section in self._sections.items()}
+        payload = json.dumps({"version": VERSION, "sections": sections}, separators=(",", ":"))
+        tmp = self.path + ".tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(tmp, "w", encoding="utf-8") as handle:
+                handle.write(payload)
+            os.replace(tmp, self.path)
+        except OSError:
+            return
+        self._dirty = False
+        self._written_at = time.monotonic()
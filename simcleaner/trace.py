@@ -0,0 +1,239 @@
+"""Lightweight timing spans, latency histograms and one-shot profiles.
+
+Code under test wraps each step in a span::
+
+    with tracer.span("diskutil", "subprocess"):
+        ...
+
+or decorates a function with ``@traced("scan_disks", "scan")``. Finished
+spans go into a ring buffer of the last ``capacity`` spans, from which
+``stats()`` builds per-operation latency histograms and ``chrome_trace()``
+a Chrome trace-event document (load it in chrome://tracing or Perfetto).
+
+While the tracer is off and no profile is armed, ``span()`` returns one
+shared do-nothing context manager, so an instrumented call costs a method
+call and an attribute check. ``capture_next("profile")`` (cProfile) or
+``capture_next("sample")`` (stack sampling of the worker thread) profiles
+the next ``job`` span - one scheduler job - whether or not spans are being
+recorded, and hands the report to ``on_capture``.
+"""
+import threading
+import time
+from collections import Counter, deque, namedtuple
+from functools import wraps
+
+Span = namedtuple("Span", "name category start duration thread detail")
+Capture = namedtuple("Capture", "name mode duration report")
+
+# Upper bounds (ms) of the histogram buckets; the last one catches the rest
+BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, float("inf"))
+CAPTURE_MODES = ("profile", "sample")
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "category", "detail", "start", "capture")
+
+    def __init__(self, tracer, name, category, detail):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.detail = detail
+        self.capture = None
+
+    def __enter__(self):
+        if self.category == "job" and self.tracer.capture_mode:
+            self.capture = self.tracer._start_capture()
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        duration = time.perf_counter_ns() - self.start
+        if self.capture is not None:
+            self.tracer._finish_capture(self.capture, self.name, duration)
+        if self.tracer.enabled:
+            self.tracer.record(Span(self.name, self.category, self.start, duration, threading.get_ident(),
+                                    self.detail))
+        return False
+
+
+class _Profiler:
+    """cProfile of the thread that started it."""
+
+    def __init__(self):
+        import cProfile
+        self.profile = cProfile.Profile()
+        self.profile.enable()
+
+    def stop(self, limit=30):
+        import io
+        import pstats
+        self.profile.disable()
+        out = io.StringIO()
+        pstats.Stats(self.profile, stream=out).sort_stats("cumulative").print_stats(limit)
+        return out.getvalue()
+
+
+class _Sampler:
+    """Samples the starting thread's stack every ``interval`` seconds from a helper thread."""
+
+    def __init__(self, interval=0.001):
+        import sys
+        self._frames = sys._current_frames
+        self.target = threading.get_ident()
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="TraceSampler", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = self._frames().get(self.target)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({code.co_filename.rsplit('/', 1)[-1]}:{frame.f_lineno})")
+                frame = frame.f_back
+            if stack:
+                self.stacks[tuple(reversed(stack))] += 1
+                self.samples += 1
+
+    def stop(self, limit=20):
+        self._stop.set()
+        self._thread.join()
+        lines = [f"{self.samples} samples every {self.interval * 1000:g} ms; hottest stacks (innermost last):"]
+        for stack, count in self.stacks.most_common(limit):
+            lines.append(f"\n{count:6d} {count / max(self.samples, 1):6.1%}")
+            lines += [f"         {frame}" for frame in stack[-12:]]
+        return "\n".join(lines) + "\n"
+
+
+class Tracer:
+    def __init__(self, capacity=20_000, enabled=False):
+        self.spans = deque(maxlen=capacity)
+        self.enabled = enabled
+        self.capture_mode = None
+        self.on_capture = None
+        self.captures = deque(maxlen=5)
+        self._lock = threading.Lock()
+        self._thread_names = {}
+
+    def span(self, name, category="op", detail=None):
+        if not self.enabled and not self.capture_mode:
+            return NULL_SPAN
+        return _Span(self, name, category, detail)
+
+    def record(self, span):
+        # deque.append is atomic; the name map only grows by one entry per thread
+        self.spans.append(span)
+        if span.thread not in self._thread_names:
+            self._thread_names[span.thread] = threading.current_thread().name
+
+    def clear(self):
+        self.spans.clear()
+
+    def capture_next(self, mode="profile"):
+        """Profile the next scheduler job; the report goes to ``on_capture`` and ``captures``."""
+        if mode not in CAPTURE_MODES:
+            raise ValueError(f"capture mode must be one of {CAPTURE_MODES}")
+        self.capture_mode = mode
+
+    def _start_capture(self):
+        with self._lock:
+            mode, self.capture_mode = self.capture_mode, None
+        if mode is None:
+            return None
+        try:
+            return mode, _Profiler() if mode == "profile" else _Sampler()
+        except ValueError as e:
+            # Python 3.12+ allows one cProfile per process
+            return mode, e
+
+    def _finish_capture(self, capture, name, duration):
+        mode, profiler = capture
+        report = f"{profiler}\n" if isinstance(profiler, Exception) else profiler.stop()
+        result = Capture(name, mode, duration / 1e6, report)
+        self.captures.append(result)
+        if self.on_capture:
+            self.on_capture(result)
+
+    def stats(self, spans=None):
+        """``{(category, name): {count, total, p50, p95, max, buckets}}``, times in ms."""
+        grouped = {}
+        for span in self.spans if spans is None else spans:
+            grouped.setdefault((span.category, span.name), []).append(span.duration / 1e6)
+        result = {}
+        for key, durations in grouped.items():
+            durations.sort()
+            buckets = [0] * len(BUCKETS_MS)
+            bucket = 0
+            for duration in durations:
+                while duration > BUCKETS_MS[bucket]:
+                    bucket += 1
+                buckets[bucket] += 1
+            count = len(durations)
+            result[key] = {
+                'count': count,
+                'total': sum(durations),
+                'p50': durations[count // 2],
+                'p95': durations[min(int(count * 0.95), count - 1)],
+                'max': durations[-1],
+                'buckets': buckets,
+            }
+        return result
+
+    def chrome_trace(self, spans=None):
+        """The buffered spans as a Chrome trace-event document (a dict ready for json.dump)."""
+        import os
+
+        spans = list(self.spans) if spans is None else list(spans)
+        pid = os.getpid()
+        origin = min((span.start for span in spans), default=0)
+        events = [{'name': "thread_name", 'ph': "M", 'pid': pid, 'tid': thread, 'args': {'name': name}}
+                  for thread, name in list(self._thread_names.items())]
+        for span in spans:
+            event = {'name': span.name, 'cat': span.category, 'ph': "X", 'pid': pid, 'tid': span.thread,
+                     'ts': (span.start - origin) / 1000, 'dur': span.duration / 1000}
+            if span.detail is not None:
+                event['args'] = {'detail': str(span.detail)}
+            events.append(event)
+        return {'traceEvents': events, 'displayTimeUnit': "ms"}
+
+    def export_chrome(self, filename):
+        """Write chrome_trace() to ``filename``; returns the number of spans written."""
+        import json
+
+        spans = list(self.spans)
+        with open(filename, "w") as handle:
+            json.dump(self.chrome_trace(spans), handle)
+        return len(spans)
+
+
+tracer = Tracer()
+
+
+def traced(name, category="op"):
+    """Decorator: run the function inside ``tracer.span(name, category)``."""
+    def decorate(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not tracer.enabled and not tracer.capture_mode:
+                return fn(*args, **kwargs)
+            with _Span(tracer, name, category, None):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
@@ -0,0 +1,120 @@
+"""Catch the GUI thread when it stops servicing its event loop.
+
+The GUI calls ``beat()`` from a timer every ``interval`` seconds. A helper
+thread wakes several times per threshold and, once no beat has arrived for
+``threshold`` seconds, copies the GUI thread's Python stack while the stall
+is still going on. When the next beat lands the stall
+is over: its length, the handler the event loop was stuck in and the stack
+go to ``on_stall`` (called on the GUI thread) as a Stall.
+
+The handler is found without knowing anything about Qt: each beat notes how
+many Python frames sit below the timer callback (the frames that entered the
+event loop), and the first frames above that depth in the captured stack are
+the slot the loop dispatched to. Nested event loops (modal dialogs) beat on
+their own, so waiting in one is not a stall.
+"""
+import os
+import sys
+import threading
+import time
+from collections import deque, namedtuple
+
+Stall = namedtuple("Stall", "started duration handler blocked_at stack")
+
+# Frames of these functions only forward to the real handler
+DISPATCHERS = frozenset(("<lambda>", "_deliver", "done", "wrapper", "emit"))
+
+
+def _frame_label(frame):
+    return f"{frame.f_code.co_name} ({os.path.basename(frame.f_code.co_filename)}:{frame.f_lineno})"
+
+
+def _depth(frame):
+    depth = 0
+    while frame is not None:
+        depth += 1
+        frame = frame.f_back
+    return depth
+
+
+class StallWatchdog:
+    def __init__(self, threshold=0.1, interval=0.05, on_stall=None, history=50, clock=time.monotonic):
+        self.threshold = threshold
+        self.interval = interval
+        self.on_stall = on_stall
+        self.clock = clock
+        self.stalls = deque(maxlen=history)
+        self.thread_id = None
+        self._last_beat = None
+        self._base_depth = 0
+        self._captured = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start watching the calling thread, which must be the one that calls beat()."""
+        self.thread_id = threading.get_ident()
+        self._last_beat = self.clock()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._watch, name="StallWatchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def beat(self):
+        """Call from the watched thread's event loop every ``interval`` seconds."""
+        now = self.clock()
+        with self._lock:
+            last, self._last_beat = self._last_beat, now
+            captured, self._captured = self._captured, None
+            base = self._base_depth
+            self._base_depth = _depth(sys._getframe(1))
+        if last is None:
+            return None
+        gap = now - last
+        if gap <= self.threshold:
+            return None
+        stack = captured[1] if captured and captured[0] == last else []
+        stall = Stall(last, gap, *self._blame(stack, base), stack)
+        self.stalls.append(stall)
+        if self.on_stall:
+            self.on_stall(stall)
+        return stall
+
+    @staticmethod
+    def _blame(stack, base):
+        """``(handler, blocked_at)`` labels from an outermost-first stack."""
+        if not stack:
+            return "unknown (stack not captured)", "unknown"
+        frames = stack[base:] or stack
+        handler = [frames[0]]
+        for label in frames[1:]:
+            if handler[-1].split(" ", 1)[0] not in DISPATCHERS:
+                break
+            handler.append(label)
+        return " -> ".join(handler), frames[-1]
+
+    def _watch(self):
+        # The threshold can change while running
+        while not self._stop.wait(max(self.threshold / 4, 0.005)):
+            with self._lock:
+                last = self._last_beat
+                if last is None or (self._captured and self._captured[0] == last):
+                    continue
+            if self.clock() - last <= self.threshold:
+                continue
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            stack.reverse()
+            with self._lock:
+                # The stall may have ended while the stack was being copied
+                if self._last_beat == last:
+                    self._captured = (last, stack)